@@ -0,0 +1,435 @@
+"""
+Asyncio Debit Spread Analysis Pipeline
+Runs price, chain, quote and cache I/O for many concurrent analyses on one event loop
+Reuses DebitSpreadAnalyzer parsing, spread selection and response building
+"""
+
+import os
+import asyncio
+import functools
+import logging
+import threading
+import time
+from typing import List, Dict, Optional, Any, Tuple
+
+from spread_metrics import STAGE_SECONDS, ANALYSIS_SECONDS, UPSTREAM_SECONDS, UPSTREAM_REQUESTS, LIMITER_WAIT_SECONDS
+from debit_spread_analyzer import (
+    TRADELIST_BASE_URL,
+    DebitSpreadAnalyzer,
+    OptionChain,
+    PooledHTTPClient,
+    RateLimitedHTTPClient,
+    analyzer as default_analyzer
+)
+
+try:
+    import httpx
+except ImportError:  # Fall back to the pooled requests client on the loop's executor
+    httpx = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class AsyncHTTPClient:
+    """Async HTTP client for upstream calls
+    
+    Uses httpx.AsyncClient with a keep-alive pool when httpx is installed.
+    Otherwise requests go through the pooled sync client on the event loop's
+    default executor, which is bounded, so concurrency still never fans out
+    into per-request thread pools.
+    """
+    
+    def __init__(self, sync_client: PooledHTTPClient, max_connections: Optional[int] = None):
+        self.sync_client = sync_client
+        self.max_connections = max_connections or int(os.environ.get('ASYNC_HTTP_MAX_CONNECTIONS', 100))
+        self._client = None
+    
+    def _timeout(self, timeout: Optional[float]):
+        return httpx.Timeout(timeout or self.sync_client.read_timeout, connect=self.sync_client.connect_timeout)
+    
+    def _async_client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                timeout=self._timeout(None)
+            )
+        return self._client
+    
+    async def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                  timeout: Optional[float] = None):
+        """GET returning a response with status_code, json() and raise_for_status()"""
+        if httpx is not None:
+            return await self._async_client().get(url, params=params, headers=headers, timeout=self._timeout(timeout))
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.sync_client.get, url, params=params, headers=headers, timeout=timeout)
+        )
+    
+    async def post(self, url: str, json: Any = None, headers: Optional[Dict] = None,
+                   timeout: Optional[float] = None):
+        """POST a JSON body, returning a response like get()"""
+        if httpx is not None:
+            return await self._async_client().post(url, json=json, headers=headers, timeout=self._timeout(timeout))
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.sync_client.post, url, json=json, headers=headers, timeout=timeout)
+        )
+    
+    async def aclose(self):
+        """Close pooled async connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+class AsyncDebitSpreadAnalyzer:
+    """Asyncio version of DebitSpreadAnalyzer.analyze_ticker
+    
+    All I/O for an analysis (cache, price, contract chain, quotes) is awaited
+    on a single event loop. Analyses and upstream calls are each capped by a
+    semaphore, and concurrent fetches for the same key share one task. The
+    loop runs on a background thread so synchronous callers can use run().
+    """
+    
+    def __init__(self, analyzer: Optional[DebitSpreadAnalyzer] = None, http_client: Optional[AsyncHTTPClient] = None,
+                 max_analyses: Optional[int] = None, max_upstream: Optional[int] = None):
+        self.analyzer = analyzer or default_analyzer
+        self.cache_service = self.analyzer.cache_service
+        self.http = http_client or AsyncHTTPClient(self.analyzer.http)
+        self.max_analyses = max_analyses or int(os.environ.get('ASYNC_MAX_ANALYSES', 200))
+        self.max_upstream = max_upstream or int(os.environ.get('ASYNC_MAX_UPSTREAM', 20))
+        
+        # Loop-owned state, created lazily on the loop that first uses it
+        self._inflight = {}
+        self._analysis_semaphore = None
+        self._upstream_semaphore = None
+        
+        self._loop = None
+        self._loop_lock = threading.Lock()
+    
+    def _semaphores(self):
+        if self._analysis_semaphore is None:
+            self._analysis_semaphore = asyncio.Semaphore(self.max_analyses)
+            self._upstream_semaphore = asyncio.Semaphore(self.max_upstream)
+        return self._analysis_semaphore, self._upstream_semaphore
+    
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='spread-analyzer-loop', daemon=True).start()
+                self._loop = loop
+        return self._loop
+    
+    def run(self, coro) -> Any:
+        """Run a coroutine on the analyzer's background loop from synchronous code"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+    
+    async def _single_flight(self, key: str, factory):
+        """Await the in-flight task for key, starting factory() if there is none"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+    
+    async def _upstream_get(self, url: str, params: Dict, timeout: float):
+        """GET through the upstream semaphore and the analyzer's process-wide rate/concurrency limiter"""
+        _, upstream_semaphore = self._semaphores()
+        limiter = self.analyzer.upstream.limiter
+        endpoint = url.rsplit('/', 1)[-1]
+        started = time.monotonic()
+        async with upstream_semaphore:
+            deadline = started + limiter.acquire_timeout
+            while True:
+                delay = limiter.try_acquire()
+                if delay <= 0:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # Last try; raises UpstreamBusyError (and counts the timeout) if still not admitted
+                    limiter.acquire(timeout=0)
+                    break
+                await asyncio.sleep(min(delay, remaining))
+            
+            admitted = time.monotonic()
+            LIMITER_WAIT_SECONDS.observe(admitted - started)
+            ok, retry_after, status = False, None, 'error'
+            try:
+                response = await self.http.get(url, params=params, timeout=timeout)
+                status = str(response.status_code)
+                ok = response.status_code < 500 and response.status_code != 429
+                retry_after = RateLimitedHTTPClient.retry_after(response)
+                return response
+            finally:
+                latency = time.monotonic() - admitted
+                limiter.release(latency, ok, retry_after, endpoint)
+                UPSTREAM_SECONDS.observe(latency, endpoint=endpoint)
+                UPSTREAM_REQUESTS.inc(endpoint=endpoint, status=status)
+    
+    async def _redis_pipeline(self, commands: List[List[Any]]) -> Optional[List[Any]]:
+        if self.cache_service.native is not None:
+            return await asyncio.get_running_loop().run_in_executor(None, self.cache_service.pipeline, commands)
+        
+        try:
+            url, headers = self.cache_service.build_pipeline_request()
+            response = await self.http.post(url, json=commands, headers=headers, timeout=2)
+            if response.status_code == 200:
+                return self.cache_service.decode_pipeline(response.json())
+        except Exception as e:
+            logger.debug(f"Redis pipeline failed: {e}")
+        return None
+    
+    async def _cache_get(self, cache_key: str) -> Optional[Dict]:
+        return (await self._cache_get_many([cache_key])).get(cache_key)
+    
+    async def _cache_get_many(self, cache_keys: List[str]) -> Dict[str, Dict]:
+        found, missing = self.cache_service.get_local_many(cache_keys)
+        if missing and self.cache_service.cache_enabled:
+            results = await self._redis_pipeline([['MGET'] + missing])
+            found.update(self.cache_service.decode_many(missing, results[0] if results else None))
+        return found
+    
+    async def _cache_set(self, cache_key: str, data: Any, expiry_seconds: int = 30, fresh_seconds: Optional[int] = None):
+        await self._cache_set_many({cache_key: data}, expiry_seconds, fresh_seconds)
+    
+    async def _cache_set_many(self, items: Dict[str, Any], expiry_seconds: int = 30,
+                              fresh_seconds: Optional[int] = None):
+        commands = self.cache_service.build_set_commands(items, expiry_seconds, fresh_seconds)
+        if commands and self.cache_service.cache_enabled:
+            await self._redis_pipeline(commands)
+    
+    async def get_real_time_stock_price(self, symbol: str) -> Optional[float]:
+        """Get real-time stock price using TheTradeList API with caching"""
+        return (await self.get_stock_price_with_staleness(symbol))[0]
+    
+    async def get_stock_price_with_staleness(self, symbol: str) -> Tuple[Optional[float], float]:
+        """Get (price, seconds past soft TTL), revalidating stale cached prices in a background task"""
+        cache_key = f"stock_price_snapshot:{symbol}"
+        cached_data = await self._cache_get(cache_key)
+        if cached_data and cached_data.get('data', {}).get('price'):
+            staleness = self.cache_service.staleness(cached_data)
+            if staleness > 0:
+                asyncio.ensure_future(self._single_flight(f"price:{symbol}", lambda: self._fetch_real_time_stock_price(symbol, cache_key)))
+            return float(cached_data['data']['price']), staleness
+        
+        price = await self._single_flight(f"price:{symbol}", lambda: self._fetch_real_time_stock_price(symbol, cache_key))
+        return price, 0.0
+    
+    async def _fetch_real_time_stock_price(self, symbol: str, cache_key: str) -> Optional[float]:
+        try:
+            response = await self._upstream_get(f"{TRADELIST_BASE_URL}/snapshot-locale", {
+                'tickers': f"{symbol},",  # API requires comma after symbol
+                'apiKey': self.analyzer.tradelist_api_key
+            }, 3)
+            if response.status_code == 200:
+                fmv = self.analyzer.parse_snapshot_prices(response.json()).get(symbol)
+                if fmv:
+                    await self._cache_set(cache_key, {'price': fmv}, self.analyzer.price_hard_ttl, self.analyzer.price_soft_ttl)
+                    return fmv
+            
+            # Fallback to the shared scanner snapshot; it only blocks when the index needs a refresh
+            scanner = self.analyzer.scanner
+            if scanner.is_current():
+                price = scanner.get_price(symbol)
+            else:
+                price = await asyncio.get_running_loop().run_in_executor(None, scanner.get_price, symbol)
+            if price:
+                await self._cache_set(cache_key, {'price': price}, self.analyzer.price_hard_ttl, self.analyzer.price_soft_ttl)
+                return price
+            
+            logger.error(f"Failed to get price for {symbol}")
+            return None
+        
+        except Exception as e:
+            logger.error(f"Error fetching stock price for {symbol}: {e}")
+            return None
+    
+    async def get_option_chain(self, symbol: str) -> Optional[OptionChain]:
+        """Get the parsed OptionChain for a symbol, cached in compact form"""
+        cache_key = f"options_chain:{symbol}"
+        cached_data = await self._cache_get(cache_key)
+        if cached_data and cached_data.get('data'):
+            chain = OptionChain.from_compact(cached_data['data'])
+            if chain.is_current():
+                return chain
+        
+        return await self._single_flight(f"contracts:{symbol}", lambda: self._fetch_option_chain(symbol, cache_key))
+    
+    async def _fetch_option_chain(self, symbol: str, cache_key: str) -> Optional[OptionChain]:
+        try:
+            response = await self._upstream_get(f"{TRADELIST_BASE_URL}/options-contracts", {
+                'underlying_ticker': symbol,
+                'apiKey': self.analyzer.tradelist_api_key
+            }, 10)
+            response.raise_for_status()
+            contracts = self.analyzer.parse_contracts(response.json(), symbol)
+        
+        except Exception as e:
+            logger.error(f"Error fetching contracts for {symbol}: {e}")
+            return None
+        
+        if not contracts:
+            return None
+        
+        chain = OptionChain(contracts)
+        await self._cache_set(cache_key, chain.to_compact(), self.analyzer.contracts_cache_ttl)
+        return chain
+    
+    async def get_options_quotes(self, contract_symbols: List[str]) -> Dict[str, Dict]:
+        """Get quotes for many contracts in multi-ticker batches, sharing in-flight batches"""
+        return (await self.get_options_quotes_with_staleness(contract_symbols))[0]
+    
+    async def get_options_quotes_with_staleness(self, contract_symbols: List[str]) -> Tuple[Dict[str, Dict], float]:
+        """Get (quotes, max seconds past soft TTL); stale quotes are served and revalidated in background batches"""
+        unique_symbols = list(dict.fromkeys(contract_symbols))
+        cached = await self._cache_get_many([f"options_quote:{symbol}" for symbol in unique_symbols])
+        
+        quotes = {}
+        tasks = {}
+        claimed = []
+        stale = []
+        staleness = 0.0
+        for contract_symbol in unique_symbols:
+            cached_data = cached.get(f"options_quote:{contract_symbol}")
+            in_flight = f"quote:{contract_symbol}" in self._inflight
+            if cached_data and cached_data.get('data'):
+                quotes[contract_symbol] = cached_data['data']
+                quote_staleness = self.cache_service.staleness(cached_data)
+                staleness = max(staleness, quote_staleness)
+                if quote_staleness > 0 and not in_flight:
+                    stale.append(contract_symbol)
+            elif in_flight:
+                tasks[contract_symbol] = self._inflight[f"quote:{contract_symbol}"]
+            else:
+                claimed.append(contract_symbol)
+        
+        # Stale batches run as registered in-flight tasks that this call does not await
+        self._start_quote_batches(stale)
+        tasks.update(self._start_quote_batches(claimed))
+        
+        unique_tasks = list({id(task): task for task in tasks.values()}.values())
+        await asyncio.gather(*(asyncio.shield(task) for task in unique_tasks), return_exceptions=True)
+        
+        for contract_symbol, task in tasks.items():
+            if not task.cancelled() and task.exception() is None:
+                quote = task.result().get(contract_symbol)
+                if quote:
+                    quotes[contract_symbol] = quote
+        
+        return quotes, staleness
+    
+    def _start_quote_batches(self, contract_symbols: List[str]) -> Dict[str, asyncio.Task]:
+        """Start batch fetches for unclaimed symbols, registering each symbol's in-flight task"""
+        tasks = {}
+        batch_size = self.analyzer.quote_batch_size
+        for i in range(0, len(contract_symbols), batch_size):
+            batch = contract_symbols[i:i + batch_size]
+            keys = [f"quote:{contract_symbol}" for contract_symbol in batch]
+            task = asyncio.ensure_future(self._fetch_options_quote_batch(batch))
+            for key, contract_symbol in zip(keys, batch):
+                self._inflight[key] = task
+                tasks[contract_symbol] = task
+            task.add_done_callback(lambda _, keys=keys: [self._inflight.pop(key, None) for key in keys])
+        return tasks
+    
+    async def _fetch_options_quote_batch(self, contract_symbols: List[str]) -> Dict[str, Dict]:
+        try:
+            response = await self._upstream_get(f"{TRADELIST_BASE_URL}/snapshot-options", {
+                'tickers': ','.join(f"O:{contract_symbol}" for contract_symbol in contract_symbols),
+                'apiKey': self.analyzer.tradelist_api_key
+            }, 5)
+            response.raise_for_status()
+            quotes = self.analyzer.parse_quotes(response.json(), contract_symbols)
+        
+        except Exception as e:
+            logger.error(f"Error getting quotes for batch of {len(contract_symbols)} contracts: {e}")
+            return {}
+        
+        await self._cache_set_many({
+            f"options_quote:{contract_symbol}": quote_data for contract_symbol, quote_data in quotes.items()
+        }, self.analyzer.quote_hard_ttl, self.analyzer.quote_soft_ttl)
+        return quotes
+    
+    async def find_best_spreads(self, symbol: str, current_price: float) -> Dict[str, Dict]:
+        """Find best spreads for all strategies"""
+        with STAGE_SECONDS.time(stage='chain'):
+            chain = await self.get_option_chain(symbol)
+        if not chain:
+            return {strategy: {'found': False, 'reason': 'No contracts available'} for strategy in self.analyzer.strategies}
+        
+        evaluators, skip_reasons, contract_symbols = self.analyzer.prepare_strategy_evaluators(chain, current_price)
+        
+        with STAGE_SECONDS.time(stage='quotes'):
+            quotes, staleness = await self.get_options_quotes_with_staleness(contract_symbols) if contract_symbols else ({}, 0.0)
+        for evaluator in evaluators.values():
+            evaluator.load_quotes(quotes)
+        
+        # Selection is pure CPU over loaded columns, so it runs inline on the loop
+        with STAGE_SECONDS.time(stage='select'):
+            results = {
+                strategy: self.analyzer.select_strategy_spread(symbol, strategy, evaluators.get(strategy),
+                                                               current_price, skip_reasons.get(strategy))
+                for strategy in self.analyzer.strategies
+            }
+        for result in results.values():
+            result['quote_staleness'] = staleness
+        await asyncio.get_running_loop().run_in_executor(None, self.analyzer.spread_storage.flush)
+        return results
+    
+    async def analyze_ticker(self, ticker: str) -> Dict:
+        """Main analysis coroutine for a ticker; concurrent calls per ticker share one run"""
+        ticker = ticker.upper().strip()
+        return await self._single_flight(f"analysis:{ticker}", lambda: self._analyze_ticker(ticker))
+    
+    async def _analyze_ticker(self, ticker: str) -> Dict:
+        analysis_semaphore, _ = self._semaphores()
+        async with analysis_semaphore:
+            started = time.perf_counter()
+            outcome = 'error'
+            try:
+                self.analyzer.track_request_start()
+                logger.info(f"API: Starting async spread analysis for {ticker}")
+                
+                with STAGE_SECONDS.time(stage='price'):
+                    current_price, price_staleness = await self.get_stock_price_with_staleness(ticker)
+                if not current_price:
+                    outcome = 'no_price'
+                    return {
+                        'success': False,
+                        'error': f'Unable to fetch current price for {ticker}'
+                    }
+                
+                all_strategies_data = await self.find_best_spreads(ticker, current_price)
+                outcome = 'success'
+                return self.analyzer.build_analysis_response(ticker, current_price, all_strategies_data, price_staleness)
+            
+            except Exception as e:
+                logger.error(f"API: Critical error analyzing {ticker}: {e}")
+                return {
+                    'success': False,
+                    'error': f'Internal server error: {str(e)}'
+                }
+            
+            finally:
+                ANALYSIS_SECONDS.observe(time.perf_counter() - started, outcome=outcome)
+                self.analyzer.track_request_end()
+
+# Global async analyzer instance sharing the default analyzer's cache and storage
+async_analyzer = AsyncDebitSpreadAnalyzer()
+
+def analyze_debit_spread(ticker: str) -> Dict:
+    """
+    Drop-in synchronous replacement for debit_spread_analyzer.analyze_debit_spread
+    
+    Args:
+        ticker: Stock symbol to analyze
+    
+    Returns:
+        Dictionary with complete analysis results
+    """
+    return async_analyzer.run(async_analyzer.analyze_ticker(ticker))
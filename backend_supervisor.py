@@ -0,0 +1,319 @@
+"""
+Node.js Backend Supervisor
+Starts the backend process, probes it until it actually serves requests,
+and restarts it with backoff if it exits. One worker per host supervises;
+the others follow its readiness
+"""
+
+import os
+import json
+import time
+import fcntl
+import socket
+import tempfile
+import logging
+import threading
+import subprocess
+import http.client
+from typing import List, Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class BackendSupervisor:
+    """Run a backend child process and track when it is ready to serve
+    
+    Readiness is a TCP connect to the port followed by a GET of the health
+    route, polled with exponential backoff from poll_initial up to poll_max
+    seconds, so startup takes as long as the backend needs and no longer.
+    The health response must report the child's PID in health_pid_field, so
+    an unrelated listener on the port never counts as ready.
+    
+    Only the process holding an flock on lock_path spawns, kills and
+    restarts the backend, so several web workers on one host share a single
+    child. The holder writes the child's PID to the lock file; the others
+    poll the health route against that PID and take over the lock if the
+    holder exits. A monitor thread waits on the child and restarts it when
+    it exits, backing off between restarts unless it had been up for
+    stable_seconds. If the port is held by another process, it gives up
+    instead of restarting into the same bind error.
+    """
+    
+    def __init__(self, command: List[str], port: int, env: Optional[Dict[str, str]] = None,
+                 health_path: Optional[str] = '/health', host: str = '127.0.0.1',
+                 kill_pattern: Optional[str] = None, startup_timeout: Optional[float] = None,
+                 poll_initial: float = 0.05, poll_max: float = 0.25,
+                 restart_backoff_max: float = 30.0, stable_seconds: float = 60.0,
+                 health_pid_field: Optional[str] = 'pid', lock_path: Optional[str] = None,
+                 follow_interval: float = 1.0):
+        self.command = command
+        self.port = port
+        self.env = env
+        self.health_path = health_path
+        self.host = host
+        self.kill_pattern = kill_pattern
+        self.startup_timeout = startup_timeout or float(os.environ.get('BACKEND_STARTUP_TIMEOUT', 60))
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.restart_backoff_max = restart_backoff_max
+        self.stable_seconds = stable_seconds
+        self.health_pid_field = health_pid_field
+        self.lock_path = lock_path or os.path.join(tempfile.gettempdir(), f'backend-supervisor-{port}.lock')
+        self.follow_interval = follow_interval
+        
+        self.process = None
+        self.ready = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.restarts = 0
+        self.started_at = None
+        self.ready_at = None
+        self.startup_seconds = None
+        self.last_exit_code = None
+        self.lock_file = None
+        self.owner = False
+        self.failure = None
+    
+    def start(self):
+        """Supervise the backend (or follow the worker that does) on a daemon thread (idempotent)"""
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.stop_event.clear()
+            self.failure = None
+            self.thread = threading.Thread(target=self._run, name='backend-supervisor', daemon=True)
+            self.thread.start()
+    
+    def stop(self, timeout: float = 5.0):
+        """Stop supervising, terminate the backend if this worker owns it and release the host lock"""
+        self.stop_event.set()
+        self.ready.clear()
+        process = self.process
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        self._release_host_lock()
+    
+    def is_ready(self) -> bool:
+        return self.ready.is_set()
+    
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the backend is ready; False if timeout elapses first"""
+        return self.ready.wait(timeout)
+    
+    def port_open(self, timeout: float = 0.5) -> bool:
+        """True if something accepts TCP connections on the backend port"""
+        try:
+            with socket.create_connection((self.host, self.port), timeout=timeout):
+                return True
+        except OSError:
+            return False
+    
+    def probe(self, timeout: float = 2.0, pid: Optional[int] = None) -> bool:
+        """True if the port accepts connections and the health route answers below 500
+        
+        With pid (and a health_pid_field), the health response must be JSON
+        reporting that process ID.
+        """
+        if not self.port_open(timeout):
+            return False
+        if not self.health_path:
+            return True
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+        try:
+            conn.request('GET', self.health_path)
+            response = conn.getresponse()
+            body = response.read()
+            if response.status >= 500:
+                return False
+            if pid is None or not self.health_pid_field:
+                return True
+            health = json.loads(body)
+            return isinstance(health, dict) and health.get(self.health_pid_field) == pid
+        except (OSError, ValueError, http.client.HTTPException):
+            return False
+        finally:
+            conn.close()
+    
+    def _acquire_host_lock(self) -> bool:
+        """Take the per-host supervisor lock without blocking; True if this worker now owns the backend"""
+        if self.owner:
+            return True
+        if self.lock_file is None:
+            self.lock_file = open(self.lock_path, 'a+')
+        try:
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        self.owner = True
+        logger.info(f"Supervising backend on port {self.port} (lock {self.lock_path})")
+        return True
+    
+    def _release_host_lock(self):
+        lock_file, self.lock_file = self.lock_file, None
+        self.owner = False
+        if lock_file is not None:
+            lock_file.close()
+    
+    def _record_pid(self, pid: int):
+        """Publish the child's PID in the lock file for workers that follow this one"""
+        self.lock_file.seek(0)
+        self.lock_file.truncate()
+        self.lock_file.write(str(pid))
+        self.lock_file.flush()
+    
+    def _owner_pid(self) -> Optional[int]:
+        """Backend PID published by the worker holding the host lock"""
+        try:
+            with open(self.lock_path) as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+    
+    def _kill_stale(self):
+        """Kill leftover backends from earlier runs and wait for the port to free up"""
+        if not self.kill_pattern:
+            return
+        subprocess.run(['pkill', '-f', self.kill_pattern], check=False)
+        delay = self.poll_initial
+        deadline = time.monotonic() + 5.0
+        while self.port_open() and time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 1.5, self.poll_max)
+    
+    def _fail(self, reason: str):
+        self.failure = reason
+        self.ready.clear()
+        logger.error(f"Backend not started: {reason}")
+    
+    def _spawn(self):
+        self.ready.clear()
+        self.started_at = time.monotonic()
+        self.process = subprocess.Popen(self.command, env=self.env)
+        self._record_pid(self.process.pid)
+        logger.info(f"Backend started: {' '.join(self.command)} (pid {self.process.pid}) on port {self.port}")
+    
+    def _wait_until_ready(self) -> bool:
+        """Poll with backoff until ready; False if the child exits, times out or we stop"""
+        delay = self.poll_initial
+        deadline = self.started_at + self.startup_timeout
+        while not self.stop_event.is_set():
+            if self.process.poll() is not None:
+                return False
+            if self.probe(pid=self.process.pid):
+                self.ready_at = time.monotonic()
+                self.startup_seconds = round(self.ready_at - self.started_at, 3)
+                self.ready.set()
+                logger.info(f"Backend ready on port {self.port} in {self.startup_seconds}s")
+                return True
+            if time.monotonic() >= deadline:
+                logger.error(f"Backend not ready on port {self.port} after {self.startup_timeout}s")
+                return False
+            self.stop_event.wait(delay)
+            delay = min(delay * 1.5, self.poll_max)
+        return False
+    
+    def _run(self):
+        """Supervise the backend once this worker holds the host lock, following the holder until then"""
+        delay = self.poll_initial
+        while not self.stop_event.is_set():
+            try:
+                owner = self._acquire_host_lock()
+            except OSError as e:
+                self._fail(f"cannot open supervisor lock {self.lock_path}: {e}")
+                return
+            if owner:
+                self._supervise()
+                return
+            
+            pid = self._owner_pid()
+            if pid is not None and self.probe(pid=pid):
+                if not self.ready.is_set():
+                    logger.info(f"Backend on port {self.port} (pid {pid}) is ready, supervised by another worker")
+                    self.ready.set()
+                delay = self.follow_interval
+            else:
+                self.ready.clear()
+                delay = min(delay * 1.5, self.poll_max)
+            self.stop_event.wait(delay)
+    
+    def _supervise(self):
+        restart_delay = 1.0
+        try:
+            self._kill_stale()
+            if self.port_open():
+                self._fail(f"port {self.port} is in use by another process")
+                return
+            self._spawn()
+        except Exception as e:
+            self._fail(f"error starting backend: {e}")
+            return
+        
+        while not self.stop_event.is_set():
+            ready = self._wait_until_ready()
+            if not ready and self.process.poll() is None and not self.stop_event.is_set():
+                # Hung on startup: replace it like a crash
+                self.process.kill()
+            
+            while not self.stop_event.is_set():
+                try:
+                    self.last_exit_code = self.process.wait(timeout=1.0)
+                    break
+                except subprocess.TimeoutExpired:
+                    continue
+            self.ready.clear()
+            if self.stop_event.is_set():
+                return
+            
+            # Exited before answering while something else holds the port: a bind conflict
+            # that restarting cannot fix
+            if not ready and self.port_open():
+                self._fail(f"port {self.port} is in use by another process "
+                           f"(backend exited with code {self.last_exit_code})")
+                return
+            
+            uptime = time.monotonic() - self.started_at
+            if uptime >= self.stable_seconds:
+                restart_delay = 1.0
+            logger.warning(f"Backend exited with code {self.last_exit_code} after {uptime:.1f}s, "
+                           f"restarting in {restart_delay:.1f}s")
+            if self.stop_event.wait(restart_delay):
+                return
+            restart_delay = min(restart_delay * 2, self.restart_backoff_max)
+            
+            try:
+                self._spawn()
+                self.restarts += 1
+            except Exception as e:
+                self._fail(f"error restarting backend: {e}")
+                return
+    
+    def stats(self) -> Dict:
+        process = self.process
+        if self.owner:
+            pid = process.pid if process is not None and process.poll() is None else None
+        else:
+            pid = self._owner_pid()
+        return {
+            'ready': self.is_ready(),
+            'owner': self.owner,
+            'pid': pid,
+            'port': self.port,
+            'restarts': self.restarts,
+            'startup_seconds': self.startup_seconds,
+            'uptime_seconds': round(time.monotonic() - self.ready_at, 1) if self.is_ready() and self.ready_at else None,
+            'last_exit_code': self.last_exit_code,
+            'failure': self.failure
+        }
+
+def node_backend(port: int = 5001, **kwargs) -> BackendSupervisor:
+    """Supervisor for the Node.js server (node main.js) on port"""
+    return BackendSupervisor(['node', 'main.js'], port, env={**os.environ, 'PORT': str(port)},
+                             kill_pattern='node main.js', **kwargs)
@@ -0,0 +1,257 @@
+"""
+Cache Pre-Warmer for Top-Scored Tickers
+Keeps price, option chain and quotes for the highest etf_scores symbols in cache
+so the first analysis of a hot ticker is served without upstream calls
+"""
+
+import os
+import math
+import time
+import logging
+import threading
+from datetime import datetime, timezone, time as dt_time
+from typing import List, Dict, Optional
+from zoneinfo import ZoneInfo
+
+from debit_spread_analyzer import DebitSpreadAnalyzer, analyzer as default_analyzer
+
+try:
+    import psycopg2
+except ImportError:  # Ticker list can still come from PREWARM_TICKERS
+    psycopg2 = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MARKET_TZ = ZoneInfo('America/New_York')
+MARKET_OPEN = dt_time(9, 30)
+MARKET_CLOSE = dt_time(16, 0)
+
+# Same ranking the ticker list API shows users
+TOP_TICKERS_QUERY = """
+    SELECT symbol FROM etf_scores
+    ORDER BY total_score DESC, options_contracts_10_42_dte DESC, symbol ASC
+    LIMIT %s
+"""
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """Regular US equity session, Monday-Friday 9:30-16:00 Eastern (exchange holidays not excluded)"""
+    now = (now or datetime.now(timezone.utc)).astimezone(MARKET_TZ)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+class CallBudget:
+    """Token bucket pacing upstream calls to a per-minute budget
+    
+    Tokens refill continuously, so calls are spread evenly across the minute
+    instead of bursting at its start.
+    """
+    
+    def __init__(self, calls_per_minute: int):
+        self.calls_per_minute = max(1, calls_per_minute)
+        self.tokens = float(self.calls_per_minute)
+        self.updated = time.monotonic()
+        self.spent = 0
+        self.lock = threading.Lock()
+    
+    def acquire(self, calls: int, stop_event: threading.Event) -> bool:
+        """Wait until calls tokens are available; False if stopped while waiting"""
+        if calls <= 0:
+            return True
+        
+        calls = min(calls, self.calls_per_minute)
+        while not stop_event.is_set():
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.calls_per_minute,
+                                  self.tokens + (now - self.updated) * self.calls_per_minute / 60.0)
+                self.updated = now
+                if self.tokens >= calls:
+                    self.tokens -= calls
+                    self.spent += calls
+                    return True
+                wait_seconds = (calls - self.tokens) * 60.0 / self.calls_per_minute
+            stop_event.wait(wait_seconds)
+        return False
+
+class CachePrewarmer:
+    """Periodically refresh cached market data for the top N scored tickers
+    
+    Each pass refreshes prices for all tickers in shared snapshot batches, then
+    the option chain and the quotes for every leg the strategies would price.
+    Only entries that are missing or would go stale before the next pass are
+    fetched, and every upstream call is charged against the CallBudget.
+    """
+    
+    def __init__(self, analyzer: Optional[DebitSpreadAnalyzer] = None, top_n: Optional[int] = None,
+                 interval_seconds: Optional[float] = None, calls_per_minute: Optional[int] = None,
+                 database_url: Optional[str] = None):
+        self.analyzer = analyzer or default_analyzer
+        self.top_n = top_n or int(os.environ.get('PREWARM_TOP_N', 20))
+        
+        # Passes run at half the shortest soft TTL, and an entry is refreshed
+        # once less than half an interval of freshness remains, so each entry
+        # is refetched about once per soft TTL and is never stale for long
+        soft_ttl = min(self.analyzer.price_soft_ttl, self.analyzer.quote_soft_ttl)
+        self.interval_seconds = interval_seconds or float(os.environ.get('PREWARM_INTERVAL', max(1.0, soft_ttl / 2)))
+        self.refresh_margin = float(os.environ.get('PREWARM_REFRESH_MARGIN', self.interval_seconds / 2))
+        self.budget = CallBudget(calls_per_minute or int(os.environ.get('PREWARM_CALLS_PER_MINUTE', 60)))
+        self.database_url = database_url or os.environ.get('DATABASE_URL')
+        self.market_hours_only = os.environ.get('PREWARM_MARKET_HOURS_ONLY', 'true').lower() != 'false'
+        self.ticker_refresh_seconds = float(os.environ.get('PREWARM_TICKER_REFRESH', 300))
+        
+        self.tickers = []
+        self.tickers_loaded_at = 0.0
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.passes = 0
+        self.last_pass = None
+    
+    def start(self):
+        """Start the pre-warm loop on a daemon thread"""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name='cache-prewarmer', daemon=True)
+        self.thread.start()
+        logger.info(f"Cache pre-warmer started: top {self.top_n} tickers every {self.interval_seconds}s, "
+                    f"{self.budget.calls_per_minute} upstream calls/min")
+    
+    def stop(self):
+        """Stop the pre-warm loop"""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+    
+    def _run(self):
+        while not self.stop_event.is_set():
+            started = time.monotonic()
+            if not self.market_hours_only or is_market_open():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    logger.error(f"Cache pre-warm pass failed: {e}")
+            self.stop_event.wait(max(1.0, self.interval_seconds - (time.monotonic() - started)))
+    
+    def load_top_tickers(self) -> List[str]:
+        """Top N symbols by total_score, reloaded every PREWARM_TICKER_REFRESH seconds"""
+        if self.tickers and time.monotonic() - self.tickers_loaded_at < self.ticker_refresh_seconds:
+            return self.tickers
+        
+        override = os.environ.get('PREWARM_TICKERS')
+        if override:
+            tickers = [ticker.strip().upper() for ticker in override.split(',') if ticker.strip()]
+        elif psycopg2 is None or not self.database_url:
+            logger.warning("Cache pre-warmer has no ticker source - set DATABASE_URL (with psycopg2) or PREWARM_TICKERS")
+            tickers = []
+        else:
+            conn = psycopg2.connect(self.database_url)
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(TOP_TICKERS_QUERY, (self.top_n,))
+                    tickers = [row[0].upper() for row in cur.fetchall()]
+            finally:
+                conn.close()
+        
+        self.tickers = tickers[:self.top_n]
+        self.tickers_loaded_at = time.monotonic()
+        return self.tickers
+    
+    def needs_refresh(self, cached_data: Optional[Dict]) -> bool:
+        """True if an entry is missing or has less than refresh_margin seconds of freshness left"""
+        if not cached_data:
+            return True
+        try:
+            fresh_until = datetime.fromisoformat(cached_data['fresh_until'])
+        except (KeyError, TypeError, ValueError):
+            return True
+        return (fresh_until - datetime.now(timezone.utc)).total_seconds() < self.refresh_margin
+    
+    def run_once(self) -> Dict:
+        """Run one pre-warm pass and return its counters"""
+        started = time.monotonic()
+        spent_before = self.budget.spent
+        tickers = self.load_top_tickers()
+        result = {'tickers': len(tickers), 'chains': 0, 'quotes': 0}
+        if not tickers:
+            return result
+        
+        analyzer = self.analyzer
+        cache = analyzer.cache_service
+        
+        # Prices for every ticker in shared snapshot batches
+        price_keys = {ticker: f"stock_price_snapshot:{ticker}" for ticker in tickers}
+        cached = cache.get_many(list(price_keys.values()))
+        stale = [ticker for ticker, key in price_keys.items() if self.needs_refresh(cached.get(key))]
+        if stale and self.budget.acquire(math.ceil(len(stale) / analyzer.price_batch_size), self.stop_event):
+            analyzer.refresh_stock_prices(stale)
+            cached = cache.get_many(list(price_keys.values()))
+        prices = {ticker: float(cached[key]['data']['price']) for ticker, key in price_keys.items()
+                  if cached.get(key, {}).get('data', {}).get('price')}
+        
+        for ticker in tickers:
+            if self.stop_event.is_set():
+                break
+            price = prices.get(ticker)
+            if not price:
+                continue
+            
+            # Option chain (long TTL, so usually already cached); missing or
+            # rolled-over chains cost an upstream call
+            chain = analyzer.get_cached_option_chain(ticker)
+            if chain is None:
+                if not self.budget.acquire(1, self.stop_event):
+                    break
+                result['chains'] += 1
+                chain = analyzer.get_option_chain(ticker)
+            if not chain:
+                continue
+            
+            # Quotes for every leg any strategy would price
+            _, _, contract_symbols = analyzer.prepare_strategy_evaluators(chain, price)
+            quote_keys = {symbol: f"options_quote:{symbol}" for symbol in dict.fromkeys(contract_symbols)}
+            cached = cache.get_many(list(quote_keys.values()))
+            refresh = [symbol for symbol, key in quote_keys.items() if self.needs_refresh(cached.get(key))]
+            for i in range(0, len(refresh), analyzer.quote_batch_size):
+                batch = refresh[i:i + analyzer.quote_batch_size]
+                if not self.budget.acquire(1, self.stop_event):
+                    break
+                analyzer.refresh_options_quote_batch(batch)
+                result['quotes'] += len(batch)
+        
+        result['upstream_calls'] = self.budget.spent - spent_before
+        result['duration_seconds'] = round(time.monotonic() - started, 2)
+        self.passes += 1
+        self.last_pass = result
+        logger.info(f"Cache pre-warm pass: {result['tickers']} tickers, {result['chains']} chains, "
+                    f"{result['quotes']} quotes, {result['upstream_calls']} upstream calls in {result['duration_seconds']}s")
+        return result
+    
+    def stats(self) -> Dict:
+        return {
+            'running': self.thread is not None and self.thread.is_alive(),
+            'market_open': is_market_open(),
+            'top_n': self.top_n,
+            'interval_seconds': self.interval_seconds,
+            'refresh_margin_seconds': self.refresh_margin,
+            'calls_per_minute': self.budget.calls_per_minute,
+            'passes': self.passes,
+            'last_pass': self.last_pass
+        }
+
+# Global pre-warmer for the default analyzer
+prewarmer = CachePrewarmer()
+
+def start_prewarmer() -> CachePrewarmer:
+    """Start the global pre-warmer (idempotent)"""
+    prewarmer.start()
+    return prewarmer
+
+if __name__ == '__main__':
+    # Run the pre-warmer in the foreground
+    start_prewarmer()
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        prewarmer.stop()
@@ -6,123 +6,1336 @@ Uses TheTradeList API with ThinkOrSwim pricing methodology
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import logging
 import threading
 import hashlib
+import bisect
+import heapq
+import itertools
+import uuid
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Iterator, Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from collections import deque
+from collections import deque, OrderedDict
+
+from spread_metrics import (
+    metrics, STAGE_SECONDS, ANALYSIS_SECONDS, UPSTREAM_SECONDS, UPSTREAM_REQUESTS,
+    LIMITER_WAIT_SECONDS, REDIS_SECONDS, PAIRS_EVALUATED, QUOTES_REQUESTED
+)
+
+try:
+    import redis
+except ImportError:  # Native Redis is optional; Upstash REST is used without it
+    redis = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+TRADELIST_BASE_URL = "https://api.thetradelist.com/v1/data"
+
+class PooledHTTPClient:
+    """Shared keep-alive HTTP client for TheTradeList and Upstash calls
+    
+    One requests.Session with a connection pool per host, so repeated calls
+    reuse TCP+TLS connections instead of paying a handshake each time. The
+    pool is sized for the analyzer's executor widths (quote batch workers
+    across concurrent analyses) and timeouts are (connect, read) pairs.
+    """
+    
+    def __init__(self, pool_maxsize: Optional[int] = None, connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None):
+        self.pool_maxsize = pool_maxsize or int(os.environ.get('HTTP_POOL_MAXSIZE', 20))
+        self.connect_timeout = connect_timeout or float(os.environ.get('HTTP_CONNECT_TIMEOUT', 3.05))
+        self.read_timeout = read_timeout or float(os.environ.get('HTTP_READ_TIMEOUT', 10))
+        self._session = None
+        self._session_lock = threading.Lock()
+    
+    @property
+    def session(self) -> requests.Session:
+        """Lazily create the pooled session on first use"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_maxsize, max_retries=0)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+        return self._session
+    
+    def _timeout(self, timeout: Optional[float]) -> Tuple[float, float]:
+        return (self.connect_timeout, timeout or self.read_timeout)
+    
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            timeout: Optional[float] = None) -> requests.Response:
+        """GET through the shared pool; timeout is the read timeout in seconds"""
+        return self.session.get(url, params=params, headers=headers, timeout=self._timeout(timeout))
+    
+    def post(self, url: str, json: Any = None, data: Any = None, headers: Optional[Dict] = None,
+             timeout: Optional[float] = None) -> requests.Response:
+        """POST through the shared pool; timeout is the read timeout in seconds"""
+        return self.session.post(url, json=json, data=data, headers=headers, timeout=self._timeout(timeout))
+    
+    def close(self):
+        """Close pooled connections"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+# Process-wide pooled client shared by the cache service and analyzer
+shared_http_client = PooledHTTPClient()
+
+class UpstreamBusyError(Exception):
+    """The upstream limiter could not admit a call within its acquire timeout"""
+
+class UpstreamLimiter:
+    """Process-wide admission control for TheTradeList calls
+    
+    A token bucket caps the request rate (TRADELIST_RATE_LIMIT per second,
+    bursts up to TRADELIST_RATE_BURST). On top of it an AIMD concurrency
+    limit tracks upstream health: each healthy response grows the limit by
+    1/limit, while errors, 429s or latency well above the endpoint's own
+    fastest observed baseline shrink it multiplicatively, at most once per
+    cooldown. Latency is tracked per endpoint because their normal speeds
+    differ by an order of magnitude (snapshot-locale vs options-contracts).
+    A 429 Retry-After pauses admissions until it elapses, capped at
+    TRADELIST_MAX_RETRY_AFTER seconds. acquire() gives up after
+    TRADELIST_ACQUIRE_TIMEOUT seconds with UpstreamBusyError, so callers
+    fall into their upstream-error handling instead of hanging.
+    """
+    
+    def __init__(self, rate_per_second: Optional[float] = None, burst: Optional[int] = None,
+                 initial_limit: Optional[int] = None, min_limit: Optional[int] = None,
+                 max_limit: Optional[int] = None):
+        self.rate = rate_per_second or float(os.environ.get('TRADELIST_RATE_LIMIT', 20))
+        self.burst = burst or int(os.environ.get('TRADELIST_RATE_BURST', 40))
+        self.min_limit = min_limit or int(os.environ.get('TRADELIST_CONCURRENCY_MIN', 2))
+        self.max_limit = max_limit or int(os.environ.get('TRADELIST_CONCURRENCY_MAX', 50))
+        self.limit = float(initial_limit or int(os.environ.get('TRADELIST_CONCURRENCY_INITIAL', 10)))
+        self.latency_tolerance = float(os.environ.get('TRADELIST_LATENCY_TOLERANCE', 2.0))
+        self.max_retry_after = float(os.environ.get('TRADELIST_MAX_RETRY_AFTER', 30))
+        self.acquire_timeout = float(os.environ.get('TRADELIST_ACQUIRE_TIMEOUT', 10))
+        self.backoff = 0.7
+        self.cooldown_seconds = 1.0
+        
+        self.tokens = float(self.burst)
+        self.refilled_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.in_flight = 0
+        self.latency = {}  # endpoint -> [baseline, recent EWMA] seconds
+        self.last_decrease = 0.0
+        self.condition = threading.Condition()
+        
+        self.admitted = 0
+        self.failures = 0
+        self.throttled = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+    
+    def _admit_delay(self, now: float) -> float:
+        """Seconds until a call can be admitted; admits it and returns 0 when possible (caller holds the lock)"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.in_flight >= int(self.limit):
+            return 0.05  # Woken early by release()
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        self.tokens -= 1
+        self.in_flight += 1
+        self.admitted += 1
+        return 0.0
+    
+    def acquire(self, timeout: Optional[float] = None):
+        """Block until the call is admitted; raises UpstreamBusyError after timeout seconds"""
+        started = time.monotonic()
+        deadline = started + (self.acquire_timeout if timeout is None else timeout)
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                delay = self._admit_delay(now)
+                if delay <= 0:
+                    self.total_wait_seconds += now - started
+                    return
+                if now >= deadline:
+                    self.timeouts += 1
+                    self.total_wait_seconds += now - started
+                    raise UpstreamBusyError(f"Upstream limiter did not admit the call within {deadline - started:.1f}s")
+                self.condition.wait(min(delay, deadline - now))
+    
+    def try_acquire(self) -> float:
+        """Admit the call without blocking, or return seconds to wait before retrying"""
+        with self.condition:
+            return self._admit_delay(time.monotonic())
+    
+    def release(self, latency: float, ok: bool, retry_after: Optional[float] = None, endpoint: str = 'default'):
+        """Record a finished call and adjust the concurrency limit"""
+        with self.condition:
+            now = time.monotonic()
+            self.in_flight = max(0, self.in_flight - 1)
+            if retry_after:
+                self.throttled += 1
+                self.blocked_until = max(self.blocked_until, now + min(retry_after, self.max_retry_after))
+            
+            if ok:
+                overloaded = self._observe_latency(endpoint, latency)
+            else:
+                self.failures += 1
+                overloaded = True
+            
+            if not overloaded:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            elif now - self.last_decrease >= self.cooldown_seconds:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self.last_decrease = now
+            self.condition.notify_all()
+    
+    def _observe_latency(self, endpoint: str, latency: float) -> bool:
+        """Update the endpoint's baseline and EWMA; True if it is well above its baseline (caller holds the lock)"""
+        state = self.latency.get(endpoint)
+        if state is None:
+            state = self.latency[endpoint] = [latency, latency]
+        baseline, recent = state
+        recent = 0.8 * recent + 0.2 * latency
+        # Baseline follows the fastest healthy responses down at once and drifts up slowly
+        baseline = latency if latency < baseline else 0.999 * baseline + 0.001 * latency
+        state[0], state[1] = baseline, recent
+        return recent > max(baseline * self.latency_tolerance, baseline + 0.05)
+    
+    def stats(self) -> Dict:
+        with self.condition:
+            return {
+                'concurrency_limit': round(self.limit, 2),
+                'in_flight': self.in_flight,
+                'rate_per_second': self.rate,
+                'tokens': round(self.tokens, 2),
+                'admitted': self.admitted,
+                'failures': self.failures,
+                'throttled': self.throttled,
+                'timeouts': self.timeouts,
+                'latency_ms': {
+                    endpoint: {'baseline': round(baseline * 1000, 1), 'recent': round(recent * 1000, 1)}
+                    for endpoint, (baseline, recent) in sorted(self.latency.items())
+                },
+                'total_wait_seconds': round(self.total_wait_seconds, 2)
+            }
+
+class RateLimitedHTTPClient:
+    """GET-only front for a PooledHTTPClient that admits every call through an UpstreamLimiter"""
+    
+    def __init__(self, http_client: PooledHTTPClient, limiter: UpstreamLimiter):
+        self.http = http_client
+        self.limiter = limiter
+    
+    @staticmethod
+    def retry_after(response) -> Optional[float]:
+        """Seconds from a 429 Retry-After header (1s if absent or not numeric)"""
+        if response.status_code != 429:
+            return None
+        try:
+            return float(getattr(response, 'headers', {}).get('Retry-After', 1))
+        except (TypeError, ValueError):
+            return 1.0
+    
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            timeout: Optional[float] = None) -> requests.Response:
+        endpoint = url.rsplit('/', 1)[-1]
+        started = time.monotonic()
+        self.limiter.acquire()
+        admitted = time.monotonic()
+        LIMITER_WAIT_SECONDS.observe(admitted - started)
+        
+        ok, retry_after, status = False, None, 'error'
+        try:
+            response = self.http.get(url, params=params, headers=headers, timeout=timeout)
+            status = str(response.status_code)
+            ok = response.status_code < 500 and response.status_code != 429
+            retry_after = self.retry_after(response)
+            return response
+        finally:
+            latency = time.monotonic() - admitted
+            self.limiter.release(latency, ok, retry_after, endpoint)
+            UPSTREAM_SECONDS.observe(latency, endpoint=endpoint)
+            UPSTREAM_REQUESTS.inc(endpoint=endpoint, status=status)
+
+# Process-wide limiter shared by every analyzer calling TheTradeList
+tradelist_limiter = UpstreamLimiter()
+
+class LocalLRUCache:
+    """Size-bounded in-process LRU tier with per-entry TTL"""
+    
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or int(os.environ.get('LOCAL_CACHE_MAX_ENTRIES', 5000))
+        self._entries = OrderedDict()  # key -> (monotonic expiry, cache payload)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the live payload for key, dropping it if expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if time.monotonic() < entry[0]:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def set(self, key: str, payload: Dict, expiry_seconds: float):
+        """Store payload for expiry_seconds, evicting least recently used entries"""
+        if expiry_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + expiry_seconds, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
 class RedisCacheService:
-    """Redis caching service for API efficiency"""
+    """Two-tier caching service for API efficiency
     
-    def __init__(self):
+    An in-process LRU answers hot keys without a network round trip; Redis
+    sits behind it for sharing across instances. Both tiers store the same
+    JSON envelope with an absolute expiry. Redis is reached through a native
+    client when REDIS_URL is set and redis-py is installed, otherwise through
+    the Upstash REST /pipeline endpoint; either way every batch of commands
+    is a single round trip.
+    """
+    
+    def __init__(self, http_client: Optional[PooledHTTPClient] = None, redis_client: Any = None):
+        self.http = http_client or shared_http_client
         self.redis_url = os.environ.get('UPSTASH_REDIS_REST_URL')
         self.redis_token = os.environ.get('UPSTASH_REDIS_REST_TOKEN')
-        self.cache_enabled = bool(self.redis_url and self.redis_token)
+        self.native = redis_client
+        self.local_cache = LocalLRUCache()
+        self.stats_lock = threading.Lock()
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.redis_round_trips = 0
+        
+        native_url = os.environ.get('REDIS_URL')
+        if self.native is None and native_url:
+            if redis is not None:
+                self.native = redis.Redis.from_url(native_url, decode_responses=True,
+                                                   socket_timeout=2, socket_connect_timeout=2)
+            else:
+                logger.warning("REDIS_URL is set but redis-py is not installed - using Upstash REST if configured")
         
-        if self.cache_enabled:
+        self.cache_enabled = self.native is not None or bool(self.redis_url and self.redis_token)
+        
+        if self.native is not None:
+            logger.info("Redis caching enabled with native client")
+        elif self.cache_enabled:
             logger.info("Redis caching enabled with Upstash")
         else:
             logger.info("Redis caching disabled - missing credentials")
     
-    def _make_redis_request(self, command: str, key: str, value: str = None) -> Optional[Dict]:
-        """Make HTTP request to Upstash Redis REST API"""
-        if not self.cache_enabled:
+    def build_pipeline_request(self) -> Tuple[str, Dict]:
+        """URL and headers for an Upstash REST /pipeline POST"""
+        headers = {
+            'Authorization': f'Bearer {self.redis_token}',
+            'Content-Type': 'application/json'
+        }
+        return f"{self.redis_url}/pipeline", headers
+    
+    @staticmethod
+    def decode_pipeline(results: List[Dict]) -> List[Any]:
+        """Per-command values from an Upstash pipeline response, None for failed commands"""
+        return [None if 'error' in result else result.get('result') for result in results]
+    
+    def pipeline(self, commands: List[List[Any]]) -> Optional[List[Any]]:
+        """Run several Redis commands in one round trip
+        
+        Returns one value per command (None where a command failed), or None
+        if Redis is disabled or unreachable.
+        """
+        if not self.cache_enabled or not commands:
             return None
-            
+        
+        with self.stats_lock:
+            self.redis_round_trips += 1
+        started = time.monotonic()
+        transport = 'native' if self.native is not None else 'upstash'
         try:
-            url = f"{self.redis_url}/{command}/{key}"
-            if value is not None:
-                url += f"/{value}"
-            
-            headers = {
-                'Authorization': f'Bearer {self.redis_token}',
-                'Content-Type': 'application/json'
-            }
+            if self.native is not None:
+                pipe = self.native.pipeline(transaction=False)
+                for command in commands:
+                    pipe.execute_command(*command)
+                return [None if isinstance(result, Exception) else result
+                        for result in pipe.execute(raise_on_error=False)]
             
-            response = requests.get(url, headers=headers, timeout=2)
+            url, headers = self.build_pipeline_request()
+            response = self.http.post(url, json=commands, headers=headers, timeout=2)
             if response.status_code == 200:
-                return response.json()
+                return self.decode_pipeline(response.json())
         except Exception as e:
-            logger.debug(f"Redis request failed: {e}")
+            logger.debug(f"Redis pipeline failed: {e}")
+        finally:
+            REDIS_SECONDS.observe(time.monotonic() - started, transport=transport)
         return None
     
     def get_cached_data(self, cache_key: str) -> Optional[Dict]:
-        """Get cached data from Redis"""
-        result = self._make_redis_request('get', cache_key)
-        if result and result.get('result'):
+        """Get cached data from the local tier, falling back to Redis"""
+        return self.get_many([cache_key]).get(cache_key)
+    
+    def get_many(self, cache_keys: List[str]) -> Dict[str, Dict]:
+        """Get cached payloads for many keys with at most one Redis MGET"""
+        found, missing = self.get_local_many(cache_keys)
+        if missing and self.cache_enabled:
+            results = self.pipeline([['MGET'] + missing])
+            found.update(self.decode_many(missing, results[0] if results else None))
+        return found
+    
+    def get_local_many(self, cache_keys: List[str]) -> Tuple[Dict[str, Dict], List[str]]:
+        """Split keys into local-tier hits and keys that need Redis"""
+        found = {}
+        missing = []
+        for cache_key in dict.fromkeys(cache_keys):
+            cached_data = self.local_cache.get(cache_key)
+            if cached_data is not None:
+                found[cache_key] = cached_data
+            else:
+                missing.append(cache_key)
+        return found, missing
+    
+    def decode_many(self, cache_keys: List[str], values: Optional[List[Optional[str]]]) -> Dict[str, Dict]:
+        """Decode an MGET reply aligned with cache_keys, keeping live entries"""
+        values = values or [None] * len(cache_keys)
+        found = {}
+        for cache_key, value in zip(cache_keys, values):
+            cached_data = self.decode_result(cache_key, value)
+            if cached_data is not None:
+                found[cache_key] = cached_data
+        return found
+    
+    def decode_result(self, cache_key: str, value: Optional[str]) -> Optional[Dict]:
+        """Validate a raw Redis value, promoting live entries into the local tier"""
+        if value:
             try:
-                cached_data = json.loads(result['result'])
+                cached_data = json.loads(value)
                 expiry_time = datetime.fromisoformat(cached_data.get('expiry', ''))
-                if datetime.now(timezone.utc) < expiry_time:
+                remaining = (expiry_time - datetime.now(timezone.utc)).total_seconds()
+                if remaining > 0:
+                    # Promote into the local tier for the rest of its lifetime
+                    self.local_cache.set(cache_key, cached_data, remaining)
+                    with self.stats_lock:
+                        self.redis_hits += 1
                     return cached_data
             except Exception:
                 pass
+        
+        with self.stats_lock:
+            self.redis_misses += 1
         return None
     
-    def cache_data(self, cache_key: str, data: Any, expiry_seconds: int = 30) -> bool:
-        """Cache data in Redis with expiry"""
-        if not self.cache_enabled:
-            return False
-            
+    def cache_data(self, cache_key: str, data: Any, expiry_seconds: int = 30,
+                   fresh_seconds: Optional[int] = None) -> bool:
+        """Cache data in both tiers with expiry
+        
+        fresh_seconds (default: expiry_seconds) is the soft TTL after which the
+        entry is still served but reported as stale by staleness().
+        """
+        return self.cache_many({cache_key: data}, expiry_seconds, fresh_seconds)
+    
+    def cache_many(self, items: Dict[str, Any], expiry_seconds: int = 30,
+                   fresh_seconds: Optional[int] = None) -> bool:
+        """Cache many values in both tiers, writing Redis in one pipeline"""
         try:
-            expiry_time = datetime.now(timezone.utc) + timedelta(seconds=expiry_seconds)
-            cache_payload = {
-                'data': data,
-                'cached_at': datetime.now(timezone.utc).isoformat(),
-                'expiry': expiry_time.isoformat()
-            }
+            commands = self.build_set_commands(items, expiry_seconds, fresh_seconds)
+            if not self.cache_enabled or not commands:
+                return True
             
-            result = self._make_redis_request('setex', cache_key, f"{expiry_seconds}/{json.dumps(cache_payload)}")
-            return result is not None
+            results = self.pipeline(commands)
+            return results is not None and all(results)
         except Exception as e:
             logger.debug(f"Cache write failed: {e}")
             return False
+    
+    def build_set_commands(self, items: Dict[str, Any], expiry_seconds: int,
+                           fresh_seconds: Optional[int] = None) -> List[List[Any]]:
+        """Write items to the local tier and return the matching Redis SET ... EX commands
+        
+        MSET cannot attach a TTL, so multi-key writes are pipelined SETs.
+        """
+        commands = []
+        for cache_key, data in items.items():
+            cache_payload = self.build_payload(data, expiry_seconds, fresh_seconds)
+            self.local_cache.set(cache_key, cache_payload, expiry_seconds)
+            commands.append(['SET', cache_key, json.dumps(cache_payload), 'EX', int(expiry_seconds)])
+        return commands
+    
+    def build_payload(self, data: Any, expiry_seconds: int, fresh_seconds: Optional[int] = None) -> Dict:
+        """JSON envelope shared by both cache tiers"""
+        now = datetime.now(timezone.utc)
+        expiry_time = now + timedelta(seconds=expiry_seconds)
+        fresh_until = now + timedelta(seconds=min(fresh_seconds or expiry_seconds, expiry_seconds))
+        return {
+            'data': data,
+            'cached_at': now.isoformat(),
+            'fresh_until': fresh_until.isoformat(),
+            'expiry': expiry_time.isoformat()
+        }
+    
+    @staticmethod
+    def staleness(cached_data: Dict) -> float:
+        """Seconds a cached payload is past its soft TTL (0.0 while fresh)"""
+        try:
+            fresh_until = datetime.fromisoformat(cached_data['fresh_until'])
+        except (KeyError, TypeError, ValueError):
+            return 0.0
+        return max(0.0, (datetime.now(timezone.utc) - fresh_until).total_seconds())
+    
+    def get_stats(self) -> Dict:
+        """Hit/miss counters per cache tier"""
+        with self.stats_lock:
+            redis_stats = {
+                'enabled': self.cache_enabled,
+                'client': 'native' if self.native is not None else 'upstash',
+                'hits': self.redis_hits,
+                'misses': self.redis_misses,
+                'round_trips': self.redis_round_trips
+            }
+        return {
+            'local': self.local_cache.stats(),
+            'redis': redis_stats
+        }
 
-class SessionSpreadStorage:
-    """In-memory storage for spread analysis results"""
+class SpreadStorageBackend(ABC):
+    """Interface for stores that resolve spread IDs returned to clients"""
     
-    def __init__(self):
-        self.storage = {}
+    @abstractmethod
+    def store_spread(self, symbol: str, strategy: str, spread_data: Dict) -> str:
+        """Store spread data and return unique ID"""
+    
+    @abstractmethod
+    def get_spread(self, spread_id: str) -> Optional[Dict]:
+        """Retrieve spread data by ID"""
+    
+    def flush(self):
+        """Push buffered writes to the backing store"""
+    
+    def stats(self) -> Dict:
+        return {}
+
+class StoredSpread:
+    """Compact record for one stored spread"""
+    
+    __slots__ = ('id', 'symbol', 'strategy', 'data', 'stored_at', 'expires_at')
+    
+    def __init__(self, spread_id: str, symbol: str, strategy: str, data: Dict, stored_at: datetime, expires_at: float):
+        self.id = spread_id
+        self.symbol = symbol
+        self.strategy = strategy
+        self.data = data
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+    
+    def to_dict(self) -> Dict:
+        return {
+            'symbol': self.symbol,
+            'strategy': self.strategy,
+            'data': self.data,
+            'stored_at': self.stored_at,
+            'id': self.id
+        }
+
+class SessionSpreadStorage(SpreadStorageBackend):
+    """In-memory storage for spread analysis results
+    
+    Bounded by entry count and age. A heap orders records by expiry, so
+    expired entries go first and, over max_entries, the ones closest to
+    expiring are evicted, whatever order they were inserted in.
+    """
+    
+    def __init__(self, max_entries: Optional[int] = None, max_age_seconds: Optional[float] = None):
+        self.max_entries = max_entries or int(os.environ.get('SPREAD_STORAGE_MAX_ENTRIES', 10000))
+        self.max_age_seconds = max_age_seconds or float(os.environ.get('SPREAD_STORAGE_MAX_AGE', 3600))
+        self.storage = {}  # spread_id -> StoredSpread
+        self.expiry = []  # heap of (expires_at, spread_id); stale once the ID is replaced or dropped
         self.lock = threading.Lock()
+        self.sequence = itertools.count()
+        self.stored = 0
+        self.expired = 0
+        self.evicted = 0
+    
+    def _pop_expiry(self) -> bool:
+        """Pop the soonest heap entry, removing its record if still live (caller holds the lock)"""
+        expires_at, spread_id = heapq.heappop(self.expiry)
+        record = self.storage.get(spread_id)
+        if record is None or record.expires_at != expires_at:
+            return False
+        del self.storage[spread_id]
+        return True
+    
+    def _evict(self, now: float):
+        """Drop expired entries, then the soonest to expire beyond max_entries (caller holds the lock)"""
+        while self.expiry and self.expiry[0][0] <= now:
+            if self._pop_expiry():
+                self.expired += 1
+        while len(self.storage) > self.max_entries:
+            if self._pop_expiry():
+                self.evicted += 1
+        if len(self.expiry) > 2 * len(self.storage) + 64:
+            self.expiry = [(record.expires_at, spread_id) for spread_id, record in self.storage.items()]
+            heapq.heapify(self.expiry)
     
     def store_spread(self, symbol: str, strategy: str, spread_data: Dict) -> str:
         """Store spread data and return unique ID"""
         timestamp = int(time.time())
-        spread_id = f"{symbol}_{strategy}_{len(self.storage)}_{timestamp}"
         
         with self.lock:
-            self.storage[spread_id] = {
-                'symbol': symbol,
-                'strategy': strategy,
-                'data': spread_data,
-                'stored_at': datetime.now(),
-                'id': spread_id
-            }
+            spread_id = f"{symbol}_{strategy}_{next(self.sequence)}_{timestamp}"
+        self.put(spread_id, symbol, strategy, spread_data, datetime.now())
         
         logger.info(f"Stored session spread {spread_id}: {symbol} {strategy} ROI={spread_data.get('roi', 0):.1f}%")
         return spread_id
     
-    def get_spread(self, spread_id: str) -> Optional[Dict]:
-        """Retrieve spread data by ID"""
-        with self.lock:
-            return self.storage.get(spread_id)
+    def put(self, spread_id: str, symbol: str, strategy: str, spread_data: Dict, stored_at: datetime,
+            max_age_seconds: Optional[float] = None):
+        """Insert a record under an existing ID"""
+        now = time.monotonic()
+        with self.lock:
+            record = StoredSpread(
+                spread_id, symbol, strategy, spread_data, stored_at, now + (max_age_seconds or self.max_age_seconds)
+            )
+            self.storage[spread_id] = record
+            heapq.heappush(self.expiry, (record.expires_at, spread_id))
+            self.stored += 1
+            self._evict(now)
+    
+    def get_spread(self, spread_id: str) -> Optional[Dict]:
+        """Retrieve spread data by ID"""
+        with self.lock:
+            record = self.storage.get(spread_id)
+            if record is None:
+                return None
+            if record.expires_at <= time.monotonic():
+                self._evict(time.monotonic())
+                return None
+            return record.to_dict()
+    
+    def stats(self) -> Dict:
+        with self.lock:
+            self._evict(time.monotonic())
+            return {
+                'entries': len(self.storage),
+                'max_entries': self.max_entries,
+                'max_age_seconds': self.max_age_seconds,
+                'stored': self.stored,
+                'expired': self.expired,
+                'evicted': self.evicted
+            }
+
+class RedisSpreadStorage(SpreadStorageBackend):
+    """Spread store shared across workers through RedisCacheService
+    
+    Records are kept in a local SessionSpreadStorage for same-process lookups
+    and buffered for Redis until flush(), which writes them all in one
+    pipelined round trip. IDs carry a random component so they never collide
+    between processes.
+    """
+    
+    KEY_PREFIX = 'spread:'
+    
+    def __init__(self, cache_service: RedisCacheService, ttl_seconds: Optional[int] = None,
+                 local: Optional[SessionSpreadStorage] = None):
+        self.cache_service = cache_service
+        self.ttl_seconds = ttl_seconds or int(os.environ.get('SPREAD_STORAGE_MAX_AGE', 3600))
+        self.local = local or SessionSpreadStorage(max_age_seconds=self.ttl_seconds)
+        self.pending = []
+        self.lock = threading.Lock()
+        self.redis_writes = 0
+        self.redis_write_failures = 0
+        self.redis_hits = 0
+        self.redis_misses = 0
+    
+    def store_spread(self, symbol: str, strategy: str, spread_data: Dict) -> str:
+        """Store spread data locally, queue it for Redis and return unique ID"""
+        spread_id = f"{symbol}_{strategy}_{uuid.uuid4().hex[:12]}_{int(time.time())}"
+        stored_at = datetime.now()
+        self.local.put(spread_id, symbol, strategy, spread_data, stored_at)
+        
+        record = json.dumps({
+            'symbol': symbol,
+            'strategy': strategy,
+            'data': spread_data,
+            'stored_at': stored_at.isoformat(),
+            'id': spread_id
+        })
+        with self.lock:
+            self.pending.append(['SET', self.KEY_PREFIX + spread_id, record, 'EX', self.ttl_seconds])
+        
+        logger.info(f"Stored shared spread {spread_id}: {symbol} {strategy} ROI={spread_data.get('roi', 0):.1f}%")
+        return spread_id
+    
+    def flush(self):
+        """Write all queued spreads to Redis in one pipeline"""
+        with self.lock:
+            commands, self.pending = self.pending, []
+        if not commands:
+            return
+        
+        results = self.cache_service.pipeline(commands)
+        failed = len(commands) if results is None else sum(1 for result in results if not result)
+        with self.lock:
+            self.redis_writes += len(commands) - failed
+            self.redis_write_failures += failed
+        if failed:
+            logger.warning(f"Failed to share {failed} of {len(commands)} spreads via Redis")
+    
+    def get_spread(self, spread_id: str) -> Optional[Dict]:
+        """Retrieve spread data by ID, falling back to Redis for other workers' spreads"""
+        record = self.local.get_spread(spread_id)
+        if record is not None:
+            return record
+        
+        results = self.cache_service.pipeline([
+            ['GET', self.KEY_PREFIX + spread_id],
+            ['TTL', self.KEY_PREFIX + spread_id]
+        ])
+        try:
+            if results and results[0]:
+                record = json.loads(results[0])
+                record['stored_at'] = datetime.fromisoformat(record['stored_at'])
+                ttl = results[1] or 0
+                if ttl > 0:
+                    self.local.put(spread_id, record['symbol'], record['strategy'], record['data'],
+                                   record['stored_at'], ttl)
+                with self.lock:
+                    self.redis_hits += 1
+                return record
+        except Exception as e:
+            logger.debug(f"Shared spread decode failed for {spread_id}: {e}")
+        
+        with self.lock:
+            self.redis_misses += 1
+        return None
+    
+    def stats(self) -> Dict:
+        with self.lock:
+            redis_stats = {
+                'pending': len(self.pending),
+                'writes': self.redis_writes,
+                'write_failures': self.redis_write_failures,
+                'hits': self.redis_hits,
+                'misses': self.redis_misses
+            }
+        return {
+            'backend': 'redis',
+            'local': self.local.stats(),
+            'redis': redis_stats
+        }
+
+def create_spread_storage(cache_service: RedisCacheService) -> SpreadStorageBackend:
+    """Spread store selected by SPREAD_STORAGE_BACKEND (memory or redis)"""
+    backend = os.environ.get('SPREAD_STORAGE_BACKEND', 'memory').lower()
+    if backend == 'redis':
+        if cache_service.cache_enabled:
+            return RedisSpreadStorage(cache_service)
+        logger.warning("SPREAD_STORAGE_BACKEND=redis but Redis is not configured - using in-memory spread storage")
+    return SessionSpreadStorage()
+
+class OptionContract:
+    """Compact, pre-parsed options contract record"""
+    
+    __slots__ = ('ticker', 'strike', 'expiration', 'dte', 'option_type')
+    
+    def __init__(self, ticker: str, strike: float, expiration: str, dte: int, option_type: str):
+        self.ticker = ticker
+        self.strike = strike
+        self.expiration = expiration
+        self.dte = dte
+        self.option_type = option_type
+    
+    def to_dict(self) -> Dict:
+        """Contract in the raw options-contracts API shape"""
+        return {
+            'ticker': self.ticker,
+            'strike_price': self.strike,
+            'expiration_date': self.expiration,
+            'option_type': self.option_type
+        }
+
+class OptionChain:
+    """Options chain parsed once per analysis and shared by every strategy
+    
+    Contracts are indexed by option type into expirations sorted by DTE, each
+    holding its contracts sorted by strike, so strategy filtering is a pair of
+    bisect range lookups instead of a full scan with per-contract strptime.
+    """
+    
+    def __init__(self, contracts: List[Dict], now: Optional[datetime] = None):
+        rows = []
+        for contract in contracts:
+            try:
+                expiration_str = contract.get('expiration_date', '')
+                if not expiration_str:
+                    continue
+                rows.append((contract.get('ticker', ''), float(contract.get('strike_price', 0)),
+                             expiration_str, contract.get('option_type')))
+            except Exception as e:
+                logger.debug(f"Error parsing contract: {e}")
+                continue
+        self._build(rows, now)
+    
+    @classmethod
+    def from_compact(cls, rows: List[List], now: Optional[datetime] = None) -> 'OptionChain':
+        """Rebuild a chain from to_compact() rows, recomputing DTE against now"""
+        chain = cls.__new__(cls)
+        chain._build(rows, now)
+        return chain
+    
+    def to_compact(self) -> List[List]:
+        """JSON-friendly [ticker, strike, expiration, option_type] rows"""
+        return [
+            [record.ticker, record.strike, record.expiration, record.option_type]
+            for expirations in self.index.values()
+            for _, _, _, records in expirations
+            for record in records
+        ]
+    
+    def _build(self, rows, now: Optional[datetime]):
+        now = now or datetime.now()
+        dte_by_expiration = {}
+        grouped = {}
+        
+        for ticker, strike, expiration_str, option_type in rows:
+            try:
+                dte = dte_by_expiration.get(expiration_str)
+                if dte is None:
+                    dte = (datetime.strptime(expiration_str, '%Y-%m-%d') - now).days
+                    dte_by_expiration[expiration_str] = dte
+                
+                grouped.setdefault((option_type, expiration_str), []).append(
+                    OptionContract(ticker, strike, expiration_str, dte, option_type)
+                )
+            except Exception as e:
+                logger.debug(f"Error parsing contract: {e}")
+                continue
+        
+        # option_type -> expirations sorted by DTE: (dte, expiration, strikes, records)
+        self.index = {}
+        for (option_type, expiration_str), records in grouped.items():
+            records.sort(key=lambda record: record.strike)
+            self.index.setdefault(option_type, []).append(
+                (dte_by_expiration[expiration_str], expiration_str, [record.strike for record in records], records)
+            )
+        for expirations in self.index.values():
+            expirations.sort(key=lambda entry: entry[0])
+        
+        self.size = sum(len(records) for records in grouped.values())
+        self.earliest_expiration = min(dte_by_expiration, default=None)
+    
+    def is_current(self) -> bool:
+        """False once the front expiration has passed and the listing has rolled"""
+        return bool(self.earliest_expiration) and self.earliest_expiration >= datetime.now().strftime('%Y-%m-%d')
+    
+    def select(self, option_type: str, dte_min: int, dte_max: int,
+               strike_min: float, strike_max: float) -> List[OptionContract]:
+        """Contracts of option_type within inclusive DTE and strike ranges"""
+        expirations = self.index.get(option_type, [])
+        dtes = [entry[0] for entry in expirations]
+        
+        selected = []
+        for i in range(bisect.bisect_left(dtes, dte_min), bisect.bisect_right(dtes, dte_max)):
+            _, _, strikes, records = expirations[i]
+            selected.extend(records[bisect.bisect_left(strikes, strike_min):bisect.bisect_right(strikes, strike_max)])
+        return selected
+
+def two_sided(bid: float, ask: float) -> bool:
+    """True for a usable quote: both sides positive and not crossed (bid above ask)"""
+    return 0 < bid <= ask
+
+def price_debit_spread(long_bid: float, long_ask: float, short_bid: float, short_ask: float) -> Tuple[float, float, float]:
+    """ThinkOrSwim professional spread pricing: returns (net_ask, net_bid, mid cost)"""
+    net_ask = long_ask - short_bid  # Cost to establish spread at worst prices
+    net_bid = short_ask - long_bid  # Credit if we could reverse at best prices
+    
+    # Handle negative net bid (illiquid spreads)
+    if net_bid < 0:
+        net_bid = net_ask * 0.95  # Professional platform methodology
+    
+    # Calculate spread cost using professional mid-price
+    return net_ask, net_bid, (net_ask + net_bid) / 2
+
+class SpreadEvaluator:
+    """Column-oriented spread evaluator over one strategy's filtered call chain
+    
+    Contracts are grouped by expiration into parallel strike/ticker/bid/ask
+    columns sorted by strike. Every long/short pair of a target width is found
+    with a bisect on the strike column and priced straight from the columns,
+    so the whole chain is evaluated without per-pair dicts or truncation.
+    
+    Quotes can be loaded incrementally. Any leg's cost floor (half its bid/ask
+    spread, see roi_bound) caps the ROI of every pair it is in, which lets
+    best_spread skip long legs and missing_symbols skip fetches for pairs that
+    cannot land in the ROI window or beat the best spread already found.
+    """
+    
+    WIDTH_TOLERANCE = 0.1
+    
+    def __init__(self, contracts: List[OptionContract]):
+        by_expiration = {}
+        for contract in contracts:
+            by_expiration.setdefault(contract.expiration, []).append(contract)
+        
+        self.expirations = []
+        for expiration_str, legs in by_expiration.items():
+            legs.sort(key=lambda leg: leg.strike)
+            self.expirations.append({
+                'expiration': expiration_str,
+                'dte': legs[0].dte,
+                'strikes': [leg.strike for leg in legs],
+                'tickers': [leg.ticker for leg in legs],
+                'bids': [0.0] * len(legs),
+                'asks': [0.0] * len(legs),
+                'quoted': [False] * len(legs)
+            })
+    
+    def _short_range(self, strikes: List[float], i: int, target_width: float) -> Tuple[int, int]:
+        """Index range of short legs whose width from strikes[i] matches target_width"""
+        target = strikes[i] + target_width
+        lo = bisect.bisect_left(strikes, target - self.WIDTH_TOLERANCE, i + 1)
+        hi = bisect.bisect_right(strikes, target + self.WIDTH_TOLERANCE, lo)
+        return lo, hi
+    
+    def pair_symbols(self, target_widths: List[float]) -> List[str]:
+        """Contract symbols that take part in at least one pair at any target width"""
+        symbols = []
+        for column in self.expirations:
+            strikes = column['strikes']
+            used = [False] * len(strikes)
+            for i in range(len(strikes)):
+                for target_width in target_widths:
+                    lo, hi = self._short_range(strikes, i, target_width)
+                    if lo < hi:
+                        used[i] = True
+                        for j in range(lo, hi):
+                            used[j] = True
+            symbols.extend(ticker for ticker, flag in zip(column['tickers'], used) if flag)
+        return symbols
+    
+    def load_quotes(self, quotes: Dict[str, Dict], requested: Optional[List[str]] = None):
+        """Fill bid/ask columns from a quote map; unquoted legs stay at 0 and are masked out
+        
+        Legs in requested that the quote map lacks are marked as quoted too, so
+        they are not requested again.
+        """
+        requested = set(requested or ())
+        for column in self.expirations:
+            bids, asks, quoted = column['bids'], column['asks'], column['quoted']
+            for k, ticker in enumerate(column['tickers']):
+                quote = quotes.get(ticker)
+                if quote:
+                    bids[k] = float(quote.get('bid') or 0)
+                    asks[k] = float(quote.get('ask') or 0)
+                    quoted[k] = True
+                elif ticker in requested:
+                    quoted[k] = True
+    
+    @staticmethod
+    def roi_bound(width: float, bid: float, ask: float) -> float:
+        """Upper bound on the ROI of any spread of this width with a leg quoted at bid/ask
+        
+        price_debit_spread never prices a spread below half of either leg's
+        bid/ask spread, so that half-spread is a floor on its cost. This only
+        holds when the other leg is two-sided too; crossed quotes are never
+        priced (see two_sided).
+        """
+        half_spread = (ask - bid) / 2
+        if half_spread <= 0:
+            return float('inf')
+        return (width - half_spread) / half_spread * 100
+    
+    def missing_symbols(self, target_width: float, roi_min: float, roi_max: float) -> List[str]:
+        """Unquoted legs still needed to find the best in-window spread at target_width
+        
+        A pair with a quoted leg is skipped when that leg has no two-sided quote
+        or its ROI bound falls below roi_min or below the best in-window ROI
+        among fully quoted pairs, since it could then never be selected.
+        """
+        best, _ = self.best_spread(target_width, roi_min, roi_max)
+        roi_floor = max(roi_min, best['roi'] if best else 0)
+        
+        needed = {}
+        for column in self.expirations:
+            strikes, bids, asks = column['strikes'], column['bids'], column['asks']
+            tickers, quoted = column['tickers'], column['quoted']
+            
+            for i in range(len(strikes)):
+                lo, hi = self._short_range(strikes, i, target_width)
+                for j in range(lo, hi):
+                    if quoted[i] and quoted[j]:
+                        continue
+                    
+                    known = i if quoted[i] else j if quoted[j] else None
+                    if known is not None:
+                        if not two_sided(bids[known], asks[known]):
+                            continue
+                        if self.roi_bound(strikes[j] - strikes[i], bids[known], asks[known]) < roi_floor:
+                            continue
+                    
+                    for k in (i, j):
+                        if not quoted[k]:
+                            needed[tickers[k]] = True
+        
+        return list(needed)
+    
+    def best_spread(self, target_width: float, roi_min: float, roi_max: float) -> Tuple[Optional[Dict], int]:
+        """Best in-window ROI spread at target_width, plus the number of pairs evaluated"""
+        best = None
+        best_roi = 0
+        evaluated = 0
+        
+        for column in self.expirations:
+            strikes, bids, asks = column['strikes'], column['bids'], column['asks']
+            
+            for i in range(len(strikes)):
+                long_bid, long_ask = bids[i], asks[i]
+                lo, hi = self._short_range(strikes, i, target_width)
+                if lo >= hi or not two_sided(long_bid, long_ask):
+                    continue
+                
+                # No pair on this long leg can reach the window or beat the best so far
+                if self.roi_bound(strikes[hi - 1] - strikes[i], long_bid, long_ask) < max(roi_min, best_roi):
+                    continue
+                
+                for j in range(lo, hi):
+                    short_bid, short_ask = bids[j], asks[j]
+                    if not two_sided(short_bid, short_ask):
+                        continue
+                    
+                    evaluated += 1
+                    net_ask, net_bid, spread_cost = price_debit_spread(long_bid, long_ask, short_bid, short_ask)
+                    if spread_cost <= 0:
+                        continue
+                    
+                    roi = (strikes[j] - strikes[i] - spread_cost) / spread_cost * 100
+                    if roi_min <= roi <= roi_max and roi > best_roi:
+                        best = (column, i, j, net_ask, net_bid, spread_cost)
+                        best_roi = roi
+        
+        if best is None:
+            return None, evaluated
+        
+        column, i, j, net_ask, net_bid, spread_cost = best
+        long_strike, short_strike = column['strikes'][i], column['strikes'][j]
+        spread_width = short_strike - long_strike
+        max_profit = spread_width - spread_cost
+        
+        return {
+            'long_strike': long_strike,
+            'short_strike': short_strike,
+            'spread_width': spread_width,
+            'spread_cost': spread_cost,
+            'max_profit': max_profit,
+            'roi': best_roi,
+            'dte': column['dte'],
+            'expiration': column['expiration'],
+            'long_ticker': column['tickers'][i],
+            'short_ticker': column['tickers'][j],
+            'long_price': (column['bids'][i] + column['asks'][i]) / 2,
+            'short_price': (column['bids'][j] + column['asks'][j]) / 2,
+            'net_ask': net_ask,
+            'net_bid': net_bid
+        }, evaluated
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight execution
+    
+    The first caller for a key runs the fetch; callers arriving while it is
+    in flight wait for and share its result (or exception) instead of
+    issuing their own upstream request.
+    """
+    
+    class _Call:
+        __slots__ = ('done', 'result', 'error')
+        
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+    
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key: str, fn):
+        """Run fn() once per key across concurrent callers and return its result"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+    
+    def do_many(self, keys: List[str], fn) -> Dict[str, Any]:
+        """Batch variant: fn(claimed_keys) -> {key: value} runs only for keys not already in flight"""
+        claimed, waiting = {}, {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                call = self._calls.get(key)
+                if call is None:
+                    claimed[key] = self._calls[key] = self._Call()
+                else:
+                    waiting[key] = call
+        
+        results = {}
+        if claimed:
+            try:
+                fetched = fn(list(claimed))
+                for key, call in claimed.items():
+                    call.result = fetched.get(key)
+            except Exception as e:
+                for call in claimed.values():
+                    call.error = e
+                raise
+            finally:
+                with self._lock:
+                    for key in claimed:
+                        self._calls.pop(key, None)
+                for call in claimed.values():
+                    call.done.set()
+        
+        for key, call in list(claimed.items()) + list(waiting.items()):
+            call.done.wait()
+            if call.error is None and call.result is not None:
+                results[key] = call.result
+        return results
+
+class ScannerSnapshot:
+    """Symbol-indexed trader scanner prices shared across requests
+    
+    The full get_trader_scanner_data.php download is indexed into a
+    {symbol: price} map once per refresh interval and published to the cache
+    so other workers reuse it. Lookups are dict hits; concurrent refreshes
+    share one download, and a failed refresh keeps serving the last index.
+    
+    Refreshes are lazy: the first lookup after the index expires reloads it.
+    An index taken from the cache keeps the age it was published with, so a
+    successful refresh never serves prices more than one interval old.
+    """
+    
+    CACHE_KEY = 'scanner_snapshot'
+    
+    def __init__(self, http_client: RateLimitedHTTPClient, cache_service: RedisCacheService, api_key: Optional[str],
+                 refresh_seconds: Optional[int] = None):
+        self.http = http_client
+        self.cache_service = cache_service
+        self.api_key = api_key
+        self.refresh_seconds = refresh_seconds or int(os.environ.get('SCANNER_REFRESH_SECONDS', 60))
+        self.prices = {}
+        self.loaded_at = None
+        self.inflight = SingleFlight()
+        self.lock = threading.Lock()
+        self.downloads = 0
+        self.cache_loads = 0
+        self.lookups = 0
+    
+    @staticmethod
+    def index_prices(data: List[Dict]) -> Dict[str, float]:
+        """Positive stock prices by symbol from a trader scanner response"""
+        prices = {}
+        for item in data:
+            try:
+                price = float(item.get('stock_price', 0))
+            except (TypeError, ValueError):
+                continue
+            if item.get('symbol') and price > 0:
+                prices.setdefault(item['symbol'], price)
+        return prices
+    
+    @staticmethod
+    def published_age(cached_data: Dict) -> float:
+        """Seconds since another worker published a cached index (inf if unknown)"""
+        try:
+            cached_at = datetime.fromisoformat(cached_data['cached_at'])
+        except (KeyError, TypeError, ValueError):
+            return float('inf')
+        return max(0.0, (datetime.now(timezone.utc) - cached_at).total_seconds())
+    
+    def is_current(self) -> bool:
+        return self.loaded_at is not None and time.monotonic() - self.loaded_at < self.refresh_seconds
+    
+    def get_price(self, symbol: str) -> Optional[float]:
+        """Scanner price for symbol, refreshing the index first if it has expired"""
+        if not self.is_current():
+            self.inflight.do(self.CACHE_KEY, self.refresh)
+        with self.lock:
+            self.lookups += 1
+            return self.prices.get(symbol)
+    
+    def refresh(self):
+        """Load the index from the cache, or download and publish it"""
+        if self.is_current():
+            return
+        
+        cached_data = self.cache_service.get_cached_data(self.CACHE_KEY)
+        if cached_data and cached_data.get('data'):
+            age = self.published_age(cached_data)
+            if age < self.refresh_seconds:
+                with self.lock:
+                    self.prices = cached_data['data']
+                    self.loaded_at = time.monotonic() - age
+                    self.cache_loads += 1
+                return
+        
+        try:
+            url = f"{TRADELIST_BASE_URL}/get_trader_scanner_data.php"
+            params = {
+                'apiKey': self.api_key,
+                'returntype': 'json'
+            }
+            
+            response = self.http.get(url, params=params, timeout=15)
+            response.raise_for_status()
+            prices = self.index_prices(response.json())
+        except Exception as e:
+            logger.error(f"Scanner snapshot refresh failed: {e}")
+            return
+        
+        with self.lock:
+            self.prices = prices
+            self.loaded_at = time.monotonic()
+            self.downloads += 1
+        self.cache_service.cache_data(self.CACHE_KEY, prices, self.refresh_seconds)
+        logger.info(f"Scanner snapshot refreshed: {len(prices)} symbols indexed")
+    
+    def stats(self) -> Dict:
+        with self.lock:
+            return {
+                'symbols': len(self.prices),
+                'age_seconds': round(time.monotonic() - self.loaded_at, 1) if self.loaded_at is not None else None,
+                'refresh_seconds': self.refresh_seconds,
+                'downloads': self.downloads,
+                'cache_loads': self.cache_loads,
+                'lookups': self.lookups
+            }
+
+class BackgroundRefresher:
+    """Revalidate stale cache entries off the request path
+    
+    Refreshes run on a small worker pool and are deduplicated per key: a key
+    already queued or running is not scheduled again until it finishes.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or int(os.environ.get('CACHE_REFRESH_WORKERS', 4))
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.scheduled = 0
+        self.deduplicated = 0
+        self.failed = 0
+    
+    def schedule(self, key: str, fn) -> bool:
+        """Run fn() in the background unless key is already being refreshed"""
+        return bool(self.schedule_many([key], lambda _: fn()))
+    
+    def schedule_many(self, keys: List[str], fn) -> List[str]:
+        """Run fn(claimed_keys) in the background for keys not already being refreshed"""
+        with self._lock:
+            claimed = [key for key in dict.fromkeys(keys) if key not in self._pending]
+            self.deduplicated += len(keys) - len(claimed)
+            if not claimed:
+                return []
+            self._pending.update(claimed)
+            self.scheduled += len(claimed)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='cache-refresh')
+        
+        self._executor.submit(self._run, claimed, fn)
+        return claimed
+    
+    def _run(self, keys: List[str], fn):
+        try:
+            fn(keys)
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            logger.warning(f"Background refresh failed for {len(keys)} keys: {e}")
+        finally:
+            with self._lock:
+                self._pending.difference_update(keys)
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'in_progress': len(self._pending),
+                'scheduled': self.scheduled,
+                'deduplicated': self.deduplicated,
+                'failed': self.failed
+            }
 
 class DebitSpreadAnalyzer:
     """Complete debit spread analysis engine"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[PooledHTTPClient] = None,
+                 spread_storage: Optional[SpreadStorageBackend] = None,
+                 limiter: Optional[UpstreamLimiter] = None):
         self.tradelist_api_key = os.environ.get('TRADELIST_API_KEY')
-        self.cache_service = RedisCacheService()
-        self.spread_storage = SessionSpreadStorage()
+        self.http = http_client or shared_http_client
+        self.cache_service = RedisCacheService(self.http)
+        self.spread_storage = spread_storage or create_spread_storage(self.cache_service)
+        
+        # Every TheTradeList call is admitted through the process-wide limiter
+        self.upstream = RateLimitedHTTPClient(self.http, limiter or tradelist_limiter)
+        self.scanner = ScannerSnapshot(self.upstream, self.cache_service, self.tradelist_api_key)
+        
+        # Concurrent fetches for the same key share one upstream call
+        self.inflight = SingleFlight()
+        self.quote_inflight = SingleFlight()
+        
+        # Stale-while-revalidate: entries past the soft TTL are served while a
+        # background refresh runs; past the hard TTL they are refetched inline.
+        # Prices and quotes are fresh for 30s and never served more than 120s
+        # old, so a stale analysis price is at most two minutes behind
+        self.refresher = BackgroundRefresher()
+        self.price_soft_ttl = int(os.environ.get('PRICE_SOFT_TTL', 30))
+        self.price_hard_ttl = max(self.price_soft_ttl, int(os.environ.get('PRICE_HARD_TTL', 120)))
+        self.quote_soft_ttl = int(os.environ.get('QUOTE_SOFT_TTL', 30))
+        self.quote_hard_ttl = max(self.quote_soft_ttl, int(os.environ.get('QUOTE_HARD_TTL', 120)))
         
         # Request tracking
         self.request_lock = threading.Lock()
@@ -138,9 +1351,31 @@ class DebitSpreadAnalyzer:
             'balanced': {'roi_min': 12, 'roi_max': 25, 'dte_min': 17, 'dte_max': 28},
             'conservative': {'roi_min': 8, 'roi_max': 15, 'dte_min': 28, 'dte_max': 42}
         }
+        
+        self.strategies = ['aggressive', 'balanced', 'conservative']
+        
+        # Progressive spread widths searched per strategy
+        self.width_targets = [1.0, 2.0, 5.0, 10.0]
+        
+        # Maximum contracts per multi-ticker snapshot-options request
+        self.quote_batch_size = 50
+        
+        # Maximum symbols per comma-list snapshot-locale request
+        self.price_batch_size = 100
+        
+        # Process-wide cap on concurrent ticker analyses from bulk sweeps
+        self.bulk_concurrency = int(os.environ.get('BULK_MAX_CONCURRENCY', 8))
+        self.bulk_semaphore = threading.BoundedSemaphore(self.bulk_concurrency)
+        
+        # Contract listings barely change intraday, so the parsed chain is cached for hours
+        self.contracts_cache_ttl = int(os.environ.get('CONTRACTS_CACHE_TTL', 6 * 60 * 60))
     
     def get_real_time_stock_price(self, symbol: str) -> Optional[float]:
         """Get real-time stock price using TheTradeList API with caching"""
+        return self.get_stock_price_with_staleness(symbol)[0]
+    
+    def get_stock_price_with_staleness(self, symbol: str) -> Tuple[Optional[float], float]:
+        """Get (price, seconds past soft TTL), revalidating stale cached prices in the background"""
         try:
             # Check cache first
             cache_key = f"stock_price_snapshot:{symbol}"
@@ -148,180 +1383,323 @@ class DebitSpreadAnalyzer:
             
             if cached_data and cached_data.get('data', {}).get('price'):
                 cached_price = cached_data['data']['price']
-                logger.info(f"Cache HIT: Using cached price for {symbol}: ${cached_price}")
-                return float(cached_price)
+                staleness = self.cache_service.staleness(cached_data)
+                if staleness > 0:
+                    logger.info(f"Cache STALE: Using cached price for {symbol}: ${cached_price} ({staleness:.1f}s stale), refreshing")
+                    self.refresher.schedule(f"price:{symbol}", lambda: self.inflight.do(
+                        f"price:{symbol}", lambda: self._fetch_real_time_stock_price(symbol, cache_key)))
+                else:
+                    logger.info(f"Cache HIT: Using cached price for {symbol}: ${cached_price}")
+                return float(cached_price), staleness
             
             logger.info(f"Cache MISS: Fetching fresh price for {symbol}")
-            
+            price = self.inflight.do(f"price:{symbol}", lambda: self._fetch_real_time_stock_price(symbol, cache_key))
+            return price, 0.0
+        
+        except Exception as e:
+            logger.error(f"Error fetching stock price for {symbol}: {e}")
+            return None, 0.0
+    
+    def get_real_time_stock_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Get prices for many symbols, sharing comma-list snapshot-locale calls for cache misses
+        
+        Symbols the snapshot does not cover are left out; get_real_time_stock_price
+        still applies the scanner fallback for them individually.
+        """
+        prices = {}
+        missing = []
+        stale = []
+        symbols = list(dict.fromkeys(symbols))
+        cached = self.cache_service.get_many([f"stock_price_snapshot:{symbol}" for symbol in symbols])
+        for symbol in symbols:
+            cached_data = cached.get(f"stock_price_snapshot:{symbol}")
+            if cached_data and cached_data.get('data', {}).get('price'):
+                prices[symbol] = float(cached_data['data']['price'])
+                if self.cache_service.staleness(cached_data) > 0:
+                    stale.append(symbol)
+            else:
+                missing.append(symbol)
+        
+        if stale:
+            self.refresher.schedule_many([f"price:{symbol}" for symbol in stale], lambda keys: self._fetch_snapshot_prices(
+                [key.split(':', 1)[1] for key in keys]))
+        
+        prices.update(self._fetch_snapshot_prices(missing))
+        logger.info(f"Bulk prices: {len(prices)}/{len(symbols)} symbols resolved")
+        return prices
+    
+    def refresh_stock_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Fetch and cache prices for symbols, one snapshot-locale call per price_batch_size symbols"""
+        return self._fetch_snapshot_prices(symbols)
+    
+    def _fetch_snapshot_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Fetch and cache prices in comma-list snapshot-locale batches"""
+        prices = {}
+        for i in range(0, len(symbols), self.price_batch_size):
+            batch = symbols[i:i + self.price_batch_size]
+            try:
+                params = {
+                    'tickers': ','.join(batch) + ',',
+                    'apiKey': self.tradelist_api_key
+                }
+                response = self.upstream.get(f"{TRADELIST_BASE_URL}/snapshot-locale", params=params, timeout=10)
+                if response.status_code != 200:
+                    continue
+                
+                snapshot_prices = self.parse_snapshot_prices(response.json())
+                batch_prices = {symbol: snapshot_prices[symbol] for symbol in batch if symbol in snapshot_prices}
+                self.cache_service.cache_many({
+                    f"stock_price_snapshot:{symbol}": {'price': price} for symbol, price in batch_prices.items()
+                }, self.price_hard_ttl, self.price_soft_ttl)
+                prices.update(batch_prices)
+            except Exception as e:
+                logger.error(f"Error fetching snapshot prices for {len(batch)} symbols: {e}")
+        
+        return prices
+    
+    def _fetch_real_time_stock_price(self, symbol: str, cache_key: str) -> Optional[float]:
+        """Fetch a price from snapshot-locale, falling back to the trader scanner"""
+        try:
             # Use exact same API endpoints as working system
-            url = "https://api.thetradelist.com/v1/data/snapshot-locale"
+            url = f"{TRADELIST_BASE_URL}/snapshot-locale"
             params = {
                 'tickers': f"{symbol},",  # API requires comma after symbol
                 'apiKey': self.tradelist_api_key
             }
             
-            response = requests.get(url, params=params, timeout=3)
+            response = self.upstream.get(url, params=params, timeout=3)
             
             if response.status_code == 200:
                 try:
-                    data = response.json()
-                    
-                    if data.get('status') == 'OK' and data.get('tickers'):
-                        tickers = data['tickers']
-                        
-                        # Find the ticker in the list
-                        for ticker_data in tickers:
-                            if ticker_data.get('ticker') == symbol:
-                                fmv = ticker_data.get('fmv')
-                                if fmv and fmv > 0:
-                                    # Cache the result
-                                    self.cache_service.cache_data(cache_key, {'price': fmv}, 30)
-                                    logger.info(f"API SUCCESS: FMV price for {symbol}: ${fmv}")
-                                    return float(fmv)
-                                break
+                    fmv = self.parse_snapshot_prices(response.json()).get(symbol)
+                    if fmv:
+                        # Cache the result
+                        self.cache_service.cache_data(cache_key, {'price': fmv}, self.price_hard_ttl, self.price_soft_ttl)
+                        logger.info(f"API SUCCESS: FMV price for {symbol}: ${fmv}")
+                        return fmv
                 except Exception as json_error:
                     logger.error(f"JSON parsing error for snapshot: {json_error}")
             
-            # Fallback to trader scanner endpoint
-            scanner_url = "https://api.thetradelist.com/v1/data/get_trader_scanner_data.php"
-            scanner_params = {
-                'apiKey': self.tradelist_api_key,
-                'returntype': 'json'
-            }
-            
-            scanner_response = requests.get(scanner_url, params=scanner_params, timeout=15)
-            
-            if scanner_response.status_code == 200:
-                try:
-                    scanner_data = scanner_response.json()
-                    
-                    # Look for the ticker in scanner data
-                    for item in scanner_data:
-                        if item.get('symbol') == symbol:
-                            price = float(item.get('stock_price', 0))
-                            if price > 0:
-                                self.cache_service.cache_data(cache_key, {'price': price}, 30)
-                                logger.info(f"Scanner price for {symbol}: ${price}")
-                                return price
-                            break
-                except Exception as scanner_error:
-                    logger.error(f"Scanner endpoint error: {scanner_error}")
+            # Fallback to the indexed trader scanner snapshot
+            price = self.scanner.get_price(symbol)
+            if price:
+                self.cache_service.cache_data(cache_key, {'price': price}, self.price_hard_ttl, self.price_soft_ttl)
+                logger.info(f"Scanner price for {symbol}: ${price}")
+                return price
             
             logger.error(f"Failed to get price for {symbol}")
             return None
-            
+        
         except Exception as e:
             logger.error(f"Error fetching stock price for {symbol}: {e}")
             return None
     
+    @staticmethod
+    def parse_snapshot_prices(data: Dict) -> Dict[str, float]:
+        """Positive FMV prices by ticker from a snapshot-locale response"""
+        prices = {}
+        if data.get('status') == 'OK' and data.get('tickers'):
+            for ticker_data in data['tickers']:
+                fmv = ticker_data.get('fmv')
+                if fmv and fmv > 0:
+                    prices[ticker_data.get('ticker')] = float(fmv)
+        return prices
+    
+    @staticmethod
+    def parse_scanner_price(data: List[Dict], symbol: str) -> Optional[float]:
+        """Positive stock price for symbol from a trader scanner response"""
+        return ScannerSnapshot.index_prices(data).get(symbol)
+    
     def get_all_contracts(self, symbol: str) -> List[Dict]:
         """Get all options contracts for a symbol"""
+        return self.inflight.do(f"contracts:{symbol}", lambda: self._fetch_all_contracts(symbol))
+    
+    def _fetch_all_contracts(self, symbol: str) -> List[Dict]:
+        """Fetch the full options-contracts list for a symbol"""
         try:
-            url = "https://api.thetradelist.com/v1/data/options-contracts"
+            url = f"{TRADELIST_BASE_URL}/options-contracts"
             params = {
                 'underlying_ticker': symbol,
                 'apiKey': self.tradelist_api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.upstream.get(url, params=params, timeout=10)
             response.raise_for_status()
-            
-            data = response.json()
-            if data.get('status') == 'OK' and data.get('results'):
-                contracts = data['results']
-                logger.info(f"Retrieved {len(contracts)} contracts for {symbol}")
-                return contracts
-            
-            logger.warning(f"No contracts found for {symbol}")
-            return []
-            
+            return self.parse_contracts(response.json(), symbol)
+        
         except Exception as e:
             logger.error(f"Error fetching contracts for {symbol}: {e}")
             return []
     
-    def filter_contracts_by_strategy(self, contracts: List[Dict], strategy: str, current_price: float) -> List[Dict]:
-        """Filter contracts based on strategy criteria"""
+    @staticmethod
+    def parse_contracts(data: Dict, symbol: str) -> List[Dict]:
+        """Contract list from an options-contracts response"""
+        if data.get('status') == 'OK' and data.get('results'):
+            contracts = data['results']
+            logger.info(f"Retrieved {len(contracts)} contracts for {symbol}")
+            return contracts
+        
+        logger.warning(f"No contracts found for {symbol}")
+        return []
+    
+    def get_cached_option_chain(self, symbol: str) -> Optional[OptionChain]:
+        """Cached OptionChain for a symbol, or None if missing or rolled past its front expiration"""
+        cached_data = self.cache_service.get_cached_data(f"options_chain:{symbol}")
+        if not cached_data or not cached_data.get('data'):
+            return None
+        
+        chain = OptionChain.from_compact(cached_data['data'])
+        
+        # Expiration rollover: once the front expiration has passed, refetch the listing
+        if not chain.is_current():
+            logger.info(f"Cached option chain for {symbol} rolled past {chain.earliest_expiration}, refreshing")
+            return None
+        return chain
+    
+    def get_option_chain(self, symbol: str) -> Optional[OptionChain]:
+        """Get the parsed OptionChain for a symbol, cached in compact form"""
+        cache_key = f"options_chain:{symbol}"
+        chain = self.get_cached_option_chain(symbol)
+        if chain is not None:
+            logger.info(f"Cache HIT: Using cached option chain for {symbol} ({chain.size} contracts)")
+            return chain
+        
+        contracts = self.get_all_contracts(symbol)
+        if not contracts:
+            return None
+        
+        chain = OptionChain(contracts)
+        self.cache_service.cache_data(cache_key, chain.to_compact(), self.contracts_cache_ttl)
+        return chain
+    
+    def filter_chain_by_strategy(self, chain: OptionChain, strategy: str, current_price: float) -> List[OptionContract]:
+        """Select call contracts matching strategy DTE and strike criteria"""
         config = self.strategy_configs.get(strategy, self.strategy_configs['balanced'])
-        filtered = []
         
-        for contract in contracts:
-            try:
-                # Only call options
-                if contract.get('option_type') != 'call':
-                    continue
-                
-                # Parse expiration and calculate DTE
-                expiration_str = contract.get('expiration_date', '')
-                if not expiration_str:
-                    continue
-                
-                expiration_date = datetime.strptime(expiration_str, '%Y-%m-%d')
-                dte = (expiration_date - datetime.now()).days
-                
-                # Filter by DTE range
-                if not (config['dte_min'] <= dte <= config['dte_max']):
-                    continue
-                
-                # Filter by strike price (reasonable range around current price)
-                strike_price = float(contract.get('strike_price', 0))
-                if not (current_price * 0.85 <= strike_price <= current_price * 1.15):
-                    continue
-                
-                filtered.append(contract)
-                
-            except Exception as e:
-                logger.debug(f"Error processing contract: {e}")
-                continue
+        # Reasonable strike range around current price
+        filtered = chain.select('call', config['dte_min'], config['dte_max'],
+                                current_price * 0.85, current_price * 1.15)
         
-        logger.info(f"Filtered to {len(filtered)} {strategy} contracts from {len(contracts)} total")
+        logger.info(f"Filtered to {len(filtered)} {strategy} contracts from {chain.size} total")
         return filtered
     
+    def filter_contracts_by_strategy(self, contracts: List[Dict], strategy: str, current_price: float) -> List[Dict]:
+        """Filter contracts based on strategy criteria"""
+        filtered = self.filter_chain_by_strategy(OptionChain(contracts), strategy, current_price)
+        return [contract.to_dict() for contract in filtered]
+    
     def get_options_quote(self, contract_symbol: str) -> Optional[Dict]:
         """Get real-time quote for options contract"""
-        try:
-            cache_key = f"options_quote:{contract_symbol}"
-            cached_data = self.cache_service.get_cached_data(cache_key)
-            
+        return self.get_options_quotes([contract_symbol]).get(contract_symbol)
+    
+    def get_options_quotes(self, contract_symbols: List[str]) -> Dict[str, Dict]:
+        """Get real-time quotes for many options contracts using batched snapshot requests"""
+        return self.get_options_quotes_with_staleness(contract_symbols)[0]
+    
+    def get_options_quotes_with_staleness(self, contract_symbols: List[str]) -> Tuple[Dict[str, Dict], float]:
+        """Get (quotes, max seconds past soft TTL), revalidating stale quotes in the background"""
+        quotes = {}
+        missing = []
+        stale = []
+        staleness = 0.0
+        
+        # Serve what we can from cache in one lookup, keeping first-seen order for the rest
+        contract_symbols = list(dict.fromkeys(contract_symbols))
+        cached = self.cache_service.get_many([f"options_quote:{contract_symbol}" for contract_symbol in contract_symbols])
+        for contract_symbol in contract_symbols:
+            cached_data = cached.get(f"options_quote:{contract_symbol}")
             if cached_data and cached_data.get('data'):
-                return cached_data['data']
-            
-            url = "https://api.thetradelist.com/v1/data/snapshot-options"
+                quotes[contract_symbol] = cached_data['data']
+                quote_staleness = self.cache_service.staleness(cached_data)
+                if quote_staleness > 0:
+                    stale.append(contract_symbol)
+                    staleness = max(staleness, quote_staleness)
+            else:
+                missing.append(contract_symbol)
+        
+        if stale:
+            self.refresher.schedule_many(stale, lambda claimed: self.quote_inflight.do_many(claimed, self._fetch_options_quotes))
+        
+        if missing:
+            quotes.update(self.quote_inflight.do_many(missing, self._fetch_options_quotes))
+        return quotes, staleness
+    
+    def _fetch_options_quotes(self, contract_symbols: List[str]) -> Dict[str, Dict]:
+        """Fetch quotes for uncached contracts in concurrent multi-ticker batches"""
+        quotes = {}
+        batches = [contract_symbols[i:i + self.quote_batch_size]
+                   for i in range(0, len(contract_symbols), self.quote_batch_size)]
+        logger.info(f"Fetching {len(contract_symbols)} option quotes in {len(batches)} batched requests")
+        
+        with ThreadPoolExecutor(max_workers=min(5, len(batches))) as executor:
+            for batch_quotes in executor.map(self._fetch_options_quote_batch, batches):
+                quotes.update(batch_quotes)
+        
+        return quotes
+    
+    def refresh_options_quote_batch(self, contract_symbols: List[str]) -> Dict[str, Dict]:
+        """Fetch and cache up to quote_batch_size quotes in one snapshot-options call, sharing in-flight fetches"""
+        return self.quote_inflight.do_many(contract_symbols, self._fetch_options_quote_batch)
+    
+    def _fetch_options_quote_batch(self, contract_symbols: List[str]) -> Dict[str, Dict]:
+        """Fetch one multi-ticker snapshot-options request and cache every quote it returns"""
+        quotes = {}
+        try:
+            url = f"{TRADELIST_BASE_URL}/snapshot-options"
             params = {
-                'tickers': f"O:{contract_symbol}",
+                'tickers': ','.join(f"O:{contract_symbol}" for contract_symbol in contract_symbols),
                 'apiKey': self.tradelist_api_key
             }
             
-            response = requests.get(url, params=params, timeout=3)
+            response = self.upstream.get(url, params=params, timeout=5)
             response.raise_for_status()
             
-            data = response.json()
-            if data.get('status') == 'OK' and data.get('results'):
-                for result in data['results']:
-                    if result.get('name') == f"O:{contract_symbol}":
-                        quote_data = {
-                            'bid': result.get('bid', 0),
-                            'ask': result.get('ask', 0),
-                            'last': result.get('last_trade', {}).get('price', 0)
-                        }
-                        
-                        self.cache_service.cache_data(cache_key, quote_data, 30)
-                        return quote_data
-            
-            return None
-            
+            quotes = self.parse_quotes(response.json(), contract_symbols)
+            self.cache_service.cache_many({
+                f"options_quote:{contract_symbol}": quote_data for contract_symbol, quote_data in quotes.items()
+            }, self.quote_hard_ttl, self.quote_soft_ttl)
+        
         except Exception as e:
-            logger.error(f"Error getting quote for {contract_symbol}: {e}")
-            return None
+            logger.error(f"Error getting quotes for batch of {len(contract_symbols)} contracts: {e}")
+        
+        return quotes
+    
+    @staticmethod
+    def parse_quotes(data: Dict, contract_symbols: List[str]) -> Dict[str, Dict]:
+        """Quotes by contract symbol from a multi-ticker snapshot-options response"""
+        quotes = {}
+        if data.get('status') == 'OK' and data.get('results'):
+            wanted = {f"O:{contract_symbol}": contract_symbol for contract_symbol in contract_symbols}
+            for result in data['results']:
+                contract_symbol = wanted.get(result.get('name'))
+                if contract_symbol is None:
+                    continue
+                
+                quotes[contract_symbol] = {
+                    'bid': result.get('bid', 0),
+                    'ask': result.get('ask', 0),
+                    'last': (result.get('last_trade') or {}).get('price', 0)
+                }
+        return quotes
     
-    def calculate_spread_metrics(self, long_contract: Dict, short_contract: Dict) -> Optional[Dict]:
-        """Calculate comprehensive spread metrics using ThinkOrSwim pricing"""
+    def calculate_spread_metrics(self, long_contract: Dict, short_contract: Dict,
+                                 quotes: Optional[Dict[str, Dict]] = None) -> Optional[Dict]:
+        """Calculate comprehensive spread metrics using ThinkOrSwim pricing
+        
+        If a prefetched ``quotes`` map is given, legs are priced from it instead
+        of issuing one quote request per leg.
+        """
         try:
             long_symbol = long_contract.get('ticker', '')
             short_symbol = short_contract.get('ticker', '')
             
             # Get quotes for both options
-            long_quote = self.get_options_quote(long_symbol)
-            short_quote = self.get_options_quote(short_symbol)
+            if quotes is not None:
+                long_quote = quotes.get(long_symbol)
+                short_quote = quotes.get(short_symbol)
+            else:
+                long_quote = self.get_options_quote(long_symbol)
+                short_quote = self.get_options_quote(short_symbol)
             
             if not long_quote or not short_quote:
                 return None
@@ -332,19 +1710,12 @@ class DebitSpreadAnalyzer:
             short_bid = float(short_quote.get('bid', 0))
             short_ask = float(short_quote.get('ask', 0))
             
-            if any(price <= 0 for price in [long_bid, long_ask, short_bid, short_ask]):
+            # Missing or crossed quotes cannot be priced
+            if not two_sided(long_bid, long_ask) or not two_sided(short_bid, short_ask):
                 return None
             
             # ThinkOrSwim professional spread pricing methodology
-            net_ask = long_ask - short_bid  # Cost to establish spread at worst prices
-            net_bid = short_ask - long_bid  # Credit if we could reverse at best prices
-            
-            # Handle negative net bid (illiquid spreads)
-            if net_bid < 0:
-                net_bid = net_ask * 0.95  # Professional platform methodology
-            
-            # Calculate spread cost using professional mid-price
-            spread_cost = (net_ask + net_bid) / 2
+            net_ask, net_bid, spread_cost = price_debit_spread(long_bid, long_ask, short_bid, short_ask)
             
             # Extract strike prices and calculate metrics
             long_strike = float(long_contract.get('strike_price', 0))
@@ -380,7 +1751,7 @@ class DebitSpreadAnalyzer:
                 'net_ask': net_ask,
                 'net_bid': net_bid
             }
-            
+        
         except Exception as e:
             logger.error(f"Error calculating spread metrics: {e}")
             return None
@@ -417,160 +1788,286 @@ class DebitSpreadAnalyzer:
         logger.info(f"Generated {len(pairs)} spread pairs")
         return pairs
     
-    def find_best_spreads(self, symbol: str, current_price: float) -> Dict[str, Dict]:
-        """Find best spreads for all strategies"""
-        results = {}
+    def prepare_strategy_evaluators(self, chain: OptionChain, current_price: float) -> Tuple[Dict[str, SpreadEvaluator], Dict[str, str], List[str]]:
+        """Load each strategy's filtered chain into an evaluator
+        
+        Returns (evaluators, skip_reasons, contract_symbols) where
+        contract_symbols are every leg that needs a quote, across strategies.
+        """
+        evaluators = {}
+        skip_reasons = {}
+        contract_symbols = []
+        for strategy in self.strategies:
+            filtered_contracts = self.filter_chain_by_strategy(chain, strategy, current_price)
+            if not filtered_contracts:
+                skip_reasons[strategy] = f'No contracts match {strategy} criteria'
+                continue
+            
+            evaluator = SpreadEvaluator(filtered_contracts)
+            symbols = evaluator.pair_symbols(self.width_targets)
+            if not symbols:
+                skip_reasons[strategy] = f'No viable spread pairs for {strategy}'
+                continue
+            
+            evaluators[strategy] = evaluator
+            contract_symbols.extend(symbols)
+        
+        return evaluators, skip_reasons, contract_symbols
+    
+    def select_strategy_spread(self, symbol: str, strategy: str, evaluator: Optional[SpreadEvaluator],
+                               current_price: float, skip_reason: Optional[str] = None,
+                               fetch_quotes: Optional[Callable[[List[str]], Dict[str, Dict]]] = None) -> Dict:
+        """Run the progressive width search for one strategy
+        
+        With fetch_quotes, legs are quoted lazily per width, and only those the
+        evaluator cannot rule out from quotes it already holds; otherwise the
+        evaluator must already be loaded.
+        """
+        logger.info(f"🚀 STARTING {strategy.upper()} STRATEGY for {symbol}")
+        
+        if evaluator is None:
+            return {
+                'found': False,
+                'reason': skip_reason or f'No contracts match {strategy} criteria'
+            }
+        
+        # Progressive width search: $1, $2, $5, $10
+        config = self.strategy_configs[strategy]
+        roi_min, roi_max = config['roi_min'], config['roi_max']
+        final_spread = None
+        
+        for target_width in self.width_targets:
+            if fetch_quotes is not None:
+                symbols = evaluator.missing_symbols(target_width, roi_min, roi_max)
+                if symbols:
+                    evaluator.load_quotes(fetch_quotes(symbols), symbols)
+            
+            best_width_spread, evaluated = evaluator.best_spread(target_width, roi_min, roi_max)
+            PAIRS_EVALUATED.inc(evaluated, strategy=strategy)
+            logger.info(f"🎯 Evaluated {evaluated} ${target_width:.0f} wide {strategy} pairs")
+            
+            # If found viable spread at this width, stop searching
+            if best_width_spread:
+                final_spread = best_width_spread
+                logger.info(f"✅ FOUND optimal ${target_width:.0f} wide {strategy} spread: {best_width_spread['roi']:.1f}% ROI - STOPPING search")
+                break
         
-        # Get all contracts
-        all_contracts = self.get_all_contracts(symbol)
-        if not all_contracts:
+        if not final_spread:
             return {
-                'aggressive': {'found': False, 'reason': 'No contracts available'},
-                'balanced': {'found': False, 'reason': 'No contracts available'},
-                'conservative': {'found': False, 'reason': 'No contracts available'}
+                'found': False,
+                'reason': f'No spreads found within {roi_min}-{roi_max}% ROI range'
             }
         
-        strategies = ['aggressive', 'balanced', 'conservative']
-        roi_ranges = {
-            'aggressive': (25, 50),
-            'balanced': (12, 25),
-            'conservative': (8, 15)
+        # Add current price context
+        final_spread['current_price'] = current_price
+        
+        # Store spread and get unique ID
+        spread_id = self.spread_storage.store_spread(symbol, strategy, final_spread)
+        
+        return {
+            'found': True,
+            'spread_id': spread_id,
+            'roi': f"{final_spread['roi']:.1f}%",
+            'expiration': final_spread['expiration'],
+            'dte': final_spread['dte'],
+            'strike_price': final_spread['long_strike'],
+            'short_strike_price': final_spread['short_strike'],
+            'spread_cost': final_spread['spread_cost'],
+            'max_profit': final_spread['max_profit'],
+            'spread_width': final_spread['spread_width'],
+            'contract_symbol': final_spread['long_ticker'],
+            'short_contract_symbol': final_spread['short_ticker'],
+            'long_price': final_spread.get('long_price', 0),
+            'short_price': final_spread.get('short_price', 0),
+            'management': 'Hold to expiration',
+            'strategy_title': f"{strategy.title()} Strategy"
         }
+    
+    def iter_strategy_spreads(self, symbol: str, current_price: float) -> Iterator[Tuple[str, Dict]]:
+        """Yield (strategy, result) for each strategy as soon as its search completes
+        
+        Each strategy quotes its own legs in its own worker; legs shared with
+        another strategy are fetched once through the quote single-flight and
+        cache, so a fast strategy is not held back by a slower one.
+        """
+        # Fetch and parse the chain once for all strategies
+        with STAGE_SECONDS.time(stage='chain'):
+            chain = self.get_option_chain(symbol)
+        if not chain:
+            for strategy in self.strategies:
+                yield strategy, {'found': False, 'reason': 'No contracts available'}
+            return
+        
+        with STAGE_SECONDS.time(stage='prepare'):
+            evaluators, skip_reasons, _ = self.prepare_strategy_evaluators(chain, current_price)
         
         def process_single_strategy(strategy):
             """Process a single strategy"""
-            logger.info(f"🚀 STARTING {strategy.upper()} STRATEGY for {symbol}")
-            
-            # Filter contracts by strategy
-            filtered_contracts = self.filter_contracts_by_strategy(all_contracts, strategy, current_price)
-            
-            if not filtered_contracts:
-                return strategy, {
-                    'found': False,
-                    'reason': f'No contracts match {strategy} criteria'
-                }
-            
-            # Generate spread pairs
-            spread_pairs = self.generate_spread_pairs(filtered_contracts)
+            staleness = [0.0]
+            quote_seconds = [0.0]
             
-            if not spread_pairs:
-                return strategy, {
-                    'found': False,
-                    'reason': f'No viable spread pairs for {strategy}'
-                }
+            def fetch_quotes(contract_symbols):
+                started = time.perf_counter()
+                quotes, quote_staleness = self.get_options_quotes_with_staleness(contract_symbols)
+                quote_seconds[0] += time.perf_counter() - started
+                QUOTES_REQUESTED.inc(len(contract_symbols), strategy=strategy)
+                staleness[0] = max(staleness[0], quote_staleness)
+                return quotes
             
-            # Progressive width search: $1, $2, $5, $10
-            roi_min, roi_max = roi_ranges[strategy]
-            final_spread = None
-            width_targets = [1.0, 2.0, 5.0, 10.0]
+            started = time.perf_counter()
+            result = self.select_strategy_spread(symbol, strategy, evaluators.get(strategy), current_price,
+                                                 skip_reasons.get(strategy), fetch_quotes)
+            # Quote I/O and the CPU-bound search are reported as separate stages
+            STAGE_SECONDS.observe(quote_seconds[0], stage='quotes')
+            STAGE_SECONDS.observe(time.perf_counter() - started - quote_seconds[0], stage='select')
+            result['quote_staleness'] = staleness[0]
+            return result
+        
+        # Process all strategies concurrently
+        with ThreadPoolExecutor(max_workers=3) as strategy_executor:
+            strategy_futures = {
+                strategy_executor.submit(process_single_strategy, strategy): strategy
+                for strategy in self.strategies
+            }
             
-            for target_width in width_targets:
-                logger.info(f"🎯 Searching for ${target_width:.0f} wide {strategy} spreads...")
-                
-                # Filter pairs for this width
-                width_pairs = []
-                for pair in spread_pairs:
-                    long_contract, short_contract = pair
-                    long_strike = float(long_contract.get('strike_price', 0))
-                    short_strike = float(short_contract.get('strike_price', 0))
-                    spread_width = short_strike - long_strike
-                    
-                    if abs(spread_width - target_width) <= 0.1:
-                        width_pairs.append(pair)
+            for future in as_completed(strategy_futures):
+                result = future.result()
+                # Make the stored spread resolvable by other workers before returning its ID
+                self.spread_storage.flush()
+                yield strategy_futures[future], result
+    
+    def find_best_spreads(self, symbol: str, current_price: float) -> Dict[str, Dict]:
+        """Find best spreads for all strategies"""
+        return dict(self.iter_strategy_spreads(symbol, current_price))
+    
+    def build_strategy_analysis(self, ticker: str, strategy: str, strategy_data: Dict, current_price: float) -> Dict:
+        """Turn one strategy's selected spread into its API analysis block"""
+        try:
+            if strategy_data.get('found'):
+                # Extract data from strategy results
+                long_strike = float(strategy_data.get('strike_price', 0))
+                short_strike = float(strategy_data.get('short_strike_price', 0))
+                spread_cost = float(strategy_data.get('spread_cost', 0))
+                max_profit = float(strategy_data.get('max_profit', 0))
                 
-                if not width_pairs:
-                    continue
+                # Handle ROI conversion
+                roi_value = strategy_data.get('roi', 0)
+                if isinstance(roi_value, str) and roi_value.endswith('%'):
+                    roi = float(roi_value.replace('%', ''))
+                else:
+                    roi = float(roi_value) if roi_value else 0
                 
-                logger.info(f"   Found {len(width_pairs)} pairs at ${target_width:.0f} width")
+                dte = int(strategy_data.get('dte', 0))
+                expiration = strategy_data.get('expiration', 'N/A')
+                long_contract = strategy_data.get('contract_symbol', 'N/A')
+                short_contract = strategy_data.get('short_contract_symbol', 'N/A')
                 
-                # Analyze pairs concurrently
-                best_width_spread = None
-                best_width_roi = 0
+                # Extract authentic bid/ask prices
+                long_price = float(strategy_data.get('long_price', 0))
+                short_price = float(strategy_data.get('short_price', 0))
                 
-                with ThreadPoolExecutor(max_workers=5) as executor:
-                    future_to_pair = {
-                        executor.submit(self.calculate_spread_metrics, pair[0], pair[1]): pair 
-                        for pair in width_pairs[:20]  # Limit to prevent timeout
-                    }
-                    
-                    for future in as_completed(future_to_pair):
-                        try:
-                            metrics = future.result()
-                            if metrics:
-                                roi = metrics['roi']
-                                
-                                if roi_min <= roi <= roi_max and roi > best_width_roi:
-                                    best_width_spread = metrics
-                                    best_width_roi = roi
-                                    logger.info(f"   New best ${target_width:.0f} wide spread: {roi:.1f}% ROI")
-                        except Exception as e:
-                            logger.error(f"Error calculating spread: {e}")
+                # Calculate metrics
+                spread_width = short_strike - long_strike
+                breakeven = long_strike + spread_cost
+                max_loss = spread_cost
                 
-                # If found viable spread at this width, stop searching
-                if best_width_spread:
-                    final_spread = best_width_spread
-                    logger.info(f"✅ FOUND optimal ${target_width:.0f} wide {strategy} spread: {best_width_roi:.1f}% ROI - STOPPING search")
-                    break
-            
-            if final_spread:
-                # Add current price context
-                final_spread['current_price'] = current_price
+                # Generate profit/loss scenarios
+                scenarios = []
+                scenario_changes = [-10, -5, -2.5, -1, 0, 1, 2.5, 5, 10]
                 
-                # Store spread and get unique ID
-                spread_id = self.spread_storage.store_spread(symbol, strategy, final_spread)
+                for change_pct in scenario_changes:
+                    future_price = current_price * (1 + change_pct/100)
+                    
+                    # Calculate option values at expiration
+                    long_call_value = max(0, future_price - long_strike)
+                    short_call_value = max(0, future_price - short_strike)
+                    spread_value = long_call_value - short_call_value
+                    
+                    # Calculate profit/loss
+                    profit_loss = spread_value - spread_cost
+                    scenario_roi = (profit_loss / spread_cost) * 100 if spread_cost > 0 else 0
+                    outcome = "profit" if profit_loss > 0 else "loss"
+                    
+                    scenarios.append({
+                        'price_change_percent': change_pct,
+                        'future_stock_price': round(future_price, 2),
+                        'spread_value_at_expiration': round(spread_value, 2),
+                        'profit_loss': round(profit_loss, 2),
+                        'roi_percent': round(scenario_roi, 1),
+                        'outcome': outcome
+                    })
                 
-                return strategy, {
+                # Build strategy analysis
+                analysis = {
                     'found': True,
-                    'spread_id': spread_id,
-                    'roi': f"{final_spread['roi']:.1f}%",
-                    'expiration': final_spread['expiration'],
-                    'dte': final_spread['dte'],
-                    'strike_price': final_spread['long_strike'],
-                    'short_strike_price': final_spread['short_strike'],
-                    'spread_cost': final_spread['spread_cost'],
-                    'max_profit': final_spread['max_profit'],
-                    'spread_width': final_spread['spread_width'],
-                    'contract_symbol': final_spread['long_ticker'],
-                    'short_contract_symbol': final_spread['short_ticker'],
-                    'long_price': final_spread.get('long_price', 0),
-                    'short_price': final_spread.get('short_price', 0),
-                    'management': 'Hold to expiration',
-                    'strategy_title': f"{strategy.title()} Strategy"
+                    'spread_details': {
+                        'long_strike': round(long_strike, 2),
+                        'short_strike': round(short_strike, 2),
+                        'spread_width': round(spread_width, 2),
+                        'spread_cost': round(spread_cost, 2),
+                        'max_profit': round(max_profit, 2),
+                        'max_loss': round(max_loss, 2),
+                        'breakeven_price': round(breakeven, 2),
+                        'roi_percent': round(roi, 1),
+                        'days_to_expiration': dte,
+                        'expiration_date': expiration
+                    },
+                    'contracts': {
+                        'long_contract': long_contract,
+                        'short_contract': short_contract,
+                        'long_price': round(long_price, 2),
+                        'short_price': round(short_price, 2)
+                    },
+                    'price_scenarios': scenarios,
+                    'strategy_info': {
+                        'strategy_name': strategy.title(),
+                        'description': strategy_data.get('management', f'{strategy.title()} debit spread strategy'),
+                        'risk_level': 'High' if strategy == 'aggressive' else 'Medium' if strategy == 'balanced' else 'Low'
+                    }
                 }
+                
+                logger.info(f"API: Found {strategy} spread - ROI: {roi:.1f}%, Width: ${spread_width:.2f}, DTE: {dte}")
+            
             else:
-                return strategy, {
+                # No spread found for this strategy
+                analysis = {
                     'found': False,
-                    'reason': f'No spreads found within {roi_min}-{roi_max}% ROI range'
+                    'error': strategy_data.get('reason', 'No suitable spreads found'),
+                    'strategy_info': {
+                        'strategy_name': strategy.title(),
+                        'risk_level': 'High' if strategy == 'aggressive' else 'Medium' if strategy == 'balanced' else 'Low'
+                    }
                 }
-        
-        # Process all strategies concurrently
-        with ThreadPoolExecutor(max_workers=3) as strategy_executor:
-            strategy_futures = {
-                strategy_executor.submit(process_single_strategy, strategy): strategy
-                for strategy in strategies
-            }
+                logger.info(f"API: No {strategy} spread found - {strategy_data.get('reason', 'No spreads available')}")
             
-            for future in as_completed(strategy_futures):
-                strategy, result = future.result()
-                results[strategy] = result
+            return analysis
         
-        return results
+        except Exception as e:
+            logger.error(f"API: Error analyzing {strategy} strategy for {ticker}: {e}")
+            return {
+                'found': False,
+                'error': f'Analysis error: {str(e)}',
+                'strategy_info': {
+                    'strategy_name': strategy.title(),
+                    'risk_level': 'High' if strategy == 'aggressive' else 'Medium' if strategy == 'balanced' else 'Low'
+                }
+            }
     
     def analyze_ticker(self, ticker: str) -> Dict:
         """Main analysis function for a ticker"""
+        started = time.perf_counter()
+        outcome = 'error'
         try:
-            # Track request
-            with self.request_lock:
-                self.request_status['active_requests'] += 1
-                self.request_status['total_requests'] += 1
-                self.request_status['recent_requests'].append(datetime.now(timezone.utc))
+            self.track_request_start()
             
             ticker = ticker.upper().strip()
             logger.info(f"API: Starting spread analysis for {ticker}")
             
             # Get current stock price
-            current_price = self.get_real_time_stock_price(ticker)
+            with STAGE_SECONDS.time(stage='price'):
+                current_price, price_staleness = self.get_stock_price_with_staleness(ticker)
             if not current_price:
+                outcome = 'no_price'
                 return {
                     'success': False,
                     'error': f'Unable to fetch current price for {ticker}'
@@ -579,150 +2076,208 @@ class DebitSpreadAnalyzer:
             # Analyze all strategies
             logger.info(f"API: Analyzing spread strategies for {ticker} at ${current_price}")
             all_strategies_data = self.find_best_spreads(ticker, current_price)
+            with STAGE_SECONDS.time(stage='response'):
+                response = self.build_analysis_response(ticker, current_price, all_strategies_data, price_staleness)
+            outcome = 'success'
+            return response
+        
+        except Exception as e:
+            logger.error(f"API: Critical error analyzing {ticker}: {e}")
+            return {
+                'success': False,
+                'error': f'Internal server error: {str(e)}'
+            }
+        
+        finally:
+            ANALYSIS_SECONDS.observe(time.perf_counter() - started, outcome=outcome)
+            self.track_request_end()
+    
+    def stream_ticker(self, ticker: str) -> Iterator[Dict]:
+        """Analyze a ticker, yielding each strategy's analysis as soon as it is ready
+        
+        Yields one {'type': 'strategy'} record per strategy in completion order,
+        then a {'type': 'summary'} record carrying the response metadata.
+        """
+        ticker = ticker.upper().strip()
+        try:
+            self.track_request_start()
+            logger.info(f"API: Starting streamed spread analysis for {ticker}")
             
-            strategies = ['aggressive', 'balanced', 'conservative']
-            all_strategies_analysis = {}
-            successful_strategies = 0
-            
-            # Process each strategy result
-            for strategy in strategies:
-                try:
-                    strategy_data = all_strategies_data.get(strategy, {'found': False})
-                    
-                    if strategy_data.get('found'):
-                        # Extract data from strategy results
-                        long_strike = float(strategy_data.get('strike_price', 0))
-                        short_strike = float(strategy_data.get('short_strike_price', 0))
-                        spread_cost = float(strategy_data.get('spread_cost', 0))
-                        max_profit = float(strategy_data.get('max_profit', 0))
-                        
-                        # Handle ROI conversion
-                        roi_value = strategy_data.get('roi', 0)
-                        if isinstance(roi_value, str) and roi_value.endswith('%'):
-                            roi = float(roi_value.replace('%', ''))
-                        else:
-                            roi = float(roi_value) if roi_value else 0
-                        
-                        dte = int(strategy_data.get('dte', 0))
-                        expiration = strategy_data.get('expiration', 'N/A')
-                        long_contract = strategy_data.get('contract_symbol', 'N/A')
-                        short_contract = strategy_data.get('short_contract_symbol', 'N/A')
-                        
-                        # Extract authentic bid/ask prices
-                        long_price = float(strategy_data.get('long_price', 0))
-                        short_price = float(strategy_data.get('short_price', 0))
-                        
-                        # Calculate metrics
-                        spread_width = short_strike - long_strike
-                        breakeven = long_strike + spread_cost
-                        max_loss = spread_cost
-                        
-                        # Generate profit/loss scenarios
-                        scenarios = []
-                        scenario_changes = [-10, -5, -2.5, -1, 0, 1, 2.5, 5, 10]
-                        
-                        for change_pct in scenario_changes:
-                            future_price = current_price * (1 + change_pct/100)
-                            
-                            # Calculate option values at expiration
-                            long_call_value = max(0, future_price - long_strike)
-                            short_call_value = max(0, future_price - short_strike)
-                            spread_value = long_call_value - short_call_value
-                            
-                            # Calculate profit/loss
-                            profit_loss = spread_value - spread_cost
-                            scenario_roi = (profit_loss / spread_cost) * 100 if spread_cost > 0 else 0
-                            outcome = "profit" if profit_loss > 0 else "loss"
-                            
-                            scenarios.append({
-                                'price_change_percent': change_pct,
-                                'future_stock_price': round(future_price, 2),
-                                'spread_value_at_expiration': round(spread_value, 2),
-                                'profit_loss': round(profit_loss, 2),
-                                'roi_percent': round(scenario_roi, 1),
-                                'outcome': outcome
-                            })
-                        
-                        # Build strategy analysis
-                        all_strategies_analysis[strategy] = {
-                            'found': True,
-                            'spread_details': {
-                                'long_strike': round(long_strike, 2),
-                                'short_strike': round(short_strike, 2),
-                                'spread_width': round(spread_width, 2),
-                                'spread_cost': round(spread_cost, 2),
-                                'max_profit': round(max_profit, 2),
-                                'max_loss': round(max_loss, 2),
-                                'breakeven_price': round(breakeven, 2),
-                                'roi_percent': round(roi, 1),
-                                'days_to_expiration': dte,
-                                'expiration_date': expiration
-                            },
-                            'contracts': {
-                                'long_contract': long_contract,
-                                'short_contract': short_contract,
-                                'long_price': round(long_price, 2),
-                                'short_price': round(short_price, 2)
-                            },
-                            'price_scenarios': scenarios,
-                            'strategy_info': {
-                                'strategy_name': strategy.title(),
-                                'description': strategy_data.get('management', f'{strategy.title()} debit spread strategy'),
-                                'risk_level': 'High' if strategy == 'aggressive' else 'Medium' if strategy == 'balanced' else 'Low'
-                            }
-                        }
-                        
-                        logger.info(f"API: Found {strategy} spread - ROI: {roi:.1f}%, Width: ${spread_width:.2f}, DTE: {dte}")
-                        successful_strategies += 1
-                        
-                    else:
-                        # No spread found for this strategy
-                        all_strategies_analysis[strategy] = {
-                            'found': False,
-                            'error': strategy_data.get('reason', 'No suitable spreads found'),
-                            'strategy_info': {
-                                'strategy_name': strategy.title(),
-                                'risk_level': 'High' if strategy == 'aggressive' else 'Medium' if strategy == 'balanced' else 'Low'
-                            }
-                        }
-                        logger.info(f"API: No {strategy} spread found - {strategy_data.get('reason', 'No spreads available')}")
-                
-                except Exception as e:
-                    logger.error(f"API: Error analyzing {strategy} strategy for {ticker}: {e}")
-                    all_strategies_analysis[strategy] = {
-                        'found': False,
-                        'error': f'Analysis error: {str(e)}',
-                        'strategy_info': {
-                            'strategy_name': strategy.title(),
-                            'risk_level': 'High' if strategy == 'aggressive' else 'Medium' if strategy == 'balanced' else 'Low'
-                        }
-                    }
+            with STAGE_SECONDS.time(stage='price'):
+                current_price, price_staleness = self.get_stock_price_with_staleness(ticker)
+            if not current_price:
+                yield {
+                    'type': 'summary',
+                    'success': False,
+                    'ticker': ticker,
+                    'error': f'Unable to fetch current price for {ticker}'
+                }
+                return
             
-            # Return comprehensive analysis
-            logger.info(f"API: Successfully analyzed {ticker} - Found {successful_strategies}/3 strategies")
+            successful_strategies = 0
+            all_strategies_data = {}
+            for strategy, strategy_data in self.iter_strategy_spreads(ticker, current_price):
+                all_strategies_data[strategy] = strategy_data
+                analysis = self.build_strategy_analysis(ticker, strategy, strategy_data, current_price)
+                successful_strategies += 1 if analysis['found'] else 0
+                yield {
+                    'type': 'strategy',
+                    'ticker': ticker,
+                    'strategy': strategy,
+                    'current_stock_price': round(current_price, 2),
+                    'analysis': analysis,
+                    'data_staleness': self.build_data_staleness(price_staleness, {strategy: strategy_data})
+                }
             
-            return {
+            yield {
+                'type': 'summary',
                 'success': True,
                 'ticker': ticker,
                 'current_stock_price': round(current_price, 2),
                 'analysis_timestamp': datetime.now().isoformat(),
                 'strategies_found': successful_strategies,
-                'strategies': all_strategies_analysis,
+                'data_staleness': self.build_data_staleness(price_staleness, all_strategies_data),
                 'pricing_methodology': 'ThinkOrSwim Professional Spread Pricing',
                 'data_source': 'TheTradeList API - Authentic Market Data'
             }
-            
+        
         except Exception as e:
-            logger.error(f"API: Critical error analyzing {ticker}: {e}")
-            return {
+            logger.error(f"API: Critical error streaming {ticker}: {e}")
+            yield {
+                'type': 'summary',
                 'success': False,
+                'ticker': ticker,
                 'error': f'Internal server error: {str(e)}'
             }
         
         finally:
-            # Clean up active request counter
-            with self.request_lock:
-                self.request_status['active_requests'] = max(0, self.request_status['active_requests'] - 1)
+            self.track_request_end()
+    
+    def analyze_many(self, tickers: List[str]) -> Iterator[Dict]:
+        """Analyze many tickers, yielding each result as soon as it completes
+        
+        Prices for the whole list come from shared snapshot calls up front;
+        chains and quotes are then fetched concurrently, bounded by the
+        process-wide bulk_semaphore across all in-flight sweeps. If the
+        consumer stops early (a streaming client disconnects), tickers not yet
+        started are cancelled and the caller does not wait for running ones.
+        """
+        tickers = list(dict.fromkeys(ticker.upper().strip() for ticker in tickers if ticker and ticker.strip()))
+        if not tickers:
+            return
+        
+        # Warm the price cache so each analysis starts with a cache hit
+        self.get_real_time_stock_prices(tickers)
+        
+        def analyze_bounded(ticker):
+            with self.bulk_semaphore:
+                return self.inflight.do(f"analysis:{ticker}", lambda: self.analyze_ticker(ticker))
+        
+        executor = ThreadPoolExecutor(max_workers=min(self.bulk_concurrency, len(tickers)))
+        finished = False
+        try:
+            futures = {executor.submit(analyze_bounded, ticker): ticker for ticker in tickers}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'success': False, 'error': f'Internal server error: {str(e)}'}
+                yield {'ticker': ticker, **result}
+            finished = True
+        finally:
+            executor.shutdown(wait=finished, cancel_futures=not finished)
+    
+    @staticmethod
+    def build_data_staleness(price_staleness: float, all_strategies_data: Dict[str, Dict]) -> Dict:
+        """Seconds the served price and quotes were past their soft TTL (0 when fresh)"""
+        return {
+            'price_seconds': round(price_staleness, 1),
+            'quotes_seconds': round(max((data.get('quote_staleness', 0.0) for data in all_strategies_data.values()),
+                                        default=0.0), 1)
+        }
+    
+    def build_analysis_response(self, ticker: str, current_price: float, all_strategies_data: Dict[str, Dict],
+                                price_staleness: float = 0.0) -> Dict:
+        """Assemble the full analysis response from per-strategy spread selections"""
+        all_strategies_analysis = {}
+        
+        # Process each strategy result
+        for strategy in self.strategies:
+            strategy_data = all_strategies_data.get(strategy, {'found': False})
+            all_strategies_analysis[strategy] = self.build_strategy_analysis(ticker, strategy, strategy_data, current_price)
+        
+        successful_strategies = sum(1 for analysis in all_strategies_analysis.values() if analysis['found'])
+        
+        # Return comprehensive analysis
+        logger.info(f"API: Successfully analyzed {ticker} - Found {successful_strategies}/3 strategies")
+        
+        return {
+            'success': True,
+            'ticker': ticker,
+            'current_stock_price': round(current_price, 2),
+            'analysis_timestamp': datetime.now().isoformat(),
+            'strategies_found': successful_strategies,
+            'strategies': all_strategies_analysis,
+            'data_staleness': self.build_data_staleness(price_staleness, all_strategies_data),
+            'pricing_methodology': 'ThinkOrSwim Professional Spread Pricing',
+            'data_source': 'TheTradeList API - Authentic Market Data'
+        }
+    
+    def track_request_start(self):
+        """Track a new analysis request"""
+        with self.request_lock:
+            self.request_status['active_requests'] += 1
+            self.request_status['total_requests'] += 1
+            self.request_status['recent_requests'].append(datetime.now(timezone.utc))
+    
+    def track_request_end(self):
+        """Clean up active request counter"""
+        with self.request_lock:
+            self.request_status['active_requests'] = max(0, self.request_status['active_requests'] - 1)
+    
+    def collect_metrics(self) -> List[Tuple[str, str, str, List[Tuple[Dict, float]]]]:
+        """Scrape-time samples for state the analyzer already tracks"""
+        cache = self.cache_service.get_stats()
+        limiter = self.upstream.limiter.stats()
+        storage = self.spread_storage.stats()
+        refresh = self.refresher.stats()
+        with self.request_lock:
+            total_requests = self.request_status['total_requests']
+            active_requests = self.request_status['active_requests']
+        
+        return [
+            ('spread_cache_requests_total', 'counter', 'Cache lookups by tier and result', [
+                ({'tier': 'local', 'result': 'hit'}, cache['local']['hits']),
+                ({'tier': 'local', 'result': 'miss'}, cache['local']['misses']),
+                ({'tier': 'redis', 'result': 'hit'}, cache['redis']['hits']),
+                ({'tier': 'redis', 'result': 'miss'}, cache['redis']['misses'])
+            ]),
+            ('spread_cache_local_entries', 'gauge', 'Entries in the in-process cache tier', [
+                ({}, cache['local']['entries'])
+            ]),
+            ('spread_cache_local_evictions_total', 'counter', 'LRU evictions from the in-process cache tier', [
+                ({}, cache['local']['evictions'])
+            ]),
+            ('spread_cache_refreshes_total', 'counter', 'Background stale-entry refreshes scheduled', [
+                ({}, refresh['scheduled'])
+            ]),
+            ('spread_storage_entries', 'gauge', 'Spreads held in local spread storage', [
+                ({}, storage['local']['entries'] if 'local' in storage else storage['entries'])
+            ]),
+            ('tradelist_concurrency_limit', 'gauge', 'Adaptive TheTradeList concurrency limit', [
+                ({}, limiter['concurrency_limit'])
+            ]),
+            ('tradelist_in_flight', 'gauge', 'TheTradeList calls in flight', [
+                ({}, limiter['in_flight'])
+            ]),
+            ('spread_requests_total', 'counter', 'Analysis requests started', [
+                ({}, total_requests)
+            ]),
+            ('spread_active_requests', 'gauge', 'Analysis requests in progress', [
+                ({}, active_requests)
+            ])
+        ]
     
     def get_status(self) -> Dict:
         """Get current API status"""
@@ -738,11 +2293,17 @@ class DebitSpreadAnalyzer:
             return {
                 'status': len(self.request_status['recent_requests']),
                 'total_requests': self.request_status['total_requests'],
-                'active_requests': self.request_status['active_requests']
+                'active_requests': self.request_status['active_requests'],
+                'cache': self.cache_service.get_stats(),
+                'cache_refresh': self.refresher.stats(),
+                'scanner_snapshot': self.scanner.stats(),
+                'upstream': self.upstream.limiter.stats(),
+                'spread_storage': self.spread_storage.stats()
             }
 
 # Global analyzer instance
 analyzer = DebitSpreadAnalyzer()
+metrics.register_collector(analyzer.collect_metrics)
 
 # Main analysis function for external use
 def analyze_debit_spread(ticker: str) -> Dict:
@@ -755,7 +2316,36 @@ def analyze_debit_spread(ticker: str) -> Dict:
     Returns:
         Dictionary with complete analysis results
     """
-    return analyzer.analyze_ticker(ticker)
+    # Concurrent requests for the same ticker share one analysis
+    return analyzer.inflight.do(f"analysis:{ticker.upper().strip()}", lambda: analyzer.analyze_ticker(ticker))
+
+def stream_debit_spread(ticker: str) -> Iterator[Dict]:
+    """
+    Analyze debit spreads for a ticker, streaming per-strategy results
+    
+    Args:
+        ticker: Stock symbol to analyze
+    
+    Yields:
+        One record per strategy as it completes, then a summary record
+    """
+    return analyzer.stream_ticker(ticker)
+
+def analyze_many(tickers: List[str]) -> Iterator[Dict]:
+    """
+    Analyze debit spreads for many tickers
+    
+    Args:
+        tickers: Stock symbols to analyze
+    
+    Yields:
+        Per-ticker analysis dictionaries in completion order
+    """
+    return analyzer.analyze_many(tickers)
+
+def get_metrics_text() -> str:
+    """All analyzer metrics in the Prometheus text exposition format"""
+    return metrics.render()
 
 def get_api_status() -> Dict:
     """
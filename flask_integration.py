@@ -3,14 +3,26 @@ Flask Integration Wrapper for Debit Spread Analyzer
 Easy integration into existing Vercel applications
 """
 
-from flask import Flask, request, jsonify
-from debit_spread_analyzer import analyze_debit_spread, get_api_status
+from flask import Flask, Response, request, jsonify, stream_with_context
+from debit_spread_analyzer import analyze_many, stream_debit_spread, get_api_status, get_metrics_text
+import json
 import logging
+import os
+import time
+
+# SPREAD_ANALYZER_MODE=async runs analyses on the shared asyncio pipeline
+if os.environ.get('SPREAD_ANALYZER_MODE') == 'async':
+    from async_debit_spread_analyzer import analyze_debit_spread
+else:
+    from debit_spread_analyzer import analyze_debit_spread
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Upper bound on symbols accepted by one batch request
+MAX_BATCH_TICKERS = 500
+
 def create_debit_spread_routes(app: Flask):
     """
     Add debit spread analysis routes to an existing Flask app
@@ -22,14 +34,23 @@ def create_debit_spread_routes(app: Flask):
     app = Flask(__name__)
     create_debit_spread_routes(app)
     ```
+    
+    Set PREWARM_ENABLED=true to also keep the top-scored tickers warm in cache.
     """
     
+    prewarmer = None
+    if os.environ.get('PREWARM_ENABLED', '').lower() == 'true':
+        from cache_prewarmer import start_prewarmer
+        prewarmer = start_prewarmer()
+    
     @app.route('/api/analyze_debit_spread', methods=['POST'])
     def analyze_debit_spread_endpoint():
         """
         POST endpoint for debit spread analysis
-        Accepts: {"ticker": "AAPL"}
-        Returns: Complete spread analysis with authentic market data
+        Accepts: {"ticker": "AAPL", "stream": false}
+        Returns: Complete spread analysis with authentic market data, or with
+        "stream": true an NDJSON stream of per-strategy records as each
+        strategy completes, followed by a summary record
         """
         try:
             # Validate request
@@ -54,6 +75,13 @@ def create_debit_spread_routes(app: Flask):
                     'error': 'Invalid ticker symbol'
                 }), 400
             
+            if data.get('stream'):
+                def generate():
+                    for record in stream_debit_spread(ticker):
+                        yield json.dumps(record) + '\n'
+                
+                return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+            
             # Perform analysis
             result = analyze_debit_spread(ticker)
             
@@ -69,11 +97,69 @@ def create_debit_spread_routes(app: Flask):
                 'error': f'Internal server error: {str(e)}'
             }), 500
     
+    @app.route('/api/analyze_debit_spreads', methods=['POST'])
+    def analyze_debit_spreads_endpoint():
+        """
+        POST endpoint for bulk debit spread analysis
+        Accepts: {"tickers": ["AAPL", "MSFT", ...]}
+        Returns: NDJSON stream, one {"type": "ticker"} record per ticker as it
+        completes, followed by a {"type": "summary"} record
+        """
+        if not request.is_json:
+            return jsonify({
+                'success': False,
+                'error': 'Content-Type must be application/json'
+            }), 400
+        
+        data = request.get_json()
+        tickers = data.get('tickers') if isinstance(data, dict) else None
+        if not isinstance(tickers, list) or not tickers:
+            return jsonify({
+                'success': False,
+                'error': 'Missing required field: tickers'
+            }), 400
+        if not all(isinstance(ticker, str) for ticker in tickers):
+            return jsonify({
+                'success': False,
+                'error': 'tickers must be a list of strings'
+            }), 400
+        
+        tickers = [ticker.upper().strip() for ticker in tickers]
+        if len(tickers) > MAX_BATCH_TICKERS or any(not ticker or len(ticker) > 10 for ticker in tickers):
+            return jsonify({
+                'success': False,
+                'error': f'Provide 1-{MAX_BATCH_TICKERS} valid ticker symbols'
+            }), 400
+        
+        def generate():
+            started = time.time()
+            completed = succeeded = 0
+            try:
+                for result in analyze_many(tickers):
+                    completed += 1
+                    succeeded += 1 if result.get('success') else 0
+                    yield json.dumps({'type': 'ticker', **result}) + '\n'
+            except Exception as e:
+                logger.error(f"Batch endpoint error: {e}")
+                yield json.dumps({'type': 'error', 'error': f'Internal server error: {str(e)}'}) + '\n'
+            
+            yield json.dumps({
+                'type': 'summary',
+                'requested': len(set(tickers)),
+                'completed': completed,
+                'succeeded': succeeded,
+                'elapsed_seconds': round(time.time() - started, 3)
+            }) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
     @app.route('/api/spread_status', methods=['GET'])
     def spread_status_endpoint():
         """GET endpoint for API status monitoring"""
         try:
             status = get_api_status()
+            if prewarmer is not None:
+                status['prewarmer'] = prewarmer.stats()
             return jsonify(status)
         except Exception as e:
             logger.error(f"Status endpoint error: {e}")
@@ -81,6 +167,17 @@ def create_debit_spread_routes(app: Flask):
                 'error': f'Status check failed: {str(e)}'
             }), 500
     
+    @app.route('/api/spread_metrics', methods=['GET'])
+    def spread_metrics_endpoint():
+        """GET endpoint exposing per-stage latency histograms and counters for Prometheus"""
+        try:
+            return Response(get_metrics_text(), mimetype='text/plain; version=0.0.4')
+        except Exception as e:
+            logger.error(f"Metrics endpoint error: {e}")
+            return jsonify({
+                'error': f'Metrics collection failed: {str(e)}'
+            }), 500
+    
     @app.route('/api/spread_health', methods=['GET'])
     def spread_health_endpoint():
         """Health check endpoint"""
@@ -110,12 +207,20 @@ def create_standalone_app():
             'endpoints': {
                 'POST /api/analyze_debit_spread': {
                     'description': 'Analyze debit spreads for a ticker',
-                    'input': {'ticker': 'string (required)'},
+                    'input': {'ticker': 'string (required)', 'stream': 'boolean (optional, NDJSON per-strategy records)'},
                     'example': {'ticker': 'AAPL'}
                 },
+                'POST /api/analyze_debit_spreads': {
+                    'description': 'Analyze many tickers, streamed back as NDJSON in completion order',
+                    'input': {'tickers': 'array of strings (required)'},
+                    'example': {'tickers': ['AAPL', 'MSFT', 'SPY']}
+                },
                 'GET /api/spread_status': {
                     'description': 'API status and request monitoring'
                 },
+                'GET /api/spread_metrics': {
+                    'description': 'Per-stage latency histograms and counters (Prometheus text format)'
+                },
                 'GET /api/spread_health': {
                     'description': 'Health check endpoint'
                 }
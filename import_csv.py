@@ -1,78 +1,284 @@
 #!/usr/bin/env python3
 """
 Import authentic CSV data to fix database corruption
+Bulk loads scanner CSV snapshots into a shadow copy of etf_scores with COPY
+FROM STDIN (or execute_values batches) and swaps it in atomically, or upserts
+by symbol for incremental updates
 """
 import csv
+import io
 import os
+import sys
+import glob
+import time
+import argparse
+import itertools
 import psycopg2
+import psycopg2.extras
 from datetime import datetime
 
+from scanner_csv import RejectReport, iter_scanner_records
+
 # Database connection
 DATABASE_URL = os.environ.get('DATABASE_URL')
 
-def import_csv_data():
-    conn = psycopg2.connect(DATABASE_URL)
-    cur = conn.cursor()
+DEFAULT_CSV = 'attached_assets/REAL_5_criteria_plus_options_20250613_231028_1750019299833.csv'
+
+ETF_SCORES_COLUMNS = (
+    'symbol', 'current_price', 'total_score', 'trading_volume_20_day', 'options_contracts_10_42_dte',
+    'trend1_pass', 'trend1_current', 'trend1_threshold', 'trend1_description',
+    'trend2_pass', 'trend2_current', 'trend2_threshold', 'trend2_description',
+    'snapback_pass', 'snapback_current', 'snapback_threshold', 'snapback_description',
+    'momentum_pass', 'momentum_current', 'momentum_threshold', 'momentum_description',
+    'stabilizing_pass', 'stabilizing_current', 'stabilizing_threshold', 'stabilizing_description',
+    'calculation_timestamp'
+)
+
+# Longest the shadow swap waits for readers to release etf_scores before giving up
+SWAP_LOCK_TIMEOUT = os.environ.get('IMPORT_SWAP_LOCK_TIMEOUT', '5s')
+
+def expand_paths(patterns):
+    """Files matching each path or glob pattern, in order, without duplicates"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            print(f"No files match {pattern}")
+        paths.extend(matches)
+    return list(dict.fromkeys(paths))
+
+def record_to_row(record, loaded_at):
+    """etf_scores column values for one scanner record"""
+    row = [record.symbol, record.current_price, record.total_score, record.avg_volume_10d, record.options_contracts]
+    for _, passed, current, threshold, description in record.criteria():
+        row.extend((passed, current, threshold, description))
+    row.append(loaded_at)
+    return row
+
+def iter_csv_records(paths, loaded_at, rejects=None):
+    """Stream etf_scores rows from every CSV file in turn, skipping rejected rows"""
+    for record in iter_scanner_records(paths, rejects):
+        yield record_to_row(record, loaded_at)
+
+class CopyStream:
+    """Read-only file view of records as CSV text, produced on demand for COPY FROM STDIN"""
     
-    # Clear existing data
-    cur.execute("DELETE FROM etf_scores")
-    print("Cleared existing corrupted data")
+    def __init__(self, records):
+        self.records = iter(records)
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer, lineterminator='\n')
+        self.pending = ''
+        self.rows = 0
     
-    # Import authentic CSV data
-    with open('attached_assets/REAL_5_criteria_plus_options_20250613_231028_1750019299833.csv', 'r') as f:
-        reader = csv.DictReader(f)
-        count = 0
-        
-        for row in reader:
-            # Convert string boolean values to proper booleans
-            trend1_pass = row['trend1_pass'].lower() == 'true'
-            trend2_pass = row['trend2_pass'].lower() == 'true'
-            snapback_pass = row['snapback_pass'].lower() == 'true'
-            momentum_pass = row['momentum_pass'].lower() == 'true'
-            stabilizing_pass = row['stabilizing_pass'].lower() == 'true'
-            
-            # Calculate authentic score from criteria
-            actual_score = sum([trend1_pass, trend2_pass, snapback_pass, momentum_pass, stabilizing_pass])
-            
-            # Clean numeric values
-            current_price = float(row['current_price'])
-            avg_volume = row['avg_volume_10d'].replace(',', '').replace('"', '') if row['avg_volume_10d'] else '0'
-            options_contracts = int(row['options_contracts_10_42_dte']) if row['options_contracts_10_42_dte'] else 0
-            
-            cur.execute("""
-                INSERT INTO etf_scores (
-                    symbol, current_price, total_score, trading_volume_20_day, options_contracts_10_42_dte,
-                    trend1_pass, trend1_current, trend1_threshold, trend1_description,
-                    trend2_pass, trend2_current, trend2_threshold, trend2_description,
-                    snapback_pass, snapback_current, snapback_threshold, snapback_description,
-                    momentum_pass, momentum_current, momentum_threshold, momentum_description,
-                    stabilizing_pass, stabilizing_current, stabilizing_threshold, stabilizing_description,
-                    calculation_timestamp
-                ) VALUES (
-                    %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s,
-                    %s, %s, %s, %s,
-                    %s, %s, %s, %s,
-                    %s, %s, %s, %s,
-                    %s, %s, %s, %s,
-                    %s
-                )
-            """, (
-                row['symbol'], current_price, actual_score, avg_volume, options_contracts,
-                trend1_pass, row['trend1_current'], row['trend1_threshold'], row['trend1_description'],
-                trend2_pass, row['trend2_current'], row['trend2_threshold'], row['trend2_description'],
-                snapback_pass, row['snapback_current'], row['snapback_threshold'], row['snapback_description'],
-                momentum_pass, row['momentum_current'], row['momentum_threshold'], row['momentum_description'],
-                stabilizing_pass, row['stabilizing_current'], row['stabilizing_threshold'], row['stabilizing_description'],
-                datetime.now()
-            ))
-            count += 1
+    def read(self, size=-1):
+        limit = size if size and size > 0 else 1 << 16
+        while len(self.pending) < limit:
+            for record in itertools.islice(self.records, 512):
+                self.writer.writerow(['' if value is None else value for value in record])
+                self.rows += 1
+            chunk = self.buffer.getvalue()
+            if not chunk:
+                break
+            self.buffer.seek(0)
+            self.buffer.truncate()
+            self.pending += chunk
+        data, self.pending = self.pending[:limit], self.pending[limit:]
+        return data
+
+def copy_records(cur, table, records, columns=ETF_SCORES_COLUMNS):
+    """Load records with one COPY FROM STDIN; returns the row count"""
+    stream = CopyStream(records)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", stream)
+    return stream.rows
+
+def insert_records(cur, table, records, batch_size=1000, columns=ETF_SCORES_COLUMNS):
+    """Load records with multi-row execute_values INSERTs; returns the row count"""
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+    count = 0
+    records = iter(records)
+    while True:
+        batch = list(itertools.islice(records, batch_size))
+        if not batch:
+            return count
+        psycopg2.extras.execute_values(cur, sql, batch, page_size=batch_size)
+        count += len(batch)
+
+def load_records(cur, table, records, method='copy', batch_size=1000, columns=ETF_SCORES_COLUMNS):
+    """Load records into table by COPY or execute_values; returns the row count"""
+    if method == 'copy':
+        return copy_records(cur, table, records, columns)
+    return insert_records(cur, table, records, batch_size, columns)
+
+# (shadow index, live index) names, quoted, matched by uniqueness and definition
+INDEX_NAME_PAIRS = r"""
+    WITH indexes AS (
+        SELECT x.indrelid, c.relname, x.indisunique, x.indisprimary,
+               regexp_replace(pg_get_indexdef(x.indexrelid), '^.*? ON \S+ ', '') AS definition
+        FROM pg_index x JOIN pg_class c ON c.oid = x.indexrelid
+        WHERE x.indrelid IN ('etf_scores'::regclass, 'etf_scores_shadow'::regclass)
+    ), numbered AS (
+        SELECT *, row_number() OVER (PARTITION BY indrelid, indisunique, indisprimary, definition ORDER BY relname) AS n
+        FROM indexes
+    )
+    SELECT format('%I', shadow.relname), format('%I', live.relname)
+    FROM numbered shadow
+    JOIN numbered live USING (indisunique, indisprimary, definition, n)
+    WHERE shadow.indrelid = 'etf_scores_shadow'::regclass AND live.indrelid = 'etf_scores'::regclass
+      AND shadow.relname <> live.relname
+"""
+
+def dependent_objects(cur):
+    """Views and foreign keys in other tables that reference etf_scores
+    
+    The shadow swap cannot drop the old table while any of these exist, since
+    they follow it through the rename rather than moving to the new table.
+    """
+    cur.execute("""
+        SELECT DISTINCT 'view ' || r.ev_class::regclass::text
+        FROM pg_depend d JOIN pg_rewrite r ON r.oid = d.objid
+        WHERE d.classid = 'pg_rewrite'::regclass AND d.refobjid = 'etf_scores'::regclass
+          AND r.ev_class <> 'etf_scores'::regclass
+        UNION
+        SELECT 'foreign key ' || conname || ' on ' || conrelid::regclass::text
+        FROM pg_constraint
+        WHERE contype = 'f' AND confrelid = 'etf_scores'::regclass AND conrelid <> 'etf_scores'::regclass
+    """)
+    return sorted(name for name, in cur.fetchall())
+
+def swap_in_shadow(cur):
+    """Replace etf_scores with etf_scores_shadow by renaming both in the current transaction
     
-    conn.commit()
-    cur.close()
-    conn.close()
+    Serial sequences are moved to the new table first so dropping the old one
+    does not take them with it. lock_timeout keeps the swap from queueing live
+    readers behind it if a long query holds the table. Afterwards the new
+    table's indexes (and the constraints they back) get the old names back,
+    so repeated reloads do not pile up etf_scores_shadow_* names.
+    """
+    cur.execute("""
+        SELECT a.attname, pg_get_serial_sequence('etf_scores', a.attname)
+        FROM pg_attribute a
+        WHERE a.attrelid = 'etf_scores'::regclass AND a.attnum > 0 AND NOT a.attisdropped AND a.attidentity = ''
+    """)
+    for column, sequence in cur.fetchall():
+        if sequence:
+            cur.execute(f"ALTER SEQUENCE {sequence} OWNED BY etf_scores_shadow.{column}")
+    
+    # Pair each shadow index with the live index of the same definition
+    cur.execute(INDEX_NAME_PAIRS)
+    index_names = cur.fetchall()
+    
+    cur.execute("SELECT set_config('lock_timeout', %s, true)", (SWAP_LOCK_TIMEOUT,))
+    cur.execute("ALTER TABLE etf_scores RENAME TO etf_scores_old")
+    cur.execute("ALTER TABLE etf_scores_shadow RENAME TO etf_scores")
+    cur.execute("DROP TABLE etf_scores_old")
+    for shadow_name, live_name in index_names:
+        cur.execute(f"ALTER INDEX {shadow_name} RENAME TO {live_name}")
+
+def stage_records(cur, records, method='copy', batch_size=1000):
+    """Load records into a temporary etf_scores_stage table dropped at commit; returns the row count
+    
+    Each row is staged with its position in the input (import_ordinal), since
+    the physical order of the stage table is not guaranteed.
+    """
+    cur.execute("CREATE TEMP TABLE etf_scores_stage (LIKE etf_scores INCLUDING DEFAULTS) ON COMMIT DROP")
+    cur.execute("ALTER TABLE etf_scores_stage ADD COLUMN import_ordinal bigint NOT NULL")
+    numbered = ((*row, ordinal) for ordinal, row in enumerate(records))
+    return load_records(cur, 'etf_scores_stage', numbered, method, batch_size, ETF_SCORES_COLUMNS + ('import_ordinal',))
+
+def latest_staged_rows():
+    """SELECT of one staged row per symbol, the last in input order"""
+    columns = ', '.join(ETF_SCORES_COLUMNS)
+    return f"SELECT DISTINCT ON (symbol) {columns} FROM etf_scores_stage ORDER BY symbol, import_ordinal DESC"
+
+def reload_table(cur, records, method='copy', batch_size=1000):
+    """Stage records into a shadow copy of etf_scores and swap it in
+    
+    Readers keep seeing the previous complete ranking until commit, and the
+    old table is dropped rather than left full of dead tuples. As with
+    upsert_records, a symbol that appears more than once keeps its last row.
+    Returns the number of rows loaded.
+    """
+    dependents = dependent_objects(cur)
+    if dependents:
+        raise RuntimeError(f"Cannot reload etf_scores by table swap while {', '.join(dependents)} "
+                           f"depend on it; drop them first or use --upsert")
+    
+    count = stage_records(cur, records, method, batch_size)
+    cur.execute("DROP TABLE IF EXISTS etf_scores_shadow")
+    cur.execute("CREATE TABLE etf_scores_shadow (LIKE etf_scores INCLUDING ALL)")
+    cur.execute(f"INSERT INTO etf_scores_shadow ({', '.join(ETF_SCORES_COLUMNS)}) {latest_staged_rows()}")
+    symbols = cur.rowcount
+    cur.execute("ANALYZE etf_scores_shadow")
+    swap_in_shadow(cur)
+    print(f"Swapped {symbols} reloaded symbols into etf_scores")
+    return count
+
+def upsert_records(cur, records, method='copy', batch_size=1000):
+    """Insert or update rows by symbol, leaving symbols not in the input untouched
+    
+    Requires a unique index on etf_scores.symbol. When a symbol appears more
+    than once, its last row in file order wins.
+    """
+    count = stage_records(cur, records, method, batch_size)
+    updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in ETF_SCORES_COLUMNS if column != 'symbol')
+    cur.execute(f"""
+        INSERT INTO etf_scores ({', '.join(ETF_SCORES_COLUMNS)})
+        {latest_staged_rows()}
+        ON CONFLICT (symbol) DO UPDATE SET {updates}
+    """)
+    print(f"Upserted {cur.rowcount} symbols into etf_scores")
+    return count
+
+def import_csv_data(paths=None, method='copy', batch_size=1000, database_url=None, upsert=False,
+                    rejects_path=None):
+    """Reload (or upsert into) etf_scores from every CSV in paths in one transaction
+    
+    Malformed rows are skipped and summarized (and written to rejects_path
+    if given) instead of aborting the import.
+    """
+    paths = paths or [DEFAULT_CSV]
+    rejects = RejectReport()
+    started = time.monotonic()
+    conn = psycopg2.connect(database_url or DATABASE_URL)
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                records = iter_csv_records(paths, datetime.now(), rejects)
+                if upsert:
+                    count = upsert_records(cur, records, method, batch_size)
+                else:
+                    count = reload_table(cur, records, method, batch_size)
+    finally:
+        conn.close()
+    
+    elapsed = time.monotonic() - started
+    print(f"Successfully imported {count} tickers with authentic criteria data from {len(paths)} files "
+          f"in {elapsed:.2f}s ({count / elapsed if elapsed else 0:.0f} rows/s, {method})")
+    print(rejects.summary())
+    if rejects_path and rejects.total:
+        rejects.write(rejects_path)
+        print(f"Wrote {len(rejects.samples)} rejected rows to {rejects_path}")
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bulk load scanner CSV snapshots into etf_scores')
+    parser.add_argument('paths', nargs='*', default=[DEFAULT_CSV], help='CSV files or glob patterns')
+    parser.add_argument('--method', choices=('copy', 'values'), default='copy',
+                        help='COPY FROM STDIN or execute_values INSERT batches')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per execute_values batch')
+    parser.add_argument('--database-url', default=DATABASE_URL, help='Defaults to DATABASE_URL')
+    parser.add_argument('--upsert', action='store_true',
+                        help='Insert or update by symbol instead of replacing the table (needs a unique symbol index)')
+    parser.add_argument('--rejects', help='Write rejected rows to this CSV file')
+    args = parser.parse_args(argv)
     
-    print(f"Successfully imported {count} tickers with authentic criteria data")
+    paths = expand_paths(args.paths)
+    if not paths:
+        return 1
+    if not args.database_url:
+        parser.error('DATABASE_URL is not set')
+    import_csv_data(paths, args.method, args.batch_size, args.database_url, args.upsert, args.rejects)
+    return 0
 
 if __name__ == "__main__":
-    import_csv_data()
\ No newline at end of file
+    sys.exit(main())
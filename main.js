@@ -467,6 +467,7 @@ app.get('/health', (req, res) => {
   res.json({ 
     status: 'healthy', 
     service: 'Income Machine Node.js',
+    pid: process.pid,
     timestamp: new Date().toISOString()
   });
 });
@@ -4,79 +4,115 @@ Starts Node.js server and proxies all requests to it
 """
 
 from flask import Flask, request, Response
-import subprocess
 import requests
-import time
+from requests.adapters import HTTPAdapter
 import os
 
+from backend_supervisor import node_backend
+
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "dev-key")
 
-# Start Node.js server in background
-nodejs_process = None
+# Node.js server on port 5001, restarted if it exits; requests wait for readiness
+backend = node_backend(5001)
+PROXY_READY_WAIT = float(os.environ.get('PROXY_READY_WAIT', 5))
+
+STARTING_PAGE = """
+        <html><body>
+        <h2>Starting Income Machine...</h2>
+        <script>setTimeout(() => location.reload(), 3000);</script>
+        </body></html>
+        """
 
 def start_nodejs():
-    global nodejs_process
+    """Start the Node.js server under the readiness-probing supervisor"""
+    backend.start()
+
+# Persistent keep-alive pool to the Node.js backend, shared by all requests
+BACKEND_URL = os.environ.get('NODE_BACKEND_URL', 'http://localhost:5001')
+PROXY_CHUNK_SIZE = int(os.environ.get('PROXY_CHUNK_SIZE', 64 * 1024))
+proxy_session = requests.Session()
+proxy_session.mount('http://', HTTPAdapter(pool_connections=1,
+                                           pool_maxsize=int(os.environ.get('PROXY_POOL_MAXSIZE', 32)),
+                                           max_retries=0))
+
+# (connect, read) timeouts by path prefix, first match wins; the read timeout
+# bounds the gap between chunks, not the whole response
+ROUTE_TIMEOUTS = [
+    ('api/analyze_debit_spread', (3.05, 45)),
+    ('api/', (3.05, 15)),
+]
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# Connection-scoped headers (RFC 7230 6.1) that must not be forwarded
+HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailer', 'trailers', 'transfer-encoding', 'upgrade'
+}
+
+def route_timeout(path):
+    """Timeout for a proxied path from ROUTE_TIMEOUTS"""
+    for prefix, timeout in ROUTE_TIMEOUTS:
+        if path.startswith(prefix):
+            return timeout
+    return DEFAULT_TIMEOUT
+
+def end_to_end_headers(headers, extra_excluded=()):
+    """Headers minus hop-by-hop ones and any named in the Connection header"""
+    headers = list(headers)
+    excluded = HOP_BY_HOP_HEADERS | set(extra_excluded)
+    for name, value in headers:
+        if name.lower() == 'connection':
+            excluded |= {token.strip().lower() for token in value.split(',')}
+    return [(name, value) for name, value in headers if name.lower() not in excluded]
+
+def forward_request_headers():
+    """Browser headers for the backend, without Host and hop-by-hop headers"""
+    headers = end_to_end_headers(request.headers.items(), ('host', 'content-length'))
+    forwarded_for = request.headers.get('X-Forwarded-For')
+    headers.append(('X-Forwarded-For', f"{forwarded_for}, {request.remote_addr}" if forwarded_for else request.remote_addr or ''))
+    headers.append(('X-Forwarded-Host', request.host))
+    headers.append(('X-Forwarded-Proto', request.scheme))
+    return dict(headers)
+
+def stream_body(resp):
+    """Relay the backend body chunk by chunk, returning the connection to the pool when done"""
     try:
-        # Kill existing Node.js processes
-        subprocess.run(['pkill', '-f', 'node main.js'], check=False)
-        time.sleep(1)
-        
-        # Start Node.js server on port 5001
-        nodejs_process = subprocess.Popen(['node', 'main.js'], 
-                                        env={**os.environ, 'PORT': '5001'})
-        time.sleep(3)  # Wait for startup
-        print("Node.js server started on port 5001")
-    except Exception as e:
-        print(f"Error starting Node.js: {e}")
+        for chunk in resp.raw.stream(PROXY_CHUNK_SIZE, decode_content=False):
+            yield chunk
+    finally:
+        resp.close()
 
 @app.route('/', defaults={'path': ''}, methods=['GET', 'POST', 'PUT', 'DELETE', 'PATCH'])
 @app.route('/<path:path>', methods=['GET', 'POST', 'PUT', 'DELETE', 'PATCH'])
 def proxy(path):
-    """Proxy all requests to Node.js server"""
+    """Proxy all requests to Node.js server, streaming the response body"""
+    # A permanent failure (e.g. port held by another process) will not clear by waiting
+    if backend.failure:
+        return f"Income Machine backend unavailable: {backend.failure}", 503
+    
+    # Hold requests briefly while the backend starts instead of failing them
+    if not backend.wait_ready(PROXY_READY_WAIT):
+        return STARTING_PAGE, 503, {'Retry-After': '3'}
+    
     try:
-        url = f"http://localhost:5001/{path}"
-        
-        # Forward request with all parameters and headers
-        # Use longer timeout for spread analysis endpoints to allow failover
-        timeout = 45 if path == 'api/analyze_debit_spread' else 10
-        
-        if request.method == 'GET':
-            resp = requests.get(url, 
-                              params=dict(request.args), 
-                              headers=dict(request.headers),
-                              timeout=timeout)
-        elif request.method == 'POST':
-            resp = requests.post(url,
-                               params=dict(request.args),
-                               json=request.get_json() if request.is_json else None,
-                               data=request.form if not request.is_json else None,
-                               headers=dict(request.headers),
-                               timeout=timeout)
-        else:
-            # Handle other HTTP methods
-            resp = requests.request(request.method, url,
-                                  params=dict(request.args),
-                                  json=request.get_json() if request.is_json else None,
-                                  data=request.form if not request.is_json else None,
-                                  headers=dict(request.headers),
-                                  timeout=timeout)
-        
-        # Create response with proper headers
-        excluded_headers = ['content-encoding', 'content-length', 'transfer-encoding', 'connection']
-        headers = [(name, value) for (name, value) in resp.headers.items()
-                  if name.lower() not in excluded_headers]
-        
-        return Response(resp.content, status=resp.status_code, headers=headers)
+        # Body is forwarded as raw bytes, so JSON and form payloads pass through unchanged
+        resp = proxy_session.request(request.method, f"{BACKEND_URL}/{path}",
+                                     params=request.args.to_dict(flat=False),
+                                     data=request.get_data(),
+                                     headers=forward_request_headers(),
+                                     timeout=route_timeout(path),
+                                     allow_redirects=False,
+                                     stream=True)
         
+        # The body is relayed still encoded, so Content-Encoding and
+        # Content-Length stay valid; repeated headers like Set-Cookie are kept
+        headers = end_to_end_headers(resp.raw.headers.items())
+        return Response(stream_body(resp), status=resp.status_code, headers=headers, direct_passthrough=True)
+    
     except requests.exceptions.RequestException as e:
         print(f"Proxy error: {e}")
-        return """
-        <html><body>
-        <h2>Starting Income Machine...</h2>
-        <script>setTimeout(() => location.reload(), 3000);</script>
-        </body></html>
-        """
+        return STARTING_PAGE
 
 # Start Node.js on import
 start_nodejs()
\ No newline at end of file
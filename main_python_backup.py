@@ -3,53 +3,33 @@ Income Machine - Node.js Bridge
 Starts the Node.js server through the existing Python workflow
 """
 
-import subprocess
-import threading
-import time
+import os
+
 from flask import Flask, redirect
 
+from backend_supervisor import node_backend
+
 app = Flask(__name__)
 
-# Global variable to track Node.js process
-nodejs_process = None
+# Node.js server supervised with readiness probing and restart on exit; Flask
+# itself must listen elsewhere or the supervisor sees its own port as taken
+NODE_PORT = 5001
+FLASK_PORT = int(os.environ.get('FLASK_PORT', 5000))
+backend = node_backend(NODE_PORT)
 
 def start_nodejs_server():
     """Start the Node.js server in background"""
-    global nodejs_process
-    
     print("Starting Income Machine Node.js server...")
-    
-    try:
-        # Kill any existing Node.js processes
-        subprocess.run(['pkill', '-f', 'node main.js'], check=False)
-        time.sleep(1)
-        
-        # Start the Node.js server
-        nodejs_process = subprocess.Popen(
-            ['node', 'main.js'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            universal_newlines=True
-        )
-        
-        # Wait a moment and check if process started
-        time.sleep(2)
-        
-        if nodejs_process.poll() is None:
-            print("Node.js server started successfully on port 5001")
-        else:
-            stdout, stderr = nodejs_process.communicate()
-            print(f"Node.js server failed to start: {stderr}")
-        
-    except Exception as e:
-        print(f"Error starting Node.js server: {e}")
+    backend.start()
 
 @app.route('/')
 def index():
     """Serve the Node.js application directly"""
     try:
+        if backend.failure or not backend.wait_ready(5):
+            raise RuntimeError("Node.js server not ready")
         import requests
-        response = requests.get('http://localhost:5001', timeout=5)
+        response = requests.get(f'http://localhost:{NODE_PORT}', timeout=5)
         return response.text, response.status_code
     except:
         # If Node.js isn't responding, serve a basic redirect page
@@ -72,19 +52,17 @@ def index():
 def catch_all(path):
     """Proxy all requests to the Node.js server"""
     try:
+        if backend.failure or not backend.wait_ready(5):
+            raise RuntimeError("Node.js server not ready")
         import requests
-        response = requests.get(f'http://localhost:5001/{path}', timeout=5)
+        response = requests.get(f'http://localhost:{NODE_PORT}/{path}', timeout=5)
         return response.text, response.status_code
     except:
         return redirect('/', code=302)
 
 if __name__ == "__main__":
-    # Start Node.js server in background thread
-    nodejs_thread = threading.Thread(target=start_nodejs_server, daemon=True)
-    nodejs_thread.start()
-    
-    # Give Node.js time to start
-    time.sleep(2)
+    # Start Node.js server under the supervisor's background thread
+    start_nodejs_server()
     
     # Start Flask app (this satisfies the workflow requirement)
-    app.run(host='0.0.0.0', port=5001, debug=False)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=FLASK_PORT, debug=False)
\ No newline at end of file
@@ -0,0 +1,251 @@
+"""
+Scanner CSV Parser
+Streams typed records from 5-criteria scanner CSV exports
+(REAL_5_criteria_plus_options_*.csv and the older *_results_* snapshots),
+collecting malformed rows into a reject report instead of failing
+"""
+
+import csv
+import heapq
+from collections import Counter
+from datetime import datetime
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple, Any
+
+CRITERIA = ('trend1', 'trend2', 'snapback', 'momentum', 'stabilizing')
+
+# Older *_results_* snapshots use capitalized headers and a different name for the RSI reading
+HEADER_ALIASES = {'snapback_rsi': 'snapback_current'}
+
+REQUIRED_COLUMNS = ('symbol', 'current_price') + tuple(f'{name}_pass' for name in CRITERIA)
+
+_BOOLEANS = {'true': True, 'yes': True, 'false': False, 'no': False}
+
+class RejectedRow(Exception):
+    """A row that cannot be converted, with the reason"""
+
+def _parse_bool(value: str) -> bool:
+    result = _BOOLEANS.get(value)
+    if result is None:
+        result = _BOOLEANS.get(value.strip().lower())
+    if result is None:
+        raise RejectedRow(f"not a boolean: {value!r}")
+    return result
+
+def _field(row: List[str], index: int) -> str:
+    """Field at index, or empty for columns the file does not have (index -1)"""
+    return row[index] if index >= 0 else ''
+
+def _parse_float(value: str) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise RejectedRow(f"not a number: {value!r}")
+
+def _parse_count(value: str) -> int:
+    """Integer that may carry thousands separators; empty is 0"""
+    if not value:
+        return 0
+    if ',' in value:
+        value = value.replace(',', '')
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return int(float(value))
+        except ValueError:
+            raise RejectedRow(f"not an integer: {value!r}")
+
+def _parse_timestamp(value: str) -> Optional[datetime]:
+    """Timestamp, or None if empty or unparseable (the loader stamps rows itself)"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+class ScannerRecord:
+    """One typed scanner row
+    
+    passes, currents, thresholds and descriptions are tuples in CRITERIA
+    order. total_score is recomputed from the passes rather than trusted
+    from the export.
+    """
+    
+    __slots__ = ('symbol', 'current_price', 'avg_volume_10d', 'options_contracts',
+                 'passes', 'currents', 'thresholds', 'descriptions', 'calculation_timestamp')
+    
+    def __init__(self, symbol: str, current_price: float, avg_volume_10d: int, options_contracts: int,
+                 passes: Tuple[bool, ...], currents: Tuple[Optional[float], ...],
+                 thresholds: Tuple[Optional[float], ...], descriptions: Tuple[Optional[str], ...],
+                 calculation_timestamp: Optional[datetime]):
+        self.symbol = symbol
+        self.current_price = current_price
+        self.avg_volume_10d = avg_volume_10d
+        self.options_contracts = options_contracts
+        self.passes = passes
+        self.currents = currents
+        self.thresholds = thresholds
+        self.descriptions = descriptions
+        self.calculation_timestamp = calculation_timestamp
+    
+    @property
+    def total_score(self) -> int:
+        return sum(self.passes)
+    
+    def criteria(self) -> Iterator[Tuple[str, bool, Optional[float], Optional[float], Optional[str]]]:
+        """(name, passed, current, threshold, description) per criterion"""
+        return zip(CRITERIA, self.passes, self.currents, self.thresholds, self.descriptions)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'symbol': self.symbol,
+            'current_price': self.current_price,
+            'total_score': self.total_score,
+            'avg_volume_10d': self.avg_volume_10d,
+            'options_contracts_10_42_dte': self.options_contracts,
+            'calculation_timestamp': self.calculation_timestamp.isoformat() if self.calculation_timestamp else None
+        }
+        for name, passed, current, threshold, description in self.criteria():
+            data.update({f'{name}_pass': passed, f'{name}_current': current,
+                         f'{name}_threshold': threshold, f'{name}_description': description})
+        return data
+
+class RejectReport:
+    """Counts of rejected rows by reason plus the first max_samples of them
+    
+    Only a bounded sample is kept, so memory stays constant however many
+    rows a file rejects. Rows accepted with a field dropped are counted
+    separately as notes.
+    """
+    
+    def __init__(self, max_samples: int = 1000):
+        self.max_samples = max_samples
+        self.samples = []  # (path, line number, reason, raw row)
+        self.reasons = Counter()
+        self.total = 0
+        self.notes = Counter()
+    
+    def add(self, path: str, line: int, reason: str, row: Optional[List[str]] = None):
+        self.total += 1
+        self.reasons[reason.split(':', 1)[0]] += 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append((path, line, reason, row))
+    
+    def note(self, reason: str):
+        """Count a row that was kept but had a field dropped"""
+        self.notes[reason.split(':', 1)[0]] += 1
+    
+    def summary(self) -> str:
+        if not self.total:
+            summary = "No rejected rows"
+        else:
+            reasons = ', '.join(f"{reason} ({count})" for reason, count in self.reasons.most_common())
+            summary = f"Rejected {self.total} rows: {reasons}"
+        if self.notes:
+            notes = ', '.join(f"{reason} ({count})" for reason, count in self.notes.most_common())
+            summary += f"; kept rows with fields dropped: {notes}"
+        return summary
+    
+    def write(self, path: str):
+        """Write the sampled rejects as CSV: file, line, reason, then the raw fields"""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['file', 'line', 'reason', 'row'])
+            for file_path, line, reason, row in self.samples:
+                writer.writerow([file_path, line, reason] + list(row or []))
+
+class ScannerCSVParser:
+    """Lazily parse scanner CSV files into ScannerRecords
+    
+    The header is resolved to column positions once per file, so each row is
+    a list of index lookups and conversions with no per-row dicts.
+    """
+    
+    def __init__(self, rejects: Optional[RejectReport] = None):
+        self.rejects = rejects if rejects is not None else RejectReport()
+        self.rows = 0
+        self.parsed = 0
+    
+    @staticmethod
+    def resolve_header(header: List[str]) -> Dict[str, int]:
+        """Column positions by normalized, alias-resolved name"""
+        positions = {}
+        for index, name in enumerate(header):
+            name = name.strip().lower()
+            positions.setdefault(HEADER_ALIASES.get(name, name), index)
+        return positions
+    
+    def parse_file(self, path: str) -> Iterator[ScannerRecord]:
+        with open(path, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            positions = self.resolve_header(header)
+            missing = [column for column in REQUIRED_COLUMNS if column not in positions]
+            if missing:
+                self.rejects.add(path, 1, f"missing columns: {', '.join(missing)}")
+                return
+            
+            def column(name):
+                return positions.get(name, -1)
+            
+            width = len(header)
+            symbol_at, price_at = column('symbol'), column('current_price')
+            volume_at, contracts_at = column('avg_volume_10d'), column('options_contracts_10_42_dte')
+            timestamp_at = column('calculation_timestamp')
+            if timestamp_at < 0:
+                timestamp_at = column('calculation_time')
+            pass_at = [column(f'{name}_pass') for name in CRITERIA]
+            current_at = [column(f'{name}_current') for name in CRITERIA]
+            threshold_at = [column(f'{name}_threshold') for name in CRITERIA]
+            description_at = [column(f'{name}_description') for name in CRITERIA]
+            
+            for row in reader:
+                self.rows += 1
+                if not row:
+                    continue
+                if len(row) != width:
+                    self.rejects.add(path, reader.line_num, f"column count: expected {width}, got {len(row)}", row)
+                    continue
+                
+                try:
+                    symbol = row[symbol_at].strip()
+                    if not symbol:
+                        raise RejectedRow("missing symbol")
+                    price = _parse_float(row[price_at])
+                    if price is None:
+                        raise RejectedRow("missing current_price")
+                    record = ScannerRecord(
+                        symbol, price, _parse_count(_field(row, volume_at)), _parse_count(_field(row, contracts_at)),
+                        tuple(_parse_bool(row[index]) for index in pass_at),
+                        tuple(_parse_float(_field(row, index)) for index in current_at),
+                        tuple(_parse_float(_field(row, index)) for index in threshold_at),
+                        tuple(_field(row, index) or None for index in description_at),
+                        _parse_timestamp(_field(row, timestamp_at))
+                    )
+                except RejectedRow as e:
+                    self.rejects.add(path, reader.line_num, str(e), row)
+                    continue
+                
+                if record.calculation_timestamp is None and _field(row, timestamp_at):
+                    self.rejects.note(f"unparseable calculation_timestamp: {row[timestamp_at]!r}")
+                
+                self.parsed += 1
+                yield record
+    
+    def parse(self, paths: Iterable[str]) -> Iterator[ScannerRecord]:
+        """Records from every file in turn"""
+        for path in paths:
+            yield from self.parse_file(path)
+
+def iter_scanner_records(paths: Iterable[str], rejects: Optional[RejectReport] = None) -> Iterator[ScannerRecord]:
+    """Stream typed records from scanner CSV files, adding bad rows to rejects"""
+    return ScannerCSVParser(rejects).parse(paths)
+
+def top_scored(records: Iterable[ScannerRecord], n: int) -> List[ScannerRecord]:
+    """Top n records in etf_scores ranking order (score, then options contracts, then symbol)"""
+    return heapq.nsmallest(n, records, key=lambda record: (-record.total_score, -record.options_contracts, record.symbol))
@@ -0,0 +1,468 @@
+"""
+Offline Spread Analyzer Benchmark
+Records TheTradeList snapshot-locale, options-contracts and snapshot-options
+responses as fixtures and replays them through a local stand-in with simulated
+latency, timing the analyzer on small, medium and SPY-sized chains
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import zlib
+import random
+import logging
+import argparse
+import threading
+from datetime import date, timedelta
+from typing import List, Dict, Optional, Any, Callable
+
+from debit_spread_analyzer import (
+    DebitSpreadAnalyzer, OptionChain, LocalLRUCache, SessionSpreadStorage, UpstreamLimiter,
+    PooledHTTPClient, shared_http_client
+)
+
+logger = logging.getLogger(__name__)
+
+# Synthetic chain shapes: underlying price, expiration DTEs, strike step and
+# strike range as a fraction of price on either side
+CHAIN_SIZES = {
+    'small': {'price': 100.0, 'dtes': (12, 20, 35), 'strike_step': 1.0, 'strike_range': 0.15},
+    'medium': {'price': 250.0, 'dtes': tuple(range(7, 64, 7)), 'strike_step': 2.5, 'strike_range': 0.3},
+    # SPY-sized: dailies for 45 days, then monthlies out to two years
+    'huge': {'price': 560.0, 'dtes': tuple(range(1, 46)) + tuple(range(60, 731, 30)),
+             'strike_step': 1.0, 'strike_range': 0.18}
+}
+
+def _normal_cdf(x: float) -> float:
+    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+def _call_value(price: float, strike: float, years: float, volatility: float) -> float:
+    """Black-Scholes call value with zero rates"""
+    if years <= 0:
+        return max(0.0, price - strike)
+    d1 = (math.log(price / strike) + 0.5 * volatility * volatility * years) / (volatility * math.sqrt(years))
+    d2 = d1 - volatility * math.sqrt(years)
+    return price * _normal_cdf(d1) - strike * _normal_cdf(d2)
+
+def synthetic_fixture(symbol: str, size: str, today: Optional[date] = None, volatility: float = 0.25) -> Dict:
+    """Deterministic fixture for a synthetic chain of the given size"""
+    shape = CHAIN_SIZES[size]
+    today = today or date.today()
+    price = shape['price']
+    steps = int(price * shape['strike_range'] / shape['strike_step'])
+    strikes = [round(price + i * shape['strike_step'], 2) for i in range(-steps, steps + 1)]
+    
+    contracts = []
+    quotes = {}
+    # Weekend expirations roll back to Friday
+    expirations = sorted({
+        expiration - timedelta(days=max(0, expiration.weekday() - 4))
+        for expiration in (today + timedelta(days=dte + 1) for dte in shape['dtes'])
+    })
+    for expiration in expirations:
+        dte = (expiration - today).days
+        expiration_str = expiration.isoformat()
+        for strike in strikes:
+            for option_type in ('call', 'put'):
+                ticker = f"{symbol}{expiration.strftime('%y%m%d')}{option_type[0].upper()}{int(strike * 1000):08d}"
+                contracts.append({
+                    'ticker': ticker,
+                    'strike_price': strike,
+                    'expiration_date': expiration_str,
+                    'option_type': option_type,
+                    'underlying_ticker': symbol
+                })
+                
+                value = _call_value(price, strike, dte / 365, volatility)
+                if option_type == 'put':
+                    value += strike - price
+                value = max(0.01, value) + (zlib.crc32(ticker.encode()) % 100) / 1000
+                half_spread = max(0.01, value * 0.02)
+                quotes[f"O:{ticker}"] = {
+                    'name': f"O:{ticker}",
+                    'bid': round(max(0.01, value - half_spread), 2),
+                    'ask': round(value + half_spread, 2),
+                    'last_trade': {'price': round(value, 2)}
+                }
+    
+    return {
+        'symbol': symbol,
+        'recorded_on': today.isoformat(),
+        'price': {'ticker': symbol, 'fmv': price},
+        'contracts': contracts,
+        'quotes': quotes
+    }
+
+class FixtureStore:
+    """Per-underlying TheTradeList responses, one JSON file per symbol
+    
+    Each fixture holds the snapshot-locale ticker entry, the options-contracts
+    results and every snapshot-options result keyed by its "O:" name, so the
+    stand-in can answer any batching of the same requests.
+    """
+    
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self.fixtures = {}
+        self.underlying_by_contract = {}
+        self.lock = threading.Lock()
+    
+    def path(self, symbol: str) -> str:
+        return os.path.join(self.directory, f"{symbol}.json")
+    
+    def add(self, fixture: Dict):
+        with self.lock:
+            self.fixtures[fixture['symbol']] = fixture
+            for contract in fixture.get('contracts', []):
+                self.underlying_by_contract[f"O:{contract['ticker']}"] = fixture['symbol']
+    
+    def fixture(self, symbol: str) -> Dict:
+        """Fixture for symbol, created empty on first use while recording"""
+        with self.lock:
+            fixture = self.fixtures.get(symbol)
+            if fixture is None:
+                fixture = self.fixtures[symbol] = {
+                    'symbol': symbol, 'recorded_on': date.today().isoformat(),
+                    'price': None, 'contracts': [], 'quotes': {}
+                }
+            return fixture
+    
+    def load(self) -> List[str]:
+        """Load every fixture in the directory and return their symbols"""
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith('.json'):
+                with open(os.path.join(self.directory, name)) as f:
+                    self.add(json.load(f))
+        return sorted(self.fixtures)
+    
+    def save(self):
+        """Write every fixture to the directory"""
+        os.makedirs(self.directory, exist_ok=True)
+        with self.lock:
+            fixtures = list(self.fixtures.values())
+        for fixture in fixtures:
+            with open(self.path(fixture['symbol']), 'w') as f:
+                json.dump(fixture, f)
+        logger.info(f"Saved {len(fixtures)} fixtures to {self.directory}")
+    
+    def record(self, endpoint: str, params: Dict, data: Any):
+        """Merge a successful upstream response into the fixtures"""
+        if endpoint == 'snapshot-locale' and data.get('status') == 'OK':
+            for ticker_data in data.get('tickers') or []:
+                self.fixture(ticker_data.get('ticker'))['price'] = ticker_data
+        elif endpoint == 'options-contracts' and data.get('status') == 'OK':
+            fixture = self.fixture(params['underlying_ticker'])
+            fixture['contracts'] = data.get('results') or []
+            self.add(fixture)
+        elif endpoint == 'snapshot-options' and data.get('status') == 'OK':
+            for result in data.get('results') or []:
+                symbol = self.underlying_by_contract.get(result.get('name'))
+                if symbol:
+                    self.fixture(symbol)['quotes'][result['name']] = result
+
+class FixtureResponse:
+    """Minimal requests.Response stand-in"""
+    
+    def __init__(self, data: Any, status_code: int = 200):
+        self._data = data
+        self.status_code = status_code
+        self.headers = {}
+    
+    def json(self) -> Any:
+        return self._data
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+class RecordingHTTPClient:
+    """Pass-through client that records TheTradeList responses into a FixtureStore"""
+    
+    def __init__(self, store: FixtureStore, http_client: Optional[PooledHTTPClient] = None):
+        self.store = store
+        self.http = http_client or shared_http_client
+    
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            timeout: Optional[float] = None):
+        response = self.http.get(url, params=params, headers=headers, timeout=timeout)
+        if response.status_code == 200:
+            try:
+                self.store.record(url.rsplit('/', 1)[-1], params or {}, response.json())
+            except Exception as e:
+                logger.warning(f"Could not record {url}: {e}")
+        return response
+    
+    def post(self, url: str, json: Any = None, data: Any = None, headers: Optional[Dict] = None,
+             timeout: Optional[float] = None):
+        return self.http.post(url, json=json, data=data, headers=headers, timeout=timeout)
+
+class ReplayHTTPClient:
+    """Local TheTradeList stand-in serving fixtures with simulated latency
+    
+    Expirations are shifted by the days since a fixture was recorded so DTE
+    windows select the same contracts as on the recording day. Calls are
+    counted per endpoint, plus the contracts requested from snapshot-options.
+    """
+    
+    def __init__(self, store: FixtureStore, latency_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0):
+        self.store = store
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.shifted = {}
+    
+    def call_counts(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.calls)
+    
+    def _count(self, name: str, value: int = 1):
+        with self.lock:
+            self.calls[name] = self.calls.get(name, 0) + value
+    
+    def _sleep(self):
+        if self.latency or self.jitter:
+            with self.lock:
+                delay = self.latency + self.random.uniform(0, self.jitter)
+            time.sleep(delay)
+    
+    def _contracts(self, symbol: str) -> List[Dict]:
+        """Fixture contracts with expirations moved forward to today"""
+        contracts = self.shifted.get(symbol)
+        if contracts is None:
+            fixture = self.store.fixtures[symbol]
+            offset = timedelta(days=(date.today() - date.fromisoformat(fixture['recorded_on'])).days)
+            contracts = fixture['contracts']
+            if offset:
+                contracts = [
+                    dict(contract, expiration_date=(date.fromisoformat(contract['expiration_date']) + offset).isoformat())
+                    for contract in contracts
+                ]
+            self.shifted[symbol] = contracts
+        return contracts
+    
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            timeout: Optional[float] = None) -> FixtureResponse:
+        params = params or {}
+        endpoint = url.rsplit('/', 1)[-1]
+        self._count(endpoint)
+        self._sleep()
+        fixtures = self.store.fixtures
+        
+        if endpoint == 'snapshot-locale':
+            symbols = [symbol for symbol in params.get('tickers', '').split(',') if symbol]
+            tickers = [fixtures[symbol]['price'] for symbol in symbols
+                       if symbol in fixtures and fixtures[symbol].get('price')]
+            return FixtureResponse({'status': 'OK', 'tickers': tickers})
+        if endpoint == 'options-contracts':
+            symbol = params.get('underlying_ticker')
+            if symbol not in fixtures:
+                return FixtureResponse({'status': 'OK', 'results': []})
+            return FixtureResponse({'status': 'OK', 'results': self._contracts(symbol)})
+        if endpoint == 'snapshot-options':
+            names = [name for name in params.get('tickers', '').split(',') if name]
+            self._count('snapshot-options:contracts', len(names))
+            results = []
+            for name in names:
+                symbol = self.store.underlying_by_contract.get(name)
+                quote = symbol and fixtures[symbol]['quotes'].get(name)
+                if quote:
+                    results.append(quote)
+            return FixtureResponse({'status': 'OK', 'results': results})
+        if endpoint == 'get_trader_scanner_data.php':
+            return FixtureResponse([{'symbol': symbol, 'stock_price': fixture['price']['fmv']}
+                                    for symbol, fixture in fixtures.items() if fixture.get('price')])
+        return FixtureResponse({'status': 'ERROR'}, 404)
+    
+    def post(self, url: str, json: Any = None, data: Any = None, headers: Optional[Dict] = None,
+             timeout: Optional[float] = None):
+        # Only Upstash uses POST; the benchmark keeps Redis on the real network when enabled
+        return shared_http_client.post(url, json=json, data=data, headers=headers, timeout=timeout)
+
+def build_analyzer(http_client, use_redis: bool = False, rate_limited: bool = False) -> DebitSpreadAnalyzer:
+    """Analyzer wired to the stand-in with in-process storage
+    
+    Redis is disabled unless requested so runs are reproducible, and the
+    limiter is unconstrained unless rate_limited so it measures the analyzer
+    rather than the production admission rate.
+    """
+    limiter = UpstreamLimiter() if rate_limited else UpstreamLimiter(
+        rate_per_second=1e9, burst=10**9, initial_limit=10**6, max_limit=10**6)
+    analyzer = DebitSpreadAnalyzer(http_client=http_client, spread_storage=SessionSpreadStorage(), limiter=limiter)
+    if not use_redis:
+        analyzer.cache_service.cache_enabled = False
+        analyzer.cache_service.native = None
+    return analyzer
+
+def reset_caches(analyzer: DebitSpreadAnalyzer):
+    """Drop every in-process cache entry so the next call starts cold"""
+    analyzer.cache_service.local_cache = LocalLRUCache()
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def run_case(name: str, size: str, fn: Callable[[], Any], iterations: int, client: ReplayHTTPClient,
+             before: Optional[Callable[[], None]] = None, warmup: int = 1) -> Dict:
+    """Time fn over iterations and summarize latency, throughput and upstream calls"""
+    for _ in range(warmup):
+        if before:
+            before()
+        fn()
+    
+    calls_before = client.call_counts()
+    timings = []
+    busy = 0.0
+    for _ in range(iterations):
+        if before:
+            before()
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        timings.append(elapsed)
+        busy += elapsed
+    calls_after = client.call_counts()
+    
+    timings.sort()
+    upstream = {
+        endpoint: round((calls_after.get(endpoint, 0) - calls_before.get(endpoint, 0)) / iterations, 2)
+        for endpoint in sorted(calls_after)
+        if calls_after.get(endpoint, 0) != calls_before.get(endpoint, 0)
+    }
+    return {
+        'case': name,
+        'size': size,
+        'iterations': iterations,
+        'throughput_per_second': round(iterations / busy, 2) if busy else 0.0,
+        'mean_ms': round(busy / iterations * 1000, 3),
+        'p50_ms': round(percentile(timings, 0.50) * 1000, 3),
+        'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+        'upstream_calls_per_op': upstream
+    }
+
+def benchmark_symbol(analyzer: DebitSpreadAnalyzer, client: ReplayHTTPClient, symbol: str, size: str,
+                     iterations: int) -> List[Dict]:
+    """Run every benchmark case against one fixture symbol"""
+    price = float(client.store.fixtures[symbol]['price']['fmv'])
+    reset_caches(analyzer)
+    
+    # Strategy-filtered contract lists, as the legacy pair generator consumed them
+    chain = OptionChain(client._contracts(symbol))
+    filtered = [[contract.to_dict() for contract in analyzer.filter_chain_by_strategy(chain, strategy, price)]
+                for strategy in analyzer.strategies]
+    
+    cold = lambda: reset_caches(analyzer)
+    return [
+        run_case('analyze_ticker[cold]', size, lambda: analyzer.analyze_ticker(symbol), iterations, client, before=cold),
+        run_case('analyze_ticker[warm]', size, lambda: analyzer.analyze_ticker(symbol), iterations, client),
+        run_case('find_best_spreads[cold]', size, lambda: analyzer.find_best_spreads(symbol, price), iterations, client,
+                 before=cold),
+        run_case('generate_spread_pairs', size,
+                 lambda: [analyzer.generate_spread_pairs(contracts) for contracts in filtered], iterations, client)
+    ]
+
+def compare_to_baseline(results: List[Dict], baseline: List[Dict], max_regression: float) -> List[str]:
+    """Cases whose p50 or upstream calls grew more than max_regression over the baseline"""
+    previous = {(result['case'], result['size']): result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result['case'], result['size']))
+        if not before:
+            continue
+        if before['p50_ms'] and result['p50_ms'] > before['p50_ms'] * (1 + max_regression):
+            regressions.append(f"{result['case']} [{result['size']}] p50 {before['p50_ms']}ms -> {result['p50_ms']}ms")
+        calls_before = sum(before['upstream_calls_per_op'].values())
+        calls_after = sum(result['upstream_calls_per_op'].values())
+        if calls_after > calls_before * (1 + max_regression):
+            regressions.append(f"{result['case']} [{result['size']}] upstream calls {calls_before} -> {calls_after}")
+    return regressions
+
+def format_results(results: List[Dict]) -> str:
+    """Results as a fixed-width table"""
+    lines = [f"{'case':<26}{'size':<10}{'ops/s':>10}{'p50 ms':>12}{'p99 ms':>12}  upstream calls/op"]
+    for result in results:
+        calls = ', '.join(f"{endpoint}={count}" for endpoint, count in result['upstream_calls_per_op'].items()) or '-'
+        lines.append(f"{result['case']:<26}{result['size']:<10}{result['throughput_per_second']:>10}"
+                     f"{result['p50_ms']:>12}{result['p99_ms']:>12}  {calls}")
+    return '\n'.join(lines)
+
+def record_fixtures(directory: str, tickers: List[str]):
+    """Analyze tickers against the live API and save what they fetched as fixtures"""
+    store = FixtureStore(directory)
+    analyzer = build_analyzer(RecordingHTTPClient(store))
+    for ticker in tickers:
+        result = analyzer.analyze_ticker(ticker)
+        logger.warning(f"Recorded {ticker}: success={result.get('success')}")
+    store.save()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Offline debit spread analyzer benchmark')
+    parser.add_argument('--sizes', default='small,medium,huge', help='Synthetic chain sizes to run')
+    parser.add_argument('--fixtures', help='Replay recorded fixtures from this directory instead of synthetic chains')
+    parser.add_argument('--record', nargs='+', metavar='TICKER',
+                        help='Record live responses for these tickers into --fixtures (needs TRADELIST_API_KEY)')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=float(os.environ.get('BENCHMARK_LATENCY_MS', 0)),
+                        help='Simulated upstream latency per call')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Uniform random latency added per call')
+    parser.add_argument('--redis', action='store_true', help='Keep the configured Redis tier enabled')
+    parser.add_argument('--rate-limited', action='store_true', help='Use the production upstream limiter settings')
+    parser.add_argument('--json', dest='json_path', help='Write results as JSON to this file')
+    parser.add_argument('--baseline', help='Compare against a previous --json results file')
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='Allowed fractional p50/upstream call growth over the baseline')
+    parser.add_argument('--verbose', action='store_true', help='Keep analyzer INFO logging')
+    args = parser.parse_args(argv)
+    
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    
+    if args.record:
+        if not args.fixtures:
+            parser.error('--record needs --fixtures')
+        record_fixtures(args.fixtures, [ticker.upper() for ticker in args.record])
+        return 0
+    
+    store = FixtureStore(args.fixtures)
+    if args.fixtures:
+        cases = [(symbol, 'recorded') for symbol in store.load()]
+    else:
+        cases = []
+        for size in (size.strip() for size in args.sizes.split(',') if size.strip()):
+            if size not in CHAIN_SIZES:
+                parser.error(f"unknown size {size!r}, expected one of {', '.join(CHAIN_SIZES)}")
+            symbol = f"BENCH{size.upper()}"
+            store.add(synthetic_fixture(symbol, size))
+            cases.append((symbol, size))
+    
+    client = ReplayHTTPClient(store, args.latency_ms, args.jitter_ms)
+    analyzer = build_analyzer(client, use_redis=args.redis, rate_limited=args.rate_limited)
+    
+    results = []
+    for symbol, size in cases:
+        contracts = len(store.fixtures[symbol]['contracts'])
+        print(f"Benchmarking {symbol} ({size}, {contracts} contracts, {args.latency_ms}ms latency)", file=sys.stderr)
+        results.extend(benchmark_symbol(analyzer, client, symbol, size, args.iterations))
+    print(format_results(results))
+    
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(results, json.load(f), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
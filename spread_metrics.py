@@ -0,0 +1,157 @@
+"""
+Spread Analyzer Metrics
+Low-overhead counters and histograms rendered in the Prometheus text exposition format
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Latency buckets in seconds, from cache hits up to the slowest upstream timeouts
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def _format_labels(label_key: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(label_key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+class Counter:
+    """Monotonic counter family keyed by label values"""
+    
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, value: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines.extend(f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in values)
+        return lines
+
+class Histogram:
+    """Fixed-bucket histogram family keyed by label values
+    
+    Each observation is one bisect and a few additions under a lock, so it is
+    cheap enough to leave on for every request.
+    """
+    
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label key -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+    
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the wall time of the enclosed block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), values[:-1]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {values[-1]!r}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """Named counters and histograms plus collectors sampled at scrape time
+    
+    Collectors return (name, type, help, samples) tuples, where samples is a
+    list of (labels, value), for state that is already counted elsewhere and
+    only needs exporting (cache tiers, limiter, storage).
+    """
+    
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+    
+    def counter(self, name: str, help_text: str) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, help_text))
+    
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, help_text, buckets))
+    
+    def register_collector(self, collector: Callable[[], List[Tuple[str, str, str, List[Tuple[Dict, float]]]]]):
+        with self._lock:
+            self._collectors.append(collector)
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            for name, metric_type, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.extend(f"{name}{_format_labels(_label_key(labels))} {_format_value(value)}"
+                             for labels, value in samples)
+        return '\n'.join(lines) + '\n'
+
+# Process-wide registry
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram(
+    'spread_analysis_stage_seconds', 'Time spent in each analysis stage')
+ANALYSIS_SECONDS = metrics.histogram(
+    'spread_analysis_seconds', 'End-to-end analysis time by outcome')
+UPSTREAM_SECONDS = metrics.histogram(
+    'tradelist_request_seconds', 'TheTradeList request latency by endpoint')
+UPSTREAM_REQUESTS = metrics.counter(
+    'tradelist_requests_total', 'TheTradeList requests by endpoint and status')
+LIMITER_WAIT_SECONDS = metrics.histogram(
+    'tradelist_limiter_wait_seconds', 'Time calls waited for rate limiter admission')
+REDIS_SECONDS = metrics.histogram(
+    'spread_redis_pipeline_seconds', 'Redis round trip latency by transport')
+PAIRS_EVALUATED = metrics.counter(
+    'spread_pairs_evaluated_total', 'Spread pairs priced by the width search')
+QUOTES_REQUESTED = metrics.counter(
+    'spread_quotes_requested_total', 'Option quotes requested by the width search')
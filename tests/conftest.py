@@ -0,0 +1,59 @@
+"""Shared fixtures: a fake monotonic clock and Redis-backed cache services over fake transports"""
+
+import pytest
+
+import debit_spread_analyzer
+from debit_spread_analyzer import PooledHTTPClient, RedisCacheService
+from redis_fakes import FakeNativeRedis, FakeRedis, FakeUpstashServer
+
+@pytest.fixture(autouse=True)
+def no_redis_env(monkeypatch):
+    for name in ('REDIS_URL', 'UPSTASH_REDIS_REST_URL', 'UPSTASH_REDIS_REST_TOKEN', 'SPREAD_STORAGE_BACKEND'):
+        monkeypatch.delenv(name, raising=False)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+    
+    def advance(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(debit_spread_analyzer.time, 'monotonic', clock)
+    return clock
+
+@pytest.fixture
+def redis_store():
+    return FakeRedis()
+
+@pytest.fixture
+def upstash_server(redis_store):
+    with FakeUpstashServer(redis_store) as server:
+        yield server
+
+@pytest.fixture(params=['native', 'upstash'])
+def transport(request, redis_store, monkeypatch):
+    """(make_service, fail) for each Redis transport; fail(True) breaks the pipeline"""
+    if request.param == 'native':
+        client = FakeNativeRedis(redis_store)
+        
+        def fail(failing=True):
+            client.fail = failing
+        
+        yield (lambda: RedisCacheService(redis_client=client)), fail
+    else:
+        with FakeUpstashServer(redis_store) as server:
+            monkeypatch.setenv('UPSTASH_REDIS_REST_URL', server.url)
+            monkeypatch.setenv('UPSTASH_REDIS_REST_TOKEN', server.token)
+            http = PooledHTTPClient()
+            
+            def fail(failing=True):
+                server.fail_status = 503 if failing else None
+            
+            yield (lambda: RedisCacheService(http_client=http)), fail
+            http.close()
@@ -0,0 +1,147 @@
+"""In-memory Redis plus fake native and Upstash REST transports for cache tests"""
+
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeRedis:
+    """Dict-backed Redis subset (GET, MGET, SET [EX], TTL, DEL, PING) with expiry"""
+    
+    def __init__(self):
+        self.values = {}
+        self.expires = {}
+        self.commands = []
+        self.lock = threading.Lock()
+    
+    def _live(self, key):
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.values
+    
+    def execute(self, command):
+        """Run one command; raises ValueError for unsupported or malformed commands"""
+        name, args = str(command[0]).upper(), list(command[1:])
+        with self.lock:
+            self.commands.append([name] + args)
+            if name == 'PING':
+                return 'PONG'
+            if name == 'GET':
+                return self.values[args[0]] if self._live(args[0]) else None
+            if name == 'MGET':
+                return [self.values[key] if self._live(key) else None for key in args]
+            if name == 'SET':
+                key, value = args[0], args[1]
+                self.values[key] = value
+                self.expires.pop(key, None)
+                if len(args) >= 4 and str(args[2]).upper() == 'EX':
+                    self.expires[key] = time.monotonic() + int(args[3])
+                return 'OK'
+            if name == 'TTL':
+                if not self._live(args[0]):
+                    return -2
+                expires_at = self.expires.get(args[0])
+                return -1 if expires_at is None else max(0, round(expires_at - time.monotonic()))
+            if name == 'DEL':
+                removed = sum(1 for key in args if self._live(key))
+                for key in args:
+                    self.values.pop(key, None)
+                    self.expires.pop(key, None)
+                return removed
+        raise ValueError(f"ERR unknown command '{name}'")
+    
+    def set_raw(self, key, value, ttl=None):
+        with self.lock:
+            self.values[key] = value
+            if ttl is not None:
+                self.expires[key] = time.monotonic() + ttl
+    
+    def round_trips(self, name):
+        return sum(1 for command in self.commands if command[0] == name)
+
+class FakeNativePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.queued = []
+    
+    def execute_command(self, *command):
+        self.queued.append(command)
+    
+    def execute(self, raise_on_error=True):
+        if self.client.fail:
+            raise ConnectionError("fake redis unavailable")
+        self.client.pipelines += 1
+        results = []
+        for command in self.queued:
+            try:
+                result = self.client.store.execute(command)
+                results.append(True if result == 'OK' else result)
+            except ValueError as e:
+                if raise_on_error:
+                    raise
+                results.append(e)
+        return results
+
+class FakeNativeRedis:
+    """Stands in for redis.Redis(decode_responses=True) pipelines"""
+    
+    def __init__(self, store=None):
+        self.store = store or FakeRedis()
+        self.fail = False
+        self.pipelines = 0
+    
+    def pipeline(self, transaction=True):
+        return FakeNativePipeline(self)
+
+class FakeUpstashServer:
+    """Local HTTP server implementing the Upstash REST /pipeline endpoint"""
+    
+    def __init__(self, store=None, token='test-token'):
+        self.store = store or FakeRedis()
+        self.token = token
+        self.fail_status = None
+        self.requests = 0
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+            
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                server.requests += 1
+                if server.fail_status:
+                    return self.reply(server.fail_status, {'error': 'unavailable'})
+                if self.path != '/pipeline':
+                    return self.reply(404, {'error': 'not found'})
+                if self.headers.get('Authorization') != f'Bearer {server.token}':
+                    return self.reply(401, {'error': 'Unauthorized'})
+                results = []
+                for command in json.loads(body):
+                    try:
+                        results.append({'result': server.store.execute(command)})
+                    except ValueError as e:
+                        results.append({'error': str(e)})
+                self.reply(200, results)
+            
+            def reply(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+        
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+    
+    def __enter__(self):
+        self.thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,46 @@
+"""analyze_many streaming: completion order and early-exit cancellation"""
+
+import threading
+import time
+
+import pytest
+
+from spread_benchmark import FixtureStore, ReplayHTTPClient, build_analyzer
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    analyzer = build_analyzer(ReplayHTTPClient(FixtureStore()))
+    analyzer.bulk_concurrency = 2
+    analyzer.bulk_semaphore = threading.BoundedSemaphore(2)
+    monkeypatch.setattr(analyzer, 'get_real_time_stock_prices', lambda tickers: {})
+    return analyzer
+
+def test_yields_every_ticker_once(analyzer, monkeypatch):
+    monkeypatch.setattr(analyzer, 'analyze_ticker', lambda ticker: {'success': ticker != 'BAD'})
+    results = list(analyzer.analyze_many(['aaa', 'BBB', 'AAA', 'BAD', ' ']))
+    assert sorted((result['ticker'], result['success']) for result in results) == [
+        ('AAA', True), ('BAD', False), ('BBB', True)
+    ]
+
+def test_closing_the_stream_cancels_pending_tickers(analyzer, monkeypatch):
+    release = threading.Event()
+    started = []
+    
+    def analyze_ticker(ticker):
+        started.append(ticker)
+        if ticker != 'T0':
+            release.wait(5)
+        return {'success': True}
+    
+    monkeypatch.setattr(analyzer, 'analyze_ticker', analyze_ticker)
+    stream = analyzer.analyze_many([f'T{index}' for index in range(50)])
+    assert next(stream)['ticker'] == 'T0'
+    
+    began = time.monotonic()
+    stream.close()
+    assert time.monotonic() - began < 1
+    
+    release.set()
+    time.sleep(0.2)
+    # Only tickers already running when the client went away were analyzed
+    assert len(started) <= 4
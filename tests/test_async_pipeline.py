@@ -0,0 +1,49 @@
+"""Asyncio pipeline against the replayed TheTradeList stand-in"""
+
+import asyncio
+
+import pytest
+
+import async_debit_spread_analyzer
+from async_debit_spread_analyzer import AsyncDebitSpreadAnalyzer, AsyncHTTPClient
+from spread_benchmark import FixtureStore, ReplayHTTPClient, build_analyzer, synthetic_fixture
+
+@pytest.fixture
+def store(monkeypatch):
+    # The requests fallback lets the replay client stand in for upstream
+    monkeypatch.setattr(async_debit_spread_analyzer, 'httpx', None)
+    store = FixtureStore()
+    store.add(synthetic_fixture('AAA', 'medium'))
+    return store
+
+def async_pipeline(store):
+    http = ReplayHTTPClient(store)
+    return AsyncDebitSpreadAnalyzer(build_analyzer(http), AsyncHTTPClient(http)), http
+
+def test_async_analysis_matches_the_sync_analyzer(store):
+    sync_http = ReplayHTTPClient(store)
+    expected = build_analyzer(sync_http).analyze_ticker('AAA')
+    pipeline, http = async_pipeline(store)
+    result = pipeline.run(pipeline.analyze_ticker('AAA'))
+    
+    assert result['success'] and result['strategies_found'] == 3
+    assert result['strategies'] == expected['strategies']
+    calls = http.call_counts()
+    assert calls['options-contracts'] == 1 and calls['snapshot-locale'] == 1
+    assert calls['snapshot-options:contracts'] == sync_http.call_counts()['snapshot-options:contracts']
+
+def test_concurrent_analyses_of_one_ticker_share_a_run(store):
+    pipeline, http = async_pipeline(store)
+    
+    async def analyze():
+        return await asyncio.gather(*[pipeline.analyze_ticker(ticker) for ticker in ('AAA', 'aaa', ' AAA ')])
+    
+    results = pipeline.run(analyze())
+    assert results[0] is results[1] is results[2]
+    assert http.call_counts()['options-contracts'] == 1
+
+def test_unknown_ticker_reports_no_price(store):
+    pipeline, http = async_pipeline(store)
+    result = pipeline.run(pipeline.analyze_ticker('ZZZ'))
+    assert result == {'success': False, 'error': 'Unable to fetch current price for ZZZ'}
+    assert 'options-contracts' not in http.call_counts()
@@ -0,0 +1,121 @@
+"""BackendSupervisor readiness, bind conflicts and one-supervisor-per-host locking"""
+
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from backend_supervisor import BackendSupervisor
+
+# Serves /health with its own PID (or a fixed one, to impersonate another process)
+BACKEND = """
+import json, os, sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+class Health(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+    
+    def do_GET(self):
+        body = json.dumps({'status': 'healthy', 'pid': int(sys.argv[2]) or os.getpid()}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+HTTPServer(('127.0.0.1', int(sys.argv[1])), Health).serve_forever()
+"""
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def port():
+    return free_port()
+
+def supervisor(port, tmp_path, reported_pid=0, **kwargs):
+    options = dict(startup_timeout=10, lock_path=str(tmp_path / 'backend.lock'), follow_interval=0.1)
+    options.update(kwargs)
+    return BackendSupervisor([sys.executable, '-c', BACKEND, str(port), str(reported_pid)], port, **options)
+
+@pytest.fixture
+def foreign_listener(port):
+    """Unrelated HTTP server already bound to the backend port"""
+    
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+        
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'ok')
+    
+    server = HTTPServer(('127.0.0.1', port), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_ready_once_health_reports_the_child_pid(port, tmp_path):
+    backend = supervisor(port, tmp_path)
+    backend.start()
+    try:
+        assert backend.wait_ready(10)
+        stats = backend.stats()
+        assert stats['owner'] and stats['pid'] == backend.process.pid
+        assert backend.probe(pid=backend.process.pid)
+        assert not backend.probe(pid=backend.process.pid + 1)
+    finally:
+        backend.stop()
+    assert backend.process.poll() is not None
+
+def test_child_reporting_another_pid_is_never_ready(port, tmp_path):
+    backend = supervisor(port, tmp_path, reported_pid=1, startup_timeout=1)
+    backend.start()
+    try:
+        assert not backend.wait_ready(1.5)
+    finally:
+        backend.stop()
+
+def test_port_held_by_another_process_fails_fast(port, tmp_path, foreign_listener):
+    backend = supervisor(port, tmp_path)
+    backend.start()
+    backend.thread.join(10)
+    try:
+        assert not backend.thread.is_alive()
+        assert not backend.is_ready()
+        assert backend.process is None
+        assert 'in use' in backend.stats()['failure']
+    finally:
+        backend.stop()
+
+def test_one_supervisor_per_host_and_followers_share_readiness(port, tmp_path):
+    owner = supervisor(port, tmp_path)
+    follower = supervisor(port, tmp_path)
+    owner.start()
+    try:
+        assert owner.wait_ready(10)
+        follower.start()
+        assert follower.wait_ready(5)
+        assert follower.process is None and not follower.stats()['owner']
+        assert follower.stats()['pid'] == owner.process.pid
+        
+        # The follower takes over when the owner goes away
+        owner.stop()
+        deadline = time.monotonic() + 10
+        while follower.process is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert follower.stats()['owner']
+        assert follower.wait_ready(10) and follower.probe(pid=follower.process.pid)
+    finally:
+        follower.stop()
+        owner.stop()
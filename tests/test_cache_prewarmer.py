@@ -0,0 +1,57 @@
+"""CachePrewarmer refresh selection and upstream budget accounting"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from cache_prewarmer import CachePrewarmer
+from spread_benchmark import FixtureStore, ReplayHTTPClient, build_analyzer, synthetic_fixture
+
+@pytest.fixture
+def upstream():
+    store = FixtureStore()
+    store.add(synthetic_fixture('AAA', 'small'))
+    store.add(synthetic_fixture('BBB', 'small'))
+    return ReplayHTTPClient(store)
+
+@pytest.fixture
+def prewarmer(upstream, monkeypatch):
+    monkeypatch.setenv('PREWARM_TICKERS', 'AAA,BBB')
+    return CachePrewarmer(analyzer=build_analyzer(upstream), calls_per_minute=10000)
+
+def test_interval_and_margin_derive_from_soft_ttl(prewarmer):
+    assert prewarmer.interval_seconds == 15
+    assert prewarmer.refresh_margin == 7.5
+    
+    def entry(fresh_in):
+        return {'fresh_until': (datetime.now(timezone.utc) + timedelta(seconds=fresh_in)).isoformat()}
+    
+    # Refreshed at the previous pass: still fresh for most of a soft TTL
+    assert not prewarmer.needs_refresh(entry(30 - prewarmer.interval_seconds))
+    assert prewarmer.needs_refresh(entry(5))
+    assert prewarmer.needs_refresh(None)
+
+def test_second_pass_only_refetches_what_is_stale(prewarmer, upstream):
+    first = prewarmer.run_once()
+    assert first['chains'] == 2 and first['quotes'] > 0
+    assert first['upstream_calls'] == sum(upstream.call_counts().get(endpoint, 0) for endpoint in
+                                          ('snapshot-locale', 'options-contracts', 'snapshot-options'))
+    
+    calls_before = upstream.call_counts()
+    second = prewarmer.run_once()
+    assert second['upstream_calls'] == 0
+    assert (second['chains'], second['quotes']) == (0, 0)
+    assert upstream.call_counts() == calls_before
+
+def test_rolled_over_chain_is_charged(prewarmer, upstream):
+    prewarmer.run_once()
+    
+    # Cached chain whose front expiration has passed
+    cache = prewarmer.analyzer.cache_service
+    expired = (date.today() - timedelta(days=3)).isoformat()
+    cache.cache_data('options_chain:AAA', [['AAA_OLD', 100.0, expired, 'call']], 3600)
+    
+    result = prewarmer.run_once()
+    assert result['chains'] == 1
+    assert result['upstream_calls'] == 1
+    assert prewarmer.analyzer.get_cached_option_chain('AAA').is_current()
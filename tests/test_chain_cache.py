@@ -0,0 +1,49 @@
+"""Parsed option chains cached per underlying with their own TTL"""
+
+from datetime import date, timedelta
+
+from spread_benchmark import FixtureStore, ReplayHTTPClient, build_analyzer, synthetic_fixture
+
+def replay():
+    store = FixtureStore()
+    store.add(synthetic_fixture('AAA', 'small'))
+    http = ReplayHTTPClient(store)
+    return build_analyzer(http), http
+
+def test_chain_is_fetched_once_and_served_from_cache(clock):
+    analyzer, http = replay()
+    chain = analyzer.get_option_chain('AAA')
+    cached = analyzer.get_option_chain('AAA')
+    
+    assert http.call_counts() == {'options-contracts': 1}
+    assert cached is not chain and cached.size == chain.size
+    assert sorted(map(tuple, cached.to_compact())) == sorted(map(tuple, chain.to_compact()))
+
+def test_chain_expires_after_contracts_cache_ttl(clock, monkeypatch):
+    monkeypatch.setenv('CONTRACTS_CACHE_TTL', '600')
+    analyzer, http = replay()
+    assert analyzer.contracts_cache_ttl == 600
+    analyzer.get_option_chain('AAA')
+    
+    clock.advance(599)
+    analyzer.get_option_chain('AAA')
+    assert http.call_counts() == {'options-contracts': 1}
+    clock.advance(1)
+    analyzer.get_option_chain('AAA')
+    assert http.call_counts() == {'options-contracts': 2}
+
+def test_chain_rolled_past_its_front_expiration_is_refetched(clock):
+    analyzer, http = replay()
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    analyzer.cache_service.cache_data('options_chain:AAA', [['AAA1C', 100.0, yesterday, 'call']],
+                                      analyzer.contracts_cache_ttl)
+    
+    chain = analyzer.get_option_chain('AAA')
+    assert http.call_counts() == {'options-contracts': 1}
+    assert chain.is_current() and chain.size > 1
+
+def test_empty_listing_is_not_cached(clock):
+    analyzer, http = replay()
+    assert analyzer.get_option_chain('ZZZ') is None
+    assert analyzer.get_option_chain('ZZZ') is None
+    assert http.call_counts() == {'options-contracts': 2}
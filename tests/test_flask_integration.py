@@ -0,0 +1,24 @@
+"""Request validation for the debit spread Flask routes"""
+
+import pytest
+from flask import Flask
+
+from flask_integration import create_debit_spread_routes
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    create_debit_spread_routes(app)
+    return app.test_client()
+
+@pytest.mark.parametrize('tickers', [[None], [123], ['AAPL', 5.5], ['MSFT', ['SPY']], [{'symbol': 'QQQ'}]])
+def test_batch_rejects_non_string_tickers(client, tickers):
+    response = client.post('/api/analyze_debit_spreads', json={'tickers': tickers})
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': 'tickers must be a list of strings'}
+
+@pytest.mark.parametrize('body', [{}, {'tickers': []}, {'tickers': 'AAPL'}, ['AAPL']])
+def test_batch_rejects_missing_tickers(client, body):
+    response = client.post('/api/analyze_debit_spreads', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Missing required field: tickers'
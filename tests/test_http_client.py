@@ -0,0 +1,60 @@
+"""PooledHTTPClient connection reuse and timeouts"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from debit_spread_analyzer import PooledHTTPClient
+
+@pytest.fixture
+def server():
+    """Keep-alive HTTP server recording the client port of every request"""
+    
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def log_message(self, *args):
+            pass
+        
+        def do_GET(self):
+            self.server.ports.append(self.client_address[1])
+            self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'ok')
+        
+        do_POST = do_GET
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.ports = []
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_sequential_requests_reuse_one_connection(server):
+    http = PooledHTTPClient()
+    for _ in range(5):
+        assert http.get(server.url + '/a').text == 'ok'
+    assert http.post(server.url + '/b', json={'x': 1}).status_code == 200
+    assert len(server.ports) == 6 and len(set(server.ports)) == 1
+    
+    # close drops the pool; the next call opens a fresh connection
+    http.close()
+    http.get(server.url + '/a')
+    assert len(set(server.ports)) == 2
+    http.close()
+
+def test_timeouts_are_connect_read_pairs(monkeypatch):
+    monkeypatch.setenv('HTTP_CONNECT_TIMEOUT', '1.5')
+    monkeypatch.setenv('HTTP_READ_TIMEOUT', '7')
+    monkeypatch.setenv('HTTP_POOL_MAXSIZE', '32')
+    http = PooledHTTPClient()
+    assert http._timeout(None) == (1.5, 7.0)
+    assert http._timeout(2) == (1.5, 2)
+    assert http.pool_maxsize == 32
+    assert http.session.get_adapter('https://api.thetradelist.com')._pool_maxsize == 32
+    assert http.session is http.session
@@ -0,0 +1,145 @@
+"""import_csv bulk load paths against a real Postgres (set TEST_DATABASE_URL to run)"""
+
+import csv
+import os
+import uuid
+
+import pytest
+
+psycopg2 = pytest.importorskip('psycopg2')
+
+import import_csv
+from scanner_csv import CRITERIA
+
+DATABASE_URL = os.environ.get('TEST_DATABASE_URL')
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason='TEST_DATABASE_URL is not set')
+
+ETF_SCORES_DDL = f"""
+    CREATE TABLE etf_scores (
+        id SERIAL PRIMARY KEY,
+        symbol VARCHAR(10) NOT NULL UNIQUE,
+        current_price DOUBLE PRECISION,
+        total_score INTEGER,
+        trading_volume_20_day BIGINT,
+        options_contracts_10_42_dte INTEGER,
+        {', '.join(f'{name}_pass BOOLEAN, {name}_current DOUBLE PRECISION, '
+                   f'{name}_threshold DOUBLE PRECISION, {name}_description TEXT' for name in CRITERIA)},
+        calculation_timestamp TIMESTAMP
+    )
+"""
+
+def write_scanner_csv(path, rows):
+    """Scanner export with (symbol, price, passes) rows and fixed readings"""
+    header = ['symbol', 'current_price', 'avg_volume_10d', 'options_contracts_10_42_dte']
+    for name in CRITERIA:
+        header += [f'{name}_pass', f'{name}_current', f'{name}_threshold', f'{name}_description']
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for symbol, price, passes in rows:
+            row = [symbol, price, '1,000,000', 250]
+            for passed in passes:
+                row += [passed, 1.5, 1.0, 'test']
+            writer.writerow(row)
+    return str(path)
+
+@pytest.fixture
+def cur():
+    """Cursor in a throwaway schema holding an empty etf_scores"""
+    schema = f'import_csv_test_{uuid.uuid4().hex[:8]}'
+    conn = psycopg2.connect(DATABASE_URL)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"CREATE SCHEMA {schema}")
+        cursor.execute(f"SET search_path TO {schema}")
+        cursor.execute(ETF_SCORES_DDL)
+        conn.commit()
+        yield cursor
+    finally:
+        conn.rollback()
+        cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        conn.commit()
+        conn.close()
+
+def scores(cur):
+    cur.execute("SELECT symbol, current_price, total_score FROM etf_scores ORDER BY symbol")
+    return cur.fetchall()
+
+def records(tmp_path, *files):
+    tmp_path.mkdir(exist_ok=True)
+    paths = [write_scanner_csv(tmp_path / f'scan_{index}.csv', rows) for index, rows in enumerate(files)]
+    return import_csv.iter_csv_records(paths, None)
+
+@pytest.mark.parametrize('method', ['copy', 'values'])
+def test_reload_swaps_in_last_row_per_symbol(cur, tmp_path, method):
+    cur.execute("INSERT INTO etf_scores (symbol, current_price, total_score) VALUES ('OLD', 1, 1)")
+    count = import_csv.reload_table(cur, records(
+        tmp_path,
+        [('AAA', 10.0, [True] * 5), ('BBB', 20.0, [False] * 5)],
+        [('AAA', 11.0, [True, True, False, False, False])]
+    ), method, batch_size=2)
+    cur.connection.commit()
+    
+    assert count == 3
+    assert scores(cur) == [('AAA', 11.0, 2), ('BBB', 20.0, 0)]
+    cur.execute("SELECT to_regclass('etf_scores_old'), to_regclass('etf_scores_shadow')")
+    assert cur.fetchone() == (None, None)
+    
+    # The serial sequence moved to the new table and keeps counting
+    cur.execute("INSERT INTO etf_scores (symbol) VALUES ('NEW') RETURNING id")
+    assert cur.fetchone()[0] > 1
+
+@pytest.mark.parametrize('method', ['copy', 'values'])
+def test_upsert_updates_inserts_and_keeps_other_symbols(cur, tmp_path, method):
+    cur.execute("INSERT INTO etf_scores (symbol, current_price, total_score) VALUES ('AAA', 1, 1), ('KEEP', 5, 5)")
+    count = import_csv.upsert_records(cur, records(
+        tmp_path,
+        [('AAA', 10.0, [True] * 5), ('BBB', 20.0, [False] * 5), ('AAA', 12.0, [False] * 5)]
+    ), method)
+    cur.connection.commit()
+    
+    assert count == 3
+    assert scores(cur) == [('AAA', 12.0, 0), ('BBB', 20.0, 0), ('KEEP', 5.0, 5)]
+
+def test_repeated_reloads_keep_index_and_constraint_names(cur, tmp_path):
+    def names():
+        cur.execute("""
+            SELECT array_agg(relname ORDER BY relname) FROM pg_class
+            WHERE oid IN (SELECT indexrelid FROM pg_index WHERE indrelid = 'etf_scores'::regclass)
+        """)
+        indexes = cur.fetchone()[0]
+        cur.execute("SELECT array_agg(conname ORDER BY conname) FROM pg_constraint WHERE conrelid = 'etf_scores'::regclass")
+        return indexes, cur.fetchone()[0]
+    
+    original = names()
+    for index in range(3):
+        import_csv.reload_table(cur, records(tmp_path / str(index), [('AAA', 10.0 + index, [True] * 5)]))
+        cur.connection.commit()
+        assert names() == original
+    assert scores(cur) == [('AAA', 12.0, 5)]
+
+def test_copy_round_trips_nulls_and_quoting(cur):
+    row = ['Q,"X"', 1.0, 0, None, None] + [None] * 20 + [None]
+    assert import_csv.copy_records(cur, 'etf_scores', [row]) == 1
+    cur.execute("SELECT symbol, trading_volume_20_day, trend1_description FROM etf_scores")
+    assert cur.fetchall() == [('Q,"X"', None, None)]
+
+def test_reload_refuses_when_a_view_depends_on_etf_scores(cur, tmp_path):
+    cur.execute("INSERT INTO etf_scores (symbol, current_price, total_score) VALUES ('OLD', 1, 1)")
+    cur.execute("CREATE VIEW top_scores AS SELECT symbol FROM etf_scores WHERE total_score >= 4")
+    cur.connection.commit()
+    
+    with pytest.raises(RuntimeError, match='view top_scores'):
+        import_csv.reload_table(cur, records(tmp_path, [('AAA', 10.0, [True] * 5)]))
+    cur.connection.rollback()
+    assert scores(cur) == [('OLD', 1.0, 1)]
+
+def test_swap_lock_timeout_is_passed_as_a_parameter(cur, monkeypatch):
+    monkeypatch.setattr(import_csv, 'SWAP_LOCK_TIMEOUT', "1s'; DROP TABLE etf_scores; --")
+    cur.execute("CREATE TABLE etf_scores_shadow (LIKE etf_scores INCLUDING ALL)")
+    with pytest.raises(psycopg2.DataError):
+        import_csv.swap_in_shadow(cur)
+    cur.connection.rollback()
+    cur.execute("SELECT to_regclass('etf_scores')")
+    assert cur.fetchone()[0] is not None
@@ -0,0 +1,66 @@
+"""LocalLRUCache eviction and expiry, and its place in front of Redis"""
+
+from debit_spread_analyzer import LocalLRUCache
+
+def test_evicts_least_recently_used_first(clock):
+    cache = LocalLRUCache(max_entries=2)
+    cache.set('a', {'v': 1}, 60)
+    cache.set('b', {'v': 2}, 60)
+    assert cache.get('a') == {'v': 1}  # a is now the most recently used
+    
+    cache.set('c', {'v': 3}, 60)
+    assert cache.get('b') is None
+    assert cache.get('a') == {'v': 1} and cache.get('c') == {'v': 3}
+    assert cache.stats() == {'entries': 2, 'max_entries': 2, 'hits': 3, 'misses': 1, 'evictions': 1}
+
+def test_overwriting_refreshes_recency_without_evicting(clock):
+    cache = LocalLRUCache(max_entries=2)
+    cache.set('a', {'v': 1}, 60)
+    cache.set('b', {'v': 2}, 60)
+    cache.set('a', {'v': 10}, 60)
+    cache.set('c', {'v': 3}, 60)
+    
+    assert cache.get('a') == {'v': 10}
+    assert cache.get('b') is None
+    assert cache.stats()['evictions'] == 1
+
+def test_entries_expire_per_entry_ttl(clock):
+    cache = LocalLRUCache(max_entries=10)
+    cache.set('short', {'v': 1}, 5)
+    cache.set('long', {'v': 2}, 50)
+    
+    clock.advance(4.9)
+    assert cache.get('short') == {'v': 1}
+    clock.advance(0.1)
+    assert cache.get('short') is None
+    assert cache.get('long') == {'v': 2}
+    assert cache.stats()['entries'] == 1
+    
+    clock.advance(50)
+    assert cache.get('long') is None
+    assert cache.stats()['entries'] == 0
+
+def test_non_positive_ttl_is_not_stored(clock):
+    cache = LocalLRUCache(max_entries=10)
+    cache.set('gone', {'v': 1}, 0)
+    cache.set('negative', {'v': 1}, -5)
+    assert cache.get('gone') is None and cache.get('negative') is None
+    assert cache.stats()['entries'] == 0
+
+def test_max_entries_from_the_environment(monkeypatch):
+    monkeypatch.setenv('LOCAL_CACHE_MAX_ENTRIES', '3')
+    assert LocalLRUCache().max_entries == 3
+
+def test_local_tier_answers_before_redis(transport, redis_store):
+    make_service, _ = transport
+    cache = make_service()
+    cache.cache_data('quote', {'bid': 1}, expiry_seconds=60)
+    redis_store.commands.clear()
+    
+    assert cache.get_cached_data('quote')['data'] == {'bid': 1}
+    assert redis_store.commands == []
+    assert cache.get_stats()['local']['hits'] == 1
+    
+    # Another instance has an empty local tier, so its read falls through to Redis
+    assert make_service().get_cached_data('quote')['data'] == {'bid': 1}
+    assert redis_store.round_trips('MGET') == 1
@@ -0,0 +1,118 @@
+"""Flask bridge in main.py: readiness gate, header handling and streaming relay (Node is never started)"""
+
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend_supervisor import BackendSupervisor
+
+@pytest.fixture(scope='module')
+def main():
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(BackendSupervisor, 'start', lambda self: None)
+        import main
+    return main
+
+@pytest.fixture
+def client(main, monkeypatch):
+    monkeypatch.setattr(main.backend, 'failure', None)
+    main.backend.ready.clear()
+    return main.app.test_client()
+
+def test_permanent_failure_returns_503_without_waiting(main, client, monkeypatch):
+    monkeypatch.setattr(main, 'PROXY_READY_WAIT', 5)
+    monkeypatch.setattr(main.backend, 'failure', 'port 5001 is in use by another process')
+    
+    started = time.monotonic()
+    response = client.get('/api/tickers')
+    assert time.monotonic() - started < 1
+    assert response.status_code == 503
+    assert b'in use' in response.data
+
+def test_starting_backend_gets_retry_after(main, client, monkeypatch):
+    monkeypatch.setattr(main, 'PROXY_READY_WAIT', 0.01)
+    response = client.get('/')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '3'
+
+@pytest.fixture
+def node(main, monkeypatch):
+    """Ready stand-in backend recording what it receives and answering with hop-by-hop headers"""
+    
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def log_message(self, *args):
+            pass
+        
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            self.server.received.append((self.path, dict(self.headers.items()), body))
+            payload = gzip.compress(b'{"ok": true}')
+            self.send_response(201)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(payload)))
+            self.send_header('Connection', 'keep-alive, X-Backend-Trace')
+            self.send_header('Keep-Alive', 'timeout=5')
+            self.send_header('X-Backend-Trace', 'abc')
+            self.send_header('Set-Cookie', 'a=1')
+            self.send_header('Set-Cookie', 'b=2')
+            self.end_headers()
+            self.wfile.write(payload)
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.received = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(main, 'BACKEND_URL', f'http://127.0.0.1:{server.server_address[1]}')
+    main.backend.ready.set()
+    yield server
+    main.backend.ready.clear()
+    server.shutdown()
+    server.server_close()
+
+def test_end_to_end_headers_drop_hop_by_hop_and_connection_listed_headers(main):
+    headers = [('Connection', 'Keep-Alive, X-Trace'), ('Keep-Alive', 'timeout=5'), ('Transfer-Encoding', 'chunked'),
+               ('Upgrade', 'h2c'), ('TE', 'trailers'), ('Proxy-Authorization', 'Basic x'), ('x-trace', '1'),
+               ('Content-Type', 'text/html'), ('Set-Cookie', 'a=1'), ('Set-Cookie', 'b=2')]
+    assert main.end_to_end_headers(headers) == [('Content-Type', 'text/html'), ('Set-Cookie', 'a=1'), ('Set-Cookie', 'b=2')]
+    assert main.end_to_end_headers([('Host', 'x'), ('Accept', '*/*')], ('host',)) == [('Accept', '*/*')]
+
+def test_route_timeout_uses_the_first_matching_prefix(main):
+    assert main.route_timeout('api/analyze_debit_spreads') == (3.05, 45)
+    assert main.route_timeout('api/tickers') == (3.05, 15)
+    assert main.route_timeout('assets/app.js') == main.DEFAULT_TIMEOUT
+
+def test_forwarded_headers_replace_host_and_extend_x_forwarded_for(main):
+    with main.app.test_request_context('/api/tickers', base_url='https://income.example', headers={
+        'Connection': 'close', 'Content-Length': '0', 'X-Forwarded-For': '203.0.113.7', 'Accept': 'text/html'
+    }, environ_base={'REMOTE_ADDR': '10.0.0.2'}):
+        headers = main.forward_request_headers()
+    assert headers == {
+        'Accept': 'text/html',
+        'X-Forwarded-For': '203.0.113.7, 10.0.0.2',
+        'X-Forwarded-Host': 'income.example',
+        'X-Forwarded-Proto': 'https'
+    }
+
+def test_proxy_relays_end_to_end_headers_and_encoded_body(main, client, node):
+    response = client.post('/api/save?tag=a&tag=b', data=b'{"x": 1}', headers={
+        'Content-Type': 'application/json', 'Connection': 'X-Client-Hop', 'X-Client-Hop': '1', 'TE': 'trailers'
+    })
+    
+    path, received, body = node.received[0]
+    assert path == '/api/save?tag=a&tag=b'
+    assert body == b'{"x": 1}'
+    assert received['Content-Type'] == 'application/json'
+    assert 'X-Client-Hop' not in received and 'TE' not in received
+    
+    assert response.status_code == 201
+    assert response.headers.getlist('Set-Cookie') == ['a=1', 'b=2']
+    assert response.headers['Content-Encoding'] == 'gzip'
+    for name in ('Keep-Alive', 'X-Backend-Trace'):
+        assert name not in response.headers
+    assert gzip.decompress(response.get_data()) == b'{"ok": true}'
@@ -0,0 +1,65 @@
+"""OptionChain strike/DTE index, compact round trip and rollover"""
+
+from datetime import datetime, timedelta
+
+from debit_spread_analyzer import OptionChain
+from spread_benchmark import synthetic_fixture
+
+NOW = datetime(2026, 10, 16, 9, 30)
+
+def selected(contracts):
+    return sorted(contract.ticker for contract in contracts)
+
+def test_select_matches_a_full_scan():
+    fixture = synthetic_fixture('AAA', 'medium')
+    now = datetime.now()
+    chain = OptionChain(fixture['contracts'], now=now)
+    price = fixture['price']['fmv']
+    
+    for option_type in ('call', 'put'):
+        for dte_min, dte_max in [(10, 17), (17, 28), (28, 42), (0, 1000), (500, 600)]:
+            expected = sorted(
+                contract['ticker'] for contract in fixture['contracts']
+                if contract['option_type'] == option_type
+                and dte_min <= (datetime.strptime(contract['expiration_date'], '%Y-%m-%d') - now).days <= dte_max
+                and price * 0.85 <= contract['strike_price'] <= price * 1.15
+            )
+            assert selected(chain.select(option_type, dte_min, dte_max, price * 0.85, price * 1.15)) == expected
+
+def test_select_bounds_are_inclusive_and_skip_undated_contracts():
+    contracts = [
+        {'ticker': 'C95', 'strike_price': 95, 'expiration_date': '2026-11-20', 'option_type': 'call'},
+        {'ticker': 'C100', 'strike_price': '100', 'expiration_date': '2026-11-20', 'option_type': 'call'},
+        {'ticker': 'C105', 'strike_price': 105, 'expiration_date': '2026-11-20', 'option_type': 'call'},
+        {'ticker': 'P100', 'strike_price': 100, 'expiration_date': '2026-11-20', 'option_type': 'put'},
+        {'ticker': 'X100', 'strike_price': 100, 'expiration_date': '', 'option_type': 'call'},
+        {'ticker': 'BAD', 'strike_price': 'n/a', 'expiration_date': '2026-11-20', 'option_type': 'call'}
+    ]
+    chain = OptionChain(contracts, now=NOW)
+    dte = (datetime(2026, 11, 20) - NOW).days
+    
+    assert chain.size == 4
+    assert selected(chain.select('call', dte, dte, 95, 100)) == ['C100', 'C95']
+    assert selected(chain.select('call', dte + 1, dte + 10, 0, 1000)) == []
+    assert [contract.dte for contract in chain.select('put', 0, 100, 0, 1000)] == [dte]
+
+def test_compact_round_trip_recomputes_dte():
+    chain = OptionChain(synthetic_fixture('AAA', 'small')['contracts'], now=NOW)
+    later = NOW + timedelta(days=3)
+    restored = OptionChain.from_compact(chain.to_compact(), now=later)
+    
+    assert restored.size == chain.size
+    assert sorted(map(tuple, restored.to_compact())) == sorted(map(tuple, chain.to_compact()))
+    before = {contract.ticker: contract.dte for contract in chain.select('call', 0, 1000, 0, 10**6)}
+    after = {contract.ticker: contract.dte for contract in restored.select('call', 0, 1000, 0, 10**6)}
+    assert after == {ticker: dte - 3 for ticker, dte in before.items()}
+
+def test_chain_is_not_current_once_the_front_expiration_passes():
+    today = datetime.now().date()
+    contracts = [{'ticker': 'C1', 'strike_price': 1, 'expiration_date': (today + timedelta(days=days)).isoformat(),
+                  'option_type': 'call'} for days in (0, 30)]
+    assert OptionChain(contracts).is_current()
+    
+    contracts[0]['expiration_date'] = (today - timedelta(days=1)).isoformat()
+    assert not OptionChain(contracts).is_current()
+    assert not OptionChain([]).is_current()
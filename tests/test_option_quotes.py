@@ -0,0 +1,41 @@
+"""Batched snapshot-options quote fetching"""
+
+from debit_spread_analyzer import DebitSpreadAnalyzer
+from spread_benchmark import FixtureStore, ReplayHTTPClient, build_analyzer, synthetic_fixture
+
+def replay(symbol='AAA', size='medium'):
+    store = FixtureStore()
+    fixture = synthetic_fixture(symbol, size)
+    store.add(fixture)
+    return fixture, ReplayHTTPClient(store)
+
+def test_quotes_are_fetched_in_batches_of_quote_batch_size():
+    fixture, http = replay()
+    analyzer = build_analyzer(http)
+    symbols = [contract['ticker'] for contract in fixture['contracts']][:120]
+    
+    quotes = analyzer.get_options_quotes(symbols)
+    assert set(quotes) == set(symbols)
+    assert http.call_counts() == {'snapshot-options': 3, 'snapshot-options:contracts': 120}
+    expected = fixture['quotes'][f'O:{symbols[0]}']
+    assert quotes[symbols[0]] == {'bid': expected['bid'], 'ask': expected['ask'],
+                                  'last': expected['last_trade']['price']}
+
+def test_cached_quotes_are_not_requested_again():
+    fixture, http = replay()
+    analyzer = build_analyzer(http)
+    symbols = [contract['ticker'] for contract in fixture['contracts']][:60]
+    analyzer.get_options_quotes(symbols[:40])
+    
+    assert set(analyzer.get_options_quotes(symbols + symbols[:5])) == set(symbols)
+    assert http.call_counts()['snapshot-options:contracts'] == 60
+
+def test_parse_quotes_keeps_only_requested_contracts():
+    data = {'status': 'OK', 'results': [
+        {'name': 'O:A1', 'bid': 1.0, 'ask': 1.2, 'last_trade': {'price': 1.1}},
+        {'name': 'O:B2', 'bid': 2.0, 'ask': 2.2},
+        {'name': 'O:C3', 'bid': 3.0, 'ask': 3.2, 'last_trade': None}
+    ]}
+    quotes = DebitSpreadAnalyzer.parse_quotes(data, ['A1', 'C3'])
+    assert quotes == {'A1': {'bid': 1.0, 'ask': 1.2, 'last': 1.1}, 'C3': {'bid': 3.0, 'ask': 3.2, 'last': 0}}
+    assert DebitSpreadAnalyzer.parse_quotes({'status': 'ERROR'}, ['A1']) == {}
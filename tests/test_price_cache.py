@@ -0,0 +1,90 @@
+"""Price and quote cache TTLs and stale-while-revalidate serving"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from spread_benchmark import FixtureStore, ReplayHTTPClient, build_analyzer, synthetic_fixture
+
+def make_analyzer():
+    return build_analyzer(ReplayHTTPClient(FixtureStore()))
+
+def test_default_ttls_never_serve_prices_older_than_quotes():
+    analyzer = make_analyzer()
+    assert (analyzer.price_soft_ttl, analyzer.price_hard_ttl) == (30, 120)
+    assert (analyzer.quote_soft_ttl, analyzer.quote_hard_ttl) == (30, 120)
+
+def test_ttls_come_from_the_environment(monkeypatch):
+    monkeypatch.setenv('PRICE_SOFT_TTL', '10')
+    monkeypatch.setenv('PRICE_HARD_TTL', '60')
+    monkeypatch.setenv('QUOTE_SOFT_TTL', '15')
+    monkeypatch.setenv('QUOTE_HARD_TTL', '5')
+    analyzer = make_analyzer()
+    assert (analyzer.price_soft_ttl, analyzer.price_hard_ttl) == (10, 60)
+    # A hard TTL below the soft one is raised to it
+    assert (analyzer.quote_soft_ttl, analyzer.quote_hard_ttl) == (15, 15)
+
+def replay(price=250.0):
+    store = FixtureStore()
+    fixture = synthetic_fixture('AAA', 'small')
+    fixture['price']['fmv'] = price
+    store.add(fixture)
+    http = ReplayHTTPClient(store, latency_ms=50)
+    return build_analyzer(http), http, fixture
+
+def seed(analyzer, cache_key, data, stale_seconds):
+    """Cache data that went stale stale_seconds ago and is still within its hard TTL"""
+    payload = analyzer.cache_service.build_payload(data, 120, 30)
+    payload['fresh_until'] = (datetime.now(timezone.utc) - timedelta(seconds=stale_seconds)).isoformat()
+    analyzer.cache_service.local_cache.set(cache_key, payload, 60)
+
+def wait_for_refreshes(analyzer):
+    deadline = time.monotonic() + 5
+    while analyzer.refresher.stats()['in_progress'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not analyzer.refresher.stats()['in_progress']
+
+def test_stale_price_is_served_while_it_revalidates():
+    analyzer, http, _ = replay(price=251.0)
+    seed(analyzer, 'stock_price_snapshot:AAA', {'price': 250.0}, stale_seconds=10)
+    
+    price, staleness = analyzer.get_stock_price_with_staleness('AAA')
+    assert price == 250.0 and staleness == pytest.approx(10, abs=1)
+    assert analyzer.refresher.stats()['scheduled'] == 1
+    
+    wait_for_refreshes(analyzer)
+    assert http.call_counts() == {'snapshot-locale': 1}
+    assert analyzer.get_stock_price_with_staleness('AAA') == (251.0, 0.0)
+    assert analyzer.refresher.stats()['scheduled'] == 1
+
+def test_fresh_price_makes_no_upstream_call():
+    analyzer, http, _ = replay()
+    seed(analyzer, 'stock_price_snapshot:AAA', {'price': 250.0}, stale_seconds=-10)
+    assert analyzer.get_stock_price_with_staleness('AAA') == (250.0, 0.0)
+    assert http.call_counts() == {} and analyzer.refresher.stats()['scheduled'] == 0
+
+def test_price_past_its_hard_ttl_is_refetched_inline(clock):
+    analyzer, http, _ = replay(price=252.0)
+    analyzer.cache_service.cache_data('stock_price_snapshot:AAA', {'price': 250.0},
+                                      analyzer.price_hard_ttl, analyzer.price_soft_ttl)
+    clock.advance(analyzer.price_hard_ttl)
+    assert analyzer.get_stock_price_with_staleness('AAA') == (252.0, 0.0)
+    assert http.call_counts() == {'snapshot-locale': 1}
+
+def test_stale_quotes_are_refreshed_once_across_concurrent_readers():
+    analyzer, http, fixture = replay()
+    symbols = [contract['ticker'] for contract in fixture['contracts'][:10]]
+    for symbol in symbols:
+        seed(analyzer, f'options_quote:{symbol}', {'bid': 1.0, 'ask': 1.1, 'last': 1.05}, stale_seconds=5)
+    
+    for _ in range(3):
+        quotes, staleness = analyzer.get_options_quotes_with_staleness(symbols)
+        assert quotes[symbols[0]]['bid'] == 1.0 and staleness == pytest.approx(5, abs=1)
+    assert analyzer.refresher.stats()['scheduled'] == 10
+    assert analyzer.refresher.stats()['deduplicated'] == 20
+    
+    wait_for_refreshes(analyzer)
+    assert http.call_counts()['snapshot-options:contracts'] == 10
+    quotes, staleness = analyzer.get_options_quotes_with_staleness(symbols)
+    assert quotes[symbols[0]]['bid'] == fixture['quotes'][f'O:{symbols[0]}']['bid'] and staleness == 0.0
@@ -0,0 +1,101 @@
+"""RedisCacheService round trips over the native and Upstash REST pipeline transports"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+from debit_spread_analyzer import PooledHTTPClient, RedisCacheService
+
+def test_cache_many_writes_set_ex_in_one_pipeline(transport, redis_store):
+    make_service, _ = transport
+    cache = make_service()
+    
+    assert cache.cache_many({'a': {'x': 1}, 'b': [1, 2]}, expiry_seconds=120, fresh_seconds=30)
+    assert cache.get_stats()['redis']['round_trips'] == 1
+    
+    sets = [command for command in redis_store.commands if command[0] == 'SET']
+    assert [(command[1], command[3], int(command[4])) for command in sets] == [('a', 'EX', 120), ('b', 'EX', 120)]
+    payload = json.loads(redis_store.values['a'])
+    assert payload['data'] == {'x': 1}
+    assert payload['fresh_until'] < payload['expiry']
+    assert redis_store.execute(['TTL', 'a']) in (119, 120)
+
+def test_get_many_reads_through_one_mget(transport, redis_store):
+    make_service, _ = transport
+    make_service().cache_many({'a': 1, 'b': 2, 'c': 3}, expiry_seconds=60)
+    
+    # Fresh instance: empty local tier, so everything comes from Redis
+    cache = make_service()
+    found = cache.get_many(['a', 'b', 'c'])
+    assert {key: value['data'] for key, value in found.items()} == {'a': 1, 'b': 2, 'c': 3}
+    assert redis_store.round_trips('MGET') == 1
+    
+    # Now served from the promoted local entries without another round trip
+    assert cache.get_cached_data('b')['data'] == 2
+    assert redis_store.round_trips('MGET') == 1
+
+def test_get_many_partial_and_null_results(transport, redis_store):
+    make_service, _ = transport
+    make_service().cache_many({'present': 'yes'}, expiry_seconds=60)
+    redis_store.set_raw('garbage', 'not json')
+    expired = {'data': 'old', 'expiry': (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()}
+    redis_store.set_raw('expired', json.dumps(expired))
+    
+    cache = make_service()
+    found = cache.get_many(['present', 'missing', 'garbage', 'expired'])
+    assert list(found) == ['present']
+    stats = cache.get_stats()['redis']
+    assert (stats['hits'], stats['misses']) == (1, 3)
+
+def test_get_many_only_asks_redis_for_local_misses(transport, redis_store):
+    make_service, _ = transport
+    cache = make_service()
+    cache.cache_many({'local': 1}, expiry_seconds=60)
+    redis_store.commands.clear()
+    
+    cache.get_many(['local', 'remote'])
+    assert redis_store.commands == [['MGET', 'remote']]
+
+def test_failed_command_is_none_in_pipeline(transport, redis_store):
+    make_service, _ = transport
+    cache = make_service()
+    stored, failed, value = cache.pipeline([['SET', 'k', 'v'], ['BOGUS'], ['GET', 'k']])
+    assert stored and failed is None and value == 'v'
+    
+    # A failed SET makes the batch write report failure
+    assert cache.cache_many({'a': 1}) is True
+    redis_store.execute = lambda command, execute=redis_store.execute: (
+        execute(['BOGUS']) if command[1] == 'b' else execute(command))
+    assert cache.cache_many({'a': 1, 'b': 2}) is False
+
+def test_pipeline_failure_falls_back_to_local_tier(transport, redis_store):
+    make_service, fail = transport
+    cache = make_service()
+    fail()
+    
+    # Writes still land in the local tier but report the Redis failure
+    assert cache.cache_many({'a': 1}, expiry_seconds=60) is False
+    assert cache.get_cached_data('a')['data'] == 1
+    assert 'a' not in redis_store.values
+    
+    # Reads degrade to misses instead of raising
+    assert cache.get_many(['a', 'b']) == {'a': cache.get_cached_data('a')}
+    assert cache.pipeline([['GET', 'a']]) is None
+    
+    fail(False)
+    assert cache.pipeline([['PING']]) == ['PONG']
+
+def test_unreachable_upstash_falls_back(monkeypatch):
+    monkeypatch.setenv('UPSTASH_REDIS_REST_URL', 'http://127.0.0.1:9')
+    monkeypatch.setenv('UPSTASH_REDIS_REST_TOKEN', 'token')
+    cache = RedisCacheService(http_client=PooledHTTPClient(connect_timeout=0.5))
+    
+    assert cache.cache_enabled
+    assert cache.get_many(['a']) == {}
+    assert cache.cache_data('a', 1) is False
+
+def test_disabled_cache_skips_redis():
+    cache = RedisCacheService()
+    assert not cache.cache_enabled
+    assert cache.pipeline([['PING']]) is None
+    assert cache.cache_data('a', 1)
+    assert cache.get_cached_data('a')['data'] == 1
@@ -0,0 +1,37 @@
+"""Scanner CSV field conversion and reject reporting"""
+
+import csv
+
+import pytest
+
+from scanner_csv import CRITERIA, RejectReport, RejectedRow, _parse_count, iter_scanner_records
+
+@pytest.mark.parametrize('value, expected', [
+    ('', 0), ('1234', 1234), ('1,234', 1234), ('1,234.5', 1234), ('2,330,091.0', 2330091), ('12.9', 12)
+])
+def test_parse_count_strips_separators_before_either_conversion(value, expected):
+    assert _parse_count(value) == expected
+
+def test_parse_count_rejects_non_numbers():
+    with pytest.raises(RejectedRow):
+        _parse_count('1,2x')
+
+def test_bad_timestamp_keeps_the_row_and_is_noted(tmp_path):
+    header = ['symbol', 'current_price', 'avg_volume_10d', 'calculation_timestamp'] + [f'{name}_pass' for name in CRITERIA]
+    path = tmp_path / 'scan.csv'
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerow(['AAA', '10.5', '1,234.5', 'yesterday-ish'] + ['true'] * 5)
+        writer.writerow(['BBB', '20', '100', '2025-06-13T20:02:48'] + ['false'] * 5)
+    
+    rejects = RejectReport()
+    records = list(iter_scanner_records([str(path)], rejects))
+    assert [(record.symbol, record.avg_volume_10d, record.total_score) for record in records] == [
+        ('AAA', 1234, 5), ('BBB', 100, 0)
+    ]
+    assert records[0].calculation_timestamp is None
+    assert records[1].calculation_timestamp.hour == 20
+    assert rejects.total == 0
+    assert rejects.notes == {'unparseable calculation_timestamp': 1}
+    assert 'unparseable calculation_timestamp (1)' in rejects.summary()
@@ -0,0 +1,109 @@
+"""ScannerSnapshot refresh: downloads, cache reuse and bounded age"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from debit_spread_analyzer import RedisCacheService, ScannerSnapshot
+
+class ScannerResponse:
+    def __init__(self, data):
+        self.data = data
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self.data
+
+class FakeScannerAPI:
+    def __init__(self, prices, delay=0.0):
+        self.prices = prices
+        self.delay = delay
+        self.failing = False
+        self.calls = 0
+    
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.failing:
+            raise ConnectionError('scanner unavailable')
+        return ScannerResponse([{'symbol': symbol, 'stock_price': price} for symbol, price in self.prices.items()])
+
+@pytest.fixture
+def cache():
+    return RedisCacheService()
+
+def publish(cache, prices, age_seconds):
+    """Cache an index as if another worker had published it age_seconds ago"""
+    payload = cache.build_payload(prices, 60)
+    payload['cached_at'] = (datetime.now(timezone.utc) - timedelta(seconds=age_seconds)).isoformat()
+    cache.local_cache.set(ScannerSnapshot.CACHE_KEY, payload, 60)
+
+def test_downloads_once_and_publishes(cache):
+    api = FakeScannerAPI({'AAA': 10.0, 'BBB': 0})
+    snapshot = ScannerSnapshot(api, cache, 'key', refresh_seconds=60)
+    assert snapshot.get_price('AAA') == 10.0
+    assert snapshot.get_price('BBB') is None
+    assert api.calls == 1
+    assert cache.get_cached_data(ScannerSnapshot.CACHE_KEY)['data'] == {'AAA': 10.0}
+
+def test_cached_index_keeps_its_published_age(cache):
+    publish(cache, {'AAA': 11.0}, age_seconds=50)
+    api = FakeScannerAPI({'AAA': 12.0})
+    snapshot = ScannerSnapshot(api, cache, 'key', refresh_seconds=60)
+    
+    assert snapshot.get_price('AAA') == 11.0
+    assert api.calls == 0
+    assert snapshot.stats()['age_seconds'] == pytest.approx(50, abs=1)
+    
+    # Expires when the published index turns one interval old, not one interval after loading
+    snapshot.loaded_at -= 10
+    assert not snapshot.is_current()
+
+def test_cached_index_older_than_the_interval_is_redownloaded(cache):
+    publish(cache, {'AAA': 11.0}, age_seconds=65)
+    api = FakeScannerAPI({'AAA': 12.0})
+    snapshot = ScannerSnapshot(api, cache, 'key', refresh_seconds=60)
+    assert snapshot.get_price('AAA') == 12.0
+    assert api.calls == 1
+
+def test_index_skips_unpriced_rows_and_keeps_the_first_price():
+    assert ScannerSnapshot.index_prices([
+        {'symbol': 'AAA', 'stock_price': '10.5'}, {'symbol': 'AAA', 'stock_price': 11},
+        {'symbol': 'BBB', 'stock_price': None}, {'symbol': 'CCC', 'stock_price': 'n/a'},
+        {'symbol': '', 'stock_price': 5}, {'stock_price': 5}, {'symbol': 'DDD', 'stock_price': -1}
+    ]) == {'AAA': 10.5}
+
+def test_index_is_reused_until_the_interval_passes(cache, clock):
+    api = FakeScannerAPI({'AAA': 10.0})
+    snapshot = ScannerSnapshot(api, cache, 'key', refresh_seconds=60)
+    snapshot.get_price('AAA')
+    clock.advance(59)
+    api.prices = {'AAA': 20.0}
+    assert snapshot.get_price('AAA') == 10.0 and api.calls == 1
+    
+    clock.advance(1)
+    assert snapshot.get_price('AAA') == 20.0 and api.calls == 2
+    assert snapshot.stats()['downloads'] == 2 and snapshot.stats()['lookups'] == 3
+
+def test_failed_refresh_keeps_serving_the_last_index(cache, clock):
+    api = FakeScannerAPI({'AAA': 10.0})
+    snapshot = ScannerSnapshot(api, cache, 'key', refresh_seconds=60)
+    snapshot.get_price('AAA')
+    clock.advance(61)
+    api.failing = True
+    
+    assert snapshot.get_price('AAA') == 10.0
+    assert api.calls == 2 and snapshot.stats()['downloads'] == 1
+    assert not snapshot.is_current()
+
+def test_concurrent_lookups_share_one_download(cache):
+    api = FakeScannerAPI({f'S{i}': float(i + 1) for i in range(50)}, delay=0.1)
+    snapshot = ScannerSnapshot(api, cache, 'key', refresh_seconds=60)
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        prices = list(executor.map(snapshot.get_price, [f'S{i}' for i in range(50)]))
+    assert prices == [float(i + 1) for i in range(50)]
+    assert api.calls == 1
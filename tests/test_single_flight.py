@@ -0,0 +1,125 @@
+"""SingleFlight coalescing of concurrent fetches"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from debit_spread_analyzer import SingleFlight
+from spread_benchmark import FixtureStore, ReplayHTTPClient, build_analyzer, synthetic_fixture
+
+def blocked_fetch(result):
+    """fn for SingleFlight that counts calls and blocks until released"""
+    calls = []
+    release = threading.Event()
+    
+    def fetch(*args):
+        calls.append(args)
+        assert release.wait(5)
+        if isinstance(result, Exception):
+            raise result
+        return result(*args) if callable(result) else result
+    
+    return fetch, calls, release
+
+class CountingEvent(threading.Event):
+    """Event that counts the threads that have started waiting on it"""
+    
+    def __init__(self):
+        super().__init__()
+        self.waiters = 0
+        self.lock = threading.Lock()
+    
+    def wait(self, timeout=None):
+        with self.lock:
+            self.waiters += 1
+        return super().wait(timeout)
+    
+    def wait_for_waiters(self, count):
+        for _ in range(500):
+            with self.lock:
+                if self.waiters >= count:
+                    return
+            time.sleep(0.01)
+        raise AssertionError(f'only {self.waiters} of {count} callers are waiting')
+
+def run_concurrently(count, fn):
+    executor = ThreadPoolExecutor(max_workers=count)
+    futures = [executor.submit(fn) for _ in range(count)]
+    executor.shutdown(wait=False)
+    return futures
+
+def in_flight(flight, key):
+    """Wait for key's leader to start, then count the callers that join it"""
+    for _ in range(500):
+        with flight._lock:
+            call = flight._calls.get(key)
+            if call is not None:
+                call.done = CountingEvent()
+                return call.done
+        time.sleep(0.01)
+    raise AssertionError(f'{key} never went in flight')
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    fetch, calls, release = blocked_fetch({'price': 10})
+    futures = run_concurrently(1, lambda: flight.do('price:AAA', fetch))
+    done = in_flight(flight, 'price:AAA')
+    futures += run_concurrently(7, lambda: flight.do('price:AAA', fetch))
+    done.wait_for_waiters(7)
+    release.set()
+    
+    results = [future.result(5) for future in futures]
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    
+    # Once finished the key is free again
+    assert flight.do('price:AAA', lambda: 'fresh') == 'fresh'
+
+def test_error_reaches_every_waiter_and_frees_the_key():
+    flight = SingleFlight()
+    fetch, calls, release = blocked_fetch(ValueError('upstream down'))
+    futures = run_concurrently(1, lambda: flight.do('contracts:AAA', fetch))
+    done = in_flight(flight, 'contracts:AAA')
+    futures += run_concurrently(3, lambda: flight.do('contracts:AAA', fetch))
+    done.wait_for_waiters(3)
+    release.set()
+    
+    for future in futures:
+        with pytest.raises(ValueError, match='upstream down'):
+            future.result(5)
+    assert len(calls) == 1
+    assert flight.do('contracts:AAA', lambda: 'ok') == 'ok'
+
+def test_do_many_fetches_only_keys_not_already_in_flight():
+    flight = SingleFlight()
+    fetch, calls, release = blocked_fetch(lambda keys: {key: key.lower() for key in keys if key != 'C'})
+    first = run_concurrently(1, lambda: flight.do_many(['A', 'B', 'C'], fetch))[0]
+    done = in_flight(flight, 'B')
+    
+    second_calls = []
+    
+    def second_fetch(keys):
+        second_calls.append(keys)
+        return {key: key.lower() for key in keys}
+    
+    second = run_concurrently(1, lambda: flight.do_many(['B', 'C', 'D', 'D'], second_fetch))[0]
+    done.wait_for_waiters(1)
+    release.set()
+    
+    assert first.result(5) == {'A': 'a', 'B': 'b'}
+    # B is shared with the first batch, and C has no value there, so it is absent
+    assert second.result(5) == {'B': 'b', 'D': 'd'}
+    assert calls == [(['A', 'B', 'C'],)]
+    assert second_calls == [['D']]
+
+def test_concurrent_chain_fetches_make_one_upstream_call():
+    store = FixtureStore()
+    store.add(synthetic_fixture('AAA', 'small'))
+    http = ReplayHTTPClient(store, latency_ms=100)
+    analyzer = build_analyzer(http)
+    
+    futures = run_concurrently(6, lambda: analyzer.get_all_contracts('AAA'))
+    assert all(future.result(5) for future in futures)
+    assert http.call_counts() == {'options-contracts': 1}
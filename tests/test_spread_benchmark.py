@@ -0,0 +1,104 @@
+"""Benchmark fixtures, replay client and regression checks"""
+
+import json
+from datetime import date, timedelta
+
+import pytest
+
+import spread_benchmark
+from debit_spread_analyzer import two_sided
+from spread_benchmark import (FixtureStore, ReplayHTTPClient, compare_to_baseline, percentile,
+                              synthetic_fixture)
+
+RECORDED_ON = date(2026, 9, 1)
+
+def test_synthetic_fixture_is_deterministic_and_fully_quoted():
+    fixture = synthetic_fixture('AAA', 'small', today=RECORDED_ON)
+    assert fixture == synthetic_fixture('AAA', 'small', today=RECORDED_ON)
+    assert len(fixture['contracts']) == len(fixture['quotes'])
+    for contract in fixture['contracts']:
+        quote = fixture['quotes'][f"O:{contract['ticker']}"]
+        assert two_sided(quote['bid'], quote['ask'])
+        assert date.fromisoformat(contract['expiration_date']).weekday() <= 4
+
+def test_store_save_load_round_trip(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    store.add(synthetic_fixture('AAA', 'small', today=RECORDED_ON))
+    store.add(synthetic_fixture('BBB', 'small', today=RECORDED_ON))
+    store.save()
+    
+    loaded = FixtureStore(str(tmp_path))
+    assert loaded.load() == ['AAA', 'BBB']
+    assert loaded.fixtures == store.fixtures
+    assert loaded.underlying_by_contract == store.underlying_by_contract
+
+def test_store_records_upstream_responses_per_underlying():
+    store = FixtureStore()
+    fixture = synthetic_fixture('AAA', 'small', today=RECORDED_ON)
+    name = f"O:{fixture['contracts'][0]['ticker']}"
+    store.record('snapshot-locale', {}, {'status': 'OK', 'tickers': [fixture['price']]})
+    store.record('options-contracts', {'underlying_ticker': 'AAA'}, {'status': 'OK', 'results': fixture['contracts']})
+    store.record('snapshot-options', {}, {'status': 'OK', 'results': [fixture['quotes'][name], {'name': 'O:UNKNOWN'}]})
+    store.record('snapshot-options', {}, {'status': 'ERROR', 'results': [{'name': name, 'bid': 0}]})
+    
+    recorded = store.fixtures['AAA']
+    assert recorded['price'] == fixture['price']
+    assert recorded['contracts'] == fixture['contracts']
+    assert recorded['quotes'] == {name: fixture['quotes'][name]}
+
+def test_replay_shifts_expirations_to_today_and_counts_calls():
+    store = FixtureStore()
+    fixture = synthetic_fixture('AAA', 'small', today=RECORDED_ON)
+    store.add(fixture)
+    http = ReplayHTTPClient(store)
+    
+    contracts = http.get('https://api/options-contracts', params={'underlying_ticker': 'AAA'}).json()['results']
+    offset = timedelta(days=(date.today() - RECORDED_ON).days)
+    assert [contract['expiration_date'] for contract in contracts] == [
+        (date.fromisoformat(contract['expiration_date']) + offset).isoformat() for contract in fixture['contracts']]
+    
+    names = [f"O:{contract['ticker']}" for contract in fixture['contracts'][:3]] + ['O:MISSING']
+    quotes = http.get('https://api/snapshot-options', params={'tickers': ','.join(names)}).json()['results']
+    assert [quote['name'] for quote in quotes] == names[:3]
+    assert http.get('https://api/unknown').status_code == 404
+    assert http.call_counts() == {'options-contracts': 1, 'snapshot-options': 1, 'snapshot-options:contracts': 4,
+                                  'unknown': 1}
+
+def test_percentile_is_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([3.0], 0.99) == 3.0
+    assert percentile([], 0.5) == 0.0
+
+def test_compare_to_baseline_flags_latency_and_upstream_growth():
+    def result(case, p50, calls):
+        return {'case': case, 'size': 'small', 'p50_ms': p50, 'upstream_calls_per_op': calls}
+    
+    baseline = [result('a', 10.0, {'snapshot-options': 2}), result('b', 10.0, {'snapshot-options': 2})]
+    assert compare_to_baseline([result('a', 11.9, {'snapshot-options': 2}), result('new', 99.0, {})], baseline, 0.2) == []
+    assert compare_to_baseline([result('a', 12.5, {'snapshot-options': 2}), result('b', 5.0, {'snapshot-options': 3})],
+                               baseline, 0.2) == [
+        'a [small] p50 10.0ms -> 12.5ms',
+        'b [small] upstream calls 2 -> 3'
+    ]
+
+def test_main_writes_results_and_fails_on_regression(tmp_path, capsys):
+    results_path = tmp_path / 'results.json'
+    assert spread_benchmark.main(['--sizes', 'small', '--iterations', '2', '--json', str(results_path)]) == 0
+    results = json.loads(results_path.read_text())
+    assert {result['case'] for result in results} == {
+        'analyze_ticker[cold]', 'analyze_ticker[warm]', 'find_best_spreads[cold]', 'generate_spread_pairs'}
+    warm = next(result for result in results if result['case'] == 'analyze_ticker[warm]')
+    assert warm['upstream_calls_per_op'] == {}
+    
+    for result in results:
+        result['upstream_calls_per_op'] = {}
+    (tmp_path / 'baseline.json').write_text(json.dumps(results))
+    assert spread_benchmark.main(['--sizes', 'small', '--iterations', '2',
+                                  '--baseline', str(tmp_path / 'baseline.json')]) == 1
+    assert 'REGRESSION: analyze_ticker[cold] [small] upstream calls 0 ->' in capsys.readouterr().out
+
+def test_main_rejects_unknown_sizes():
+    with pytest.raises(SystemExit):
+        spread_benchmark.main(['--sizes', 'gigantic'])
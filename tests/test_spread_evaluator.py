@@ -0,0 +1,121 @@
+"""SpreadEvaluator pruning must select the same spread as an exhaustive search"""
+
+import random
+
+import pytest
+
+from debit_spread_analyzer import OptionContract, SpreadEvaluator, price_debit_spread, two_sided
+from spread_benchmark import FixtureStore, ReplayHTTPClient, build_analyzer
+
+WINDOWS = [(30, 40), (12, 25), (8, 15)]
+
+def evaluator(legs):
+    """Evaluator over (strike, bid, ask) call legs on one expiration, tickers C<strike>"""
+    contracts = [OptionContract(f'C{strike:g}', strike, '2026-11-20', 35, 'call') for strike, _, _ in legs]
+    spreads = SpreadEvaluator(contracts)
+    spreads.load_quotes({f'C{strike:g}': {'bid': bid, 'ask': ask} for strike, bid, ask in legs})
+    return spreads
+
+def unpruned(spreads, width, roi_min, roi_max, monkeypatch):
+    with monkeypatch.context() as patch:
+        patch.setattr(SpreadEvaluator, 'roi_bound', staticmethod(lambda width, bid, ask: float('inf')))
+        return spreads.best_spread(width, roi_min, roi_max)[0]
+
+def exhaustive(legs, width, roi_min, roi_max):
+    """(long, short, roi) of the best in-window pair, straight from price_debit_spread"""
+    best = None
+    for long_strike, long_bid, long_ask in legs:
+        for short_strike, short_bid, short_ask in legs:
+            if abs(short_strike - long_strike - width) > SpreadEvaluator.WIDTH_TOLERANCE or short_strike <= long_strike:
+                continue
+            if not two_sided(long_bid, long_ask) or not two_sided(short_bid, short_ask):
+                continue
+            cost = price_debit_spread(long_bid, long_ask, short_bid, short_ask)[2]
+            roi = (short_strike - long_strike - cost) / cost * 100
+            if roi_min <= roi <= roi_max and (best is None or roi > best[2]):
+                best = (long_strike, short_strike, roi)
+    return best
+
+def selected(spread):
+    return None if spread is None else (spread['long_strike'], spread['short_strike'], pytest.approx(spread['roi']))
+
+def test_crossed_partner_leg_is_unpriceable_not_pruned_away(monkeypatch):
+    # Long 1.00/2.80 against a crossed short 1.30/1.16 would price at 0.83 (ROI 20.5%),
+    # while the long leg's half-spread bound (11.1%) prunes it: crossed quotes are skipped instead
+    legs = [(100, 1.00, 2.80), (101, 1.30, 1.16)]
+    spreads = evaluator(legs)
+    assert spreads.best_spread(1, 12, 25) == (None, 0)
+    assert unpruned(spreads, 1, 12, 25, monkeypatch) is None
+    assert spreads.missing_symbols(1, 12, 25) == []
+
+def test_pruned_selection_matches_unpruned_and_exhaustive(monkeypatch):
+    rng = random.Random(7)
+    for _ in range(200):
+        legs = []
+        for strike in range(90, 111):
+            ask = max(0.01, round(rng.uniform(0, 12) * (1 - (strike - 90) / 25), 2))
+            bid = round(ask - rng.uniform(-0.4, 1.5), 2)  # some crossed, some one-sided
+            legs.append((strike, max(bid, 0.0), ask))
+        spreads = evaluator(legs)
+        for width in (1, 2, 5):
+            for roi_min, roi_max in WINDOWS:
+                pruned = selected(spreads.best_spread(width, roi_min, roi_max)[0])
+                assert pruned == selected(unpruned(spreads, width, roi_min, roi_max, monkeypatch))
+                assert pruned == exhaustive(legs, width, roi_min, roi_max)
+
+def test_incremental_quotes_reach_the_exhaustive_best():
+    rng = random.Random(11)
+    for _ in range(100):
+        legs = [(strike, round(max(0.0, 10 - (strike - 90) * 0.45 - rng.uniform(0, 0.6)), 2),
+                 round(max(0.01, 10.2 - (strike - 90) * 0.45 + rng.uniform(-0.3, 0.6)), 2))
+                for strike in range(90, 111)]
+        quotes = {f'C{strike:g}': {'bid': bid, 'ask': ask} for strike, bid, ask in legs}
+        spreads = SpreadEvaluator([OptionContract(f'C{strike:g}', strike, '2026-11-20', 35, 'call')
+                                   for strike, _, _ in legs])
+        first = rng.sample(sorted(quotes), 8)
+        spreads.load_quotes({symbol: quotes[symbol] for symbol in first}, requested=first)
+        
+        while True:
+            missing = spreads.missing_symbols(2, 12, 25)
+            if not missing:
+                break
+            spreads.load_quotes({symbol: quotes[symbol] for symbol in missing}, requested=missing)
+        assert selected(spreads.best_spread(2, 12, 25)[0]) == exhaustive(legs, 2, 12, 25)
+
+def test_calculate_spread_metrics_skips_crossed_quotes():
+    analyzer = build_analyzer(ReplayHTTPClient(FixtureStore()))
+    long_leg = {'ticker': 'C100', 'strike_price': 100, 'expiration_date': '2026-11-20'}
+    short_leg = {'ticker': 'C101', 'strike_price': 101, 'expiration_date': '2026-11-20'}
+    crossed = {'C100': {'bid': 1.00, 'ask': 2.80}, 'C101': {'bid': 1.30, 'ask': 1.16}}
+    assert analyzer.calculate_spread_metrics(long_leg, short_leg, crossed) is None
+    
+    crossed['C101'] = {'bid': 1.16, 'ask': 1.30}
+    assert analyzer.calculate_spread_metrics(long_leg, short_leg, crossed)['spread_cost'] == pytest.approx(0.97)
+
+def test_pair_symbols_matches_widths_within_tolerance_per_expiration():
+    contracts = [OptionContract(f'N{strike:g}', strike, '2026-11-20', 35, 'call') for strike in (100, 101.05, 103, 107)]
+    contracts += [OptionContract(f'F{strike:g}', strike, '2026-12-18', 63, 'call') for strike in (101.2, 102)]
+    spreads = SpreadEvaluator(contracts)
+    
+    # 101.2 is 1.2 above 100 but in another expiration, so it never pairs with it
+    assert spreads.pair_symbols([1]) == ['N100', 'N101.05']
+    assert spreads.pair_symbols([1, 2, 4]) == ['N100', 'N101.05', 'N103', 'N107']
+    assert spreads.pair_symbols([0.8]) == ['F101.2', 'F102']
+
+def test_best_spread_reports_the_winning_expiration_and_masks_unquoted_legs():
+    contracts = [OptionContract(ticker, strike, expiration, dte, 'call') for ticker, strike, expiration, dte in [
+        ('N100', 100, '2026-11-20', 35), ('N101', 101, '2026-11-20', 35), ('N102', 102, '2026-11-20', 35),
+        ('F100', 100, '2026-12-18', 63), ('F101', 101, '2026-12-18', 63)
+    ]]
+    spreads = SpreadEvaluator(contracts)
+    spreads.load_quotes({
+        'N100': {'bid': 2.00, 'ask': 2.10}, 'N101': {'bid': 1.20, 'ask': 1.30},
+        'F100': {'bid': 2.50, 'ask': 2.60}, 'F101': {'bid': 1.80, 'ask': 1.90}
+    })
+    
+    best, evaluated = spreads.best_spread(1, 12, 30)
+    assert evaluated == 2  # N101/N102 has no quote for N102
+    assert (best['long_ticker'], best['short_ticker'], best['expiration'], best['dte']) == ('F100', 'F101', '2026-12-18', 63)
+    assert best['spread_cost'] == pytest.approx(0.78)
+    assert best['roi'] == pytest.approx(0.22 / 0.78 * 100)
+    assert spreads.best_spread(2, 0, 1000) == (None, 0)
@@ -0,0 +1,78 @@
+"""Counters, histograms and collectors in the Prometheus text format"""
+
+from flask import Flask
+
+import flask_integration
+from spread_benchmark import FixtureStore, ReplayHTTPClient, build_analyzer, synthetic_fixture
+from spread_metrics import Counter, Histogram, MetricsRegistry, metrics
+
+def test_counter_renders_labelled_series_in_sorted_order():
+    counter = Counter('requests_total', 'Requests')
+    counter.inc(endpoint='b', status='200')
+    counter.inc(2, endpoint='a', status='200')
+    counter.inc(0.5, endpoint='a', status='200')
+    counter.inc()
+    assert counter.render() == [
+        '# HELP requests_total Requests',
+        '# TYPE requests_total counter',
+        'requests_total 1',
+        'requests_total{endpoint="a",status="200"} 2.5',
+        'requests_total{endpoint="b",status="200"} 1'
+    ]
+
+def test_histogram_buckets_are_cumulative_with_sum_and_count():
+    histogram = Histogram('stage_seconds', 'Stage time', buckets=(0.5, 0.1, 1.0))
+    for value in (0.05, 0.1, 0.3, 2.0):
+        histogram.observe(value, stage='quotes')
+    assert histogram.render() == [
+        '# HELP stage_seconds Stage time',
+        '# TYPE stage_seconds histogram',
+        'stage_seconds_bucket{stage="quotes",le="0.1"} 2',
+        'stage_seconds_bucket{stage="quotes",le="0.5"} 3',
+        'stage_seconds_bucket{stage="quotes",le="1"} 3',
+        'stage_seconds_bucket{stage="quotes",le="+Inf"} 4',
+        'stage_seconds_sum{stage="quotes"} 2.45',
+        'stage_seconds_count{stage="quotes"} 4'
+    ]
+
+def test_label_values_are_escaped():
+    counter = Counter('errors_total', 'Errors')
+    counter.inc(reason='bad "quote"\\\nline')
+    assert counter.render()[-1] == 'errors_total{reason="bad \\"quote\\"\\\\\\nline"} 1'
+
+def test_registry_reuses_metrics_by_name_and_samples_collectors_at_render():
+    registry = MetricsRegistry()
+    assert registry.counter('calls_total', 'Calls') is registry.counter('calls_total', 'Calls')
+    registry.counter('calls_total', 'Calls').inc()
+    depth = [3]
+    registry.register_collector(lambda: [('queue_depth', 'gauge', 'Queued', [({'queue': 'q'}, depth[0])])])
+    
+    depth[0] = 5
+    assert registry.render() == '\n'.join([
+        '# HELP calls_total Calls', '# TYPE calls_total counter', 'calls_total 1',
+        '# HELP queue_depth Queued', '# TYPE queue_depth gauge', 'queue_depth{queue="q"} 5'
+    ]) + '\n'
+
+def test_analysis_records_stage_timings_and_collector_samples():
+    store = FixtureStore()
+    store.add(synthetic_fixture('AAA', 'small'))
+    analyzer = build_analyzer(ReplayHTTPClient(store))
+    analyzer.analyze_ticker('AAA')
+    
+    text = metrics.render()
+    for stage in ('price', 'chain', 'prepare', 'quotes', 'select'):
+        assert f'spread_analysis_stage_seconds_count{{stage="{stage}"}}' in text
+    assert 'spread_analysis_seconds_count{outcome="success"}' in text
+    assert 'tradelist_requests_total{endpoint="options-contracts",status="200"}' in text
+    samples = {name: samples for name, _, _, samples in analyzer.collect_metrics()}
+    assert samples['spread_requests_total'] == [({}, 1)]
+    assert samples['spread_active_requests'] == [({}, 0)]
+
+def test_metrics_route_serves_the_text_format(monkeypatch):
+    monkeypatch.setattr(flask_integration, 'get_metrics_text', lambda: 'up 1\n')
+    app = Flask(__name__)
+    flask_integration.create_debit_spread_routes(app)
+    response = app.test_client().get('/api/spread_metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    assert response.get_data(as_text=True) == 'up 1\n'
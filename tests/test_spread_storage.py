@@ -0,0 +1,109 @@
+"""Session and Redis-shared spread storage: expiry, capacity and pipelined sharing"""
+
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+from debit_spread_analyzer import RedisSpreadStorage, SessionSpreadStorage, SpreadStorageBackend
+
+SPREAD = {'roi': 25.0, 'long_strike': 100, 'short_strike': 105}
+
+def test_session_expires_by_deadline_not_insertion_order(clock):
+    storage = SessionSpreadStorage(max_age_seconds=100)
+    storage.put('long', 'AAA', 'balanced', SPREAD, datetime.now())
+    storage.put('short', 'BBB', 'balanced', SPREAD, datetime.now(), max_age_seconds=10)
+    
+    clock.advance(20)
+    assert storage.get_spread('short') is None
+    assert storage.get_spread('long')['symbol'] == 'AAA'
+    assert storage.stats()['expired'] == 1
+    
+    clock.advance(100)
+    assert storage.stats()['entries'] == 0
+
+def test_session_capacity_evicts_soonest_to_expire(clock):
+    storage = SessionSpreadStorage(max_entries=2, max_age_seconds=100)
+    storage.put('a', 'AAA', 'balanced', SPREAD, datetime.now())
+    storage.put('b', 'BBB', 'balanced', SPREAD, datetime.now(), max_age_seconds=10)
+    storage.put('c', 'CCC', 'balanced', SPREAD, datetime.now())
+    
+    assert storage.get_spread('b') is None
+    assert storage.get_spread('a') is not None and storage.get_spread('c') is not None
+    assert storage.stats()['evicted'] == 1
+
+def test_session_replaced_ids_keep_their_new_deadline(clock):
+    storage = SessionSpreadStorage(max_age_seconds=100)
+    for _ in range(500):
+        storage.put('same', 'AAA', 'balanced', SPREAD, datetime.now(), max_age_seconds=10)
+        clock.advance(1)
+    storage.put('same', 'AAA', 'balanced', SPREAD, datetime.now(), max_age_seconds=50)
+    
+    clock.advance(20)
+    assert storage.get_spread('same') is not None
+    assert len(storage.expiry) < 100
+
+def test_flush_shares_all_pending_spreads_in_one_pipeline(transport, redis_store):
+    make_service, _ = transport
+    cache = make_service()
+    storage = RedisSpreadStorage(cache, ttl_seconds=600)
+    ids = [storage.store_spread(symbol, 'balanced', SPREAD) for symbol in ('AAA', 'BBB', 'CCC')]
+    assert not redis_store.commands
+    
+    storage.flush()
+    assert cache.get_stats()['redis']['round_trips'] == 1
+    assert storage.stats()['redis'] == {'pending': 0, 'writes': 3, 'write_failures': 0, 'hits': 0, 'misses': 0}
+    for spread_id in ids:
+        assert json.loads(redis_store.values['spread:' + spread_id])['id'] == spread_id
+        assert redis_store.execute(['TTL', 'spread:' + spread_id]) in (599, 600)
+    
+    storage.flush()
+    assert cache.get_stats()['redis']['round_trips'] == 1
+
+def test_flush_failure_is_counted(transport):
+    make_service, fail = transport
+    storage = RedisSpreadStorage(make_service())
+    storage.store_spread('AAA', 'balanced', SPREAD)
+    fail()
+    
+    storage.flush()
+    assert storage.stats()['redis']['writes'] == 0
+    assert storage.stats()['redis']['write_failures'] == 1
+
+def test_get_spread_reads_other_workers_spreads_with_remaining_ttl(transport, redis_store):
+    make_service, _ = transport
+    writer = RedisSpreadStorage(make_service(), ttl_seconds=600)
+    spread_id = writer.store_spread('AAA', 'aggressive', SPREAD)
+    writer.flush()
+    redis_store.expires['spread:' + spread_id] = time.monotonic() + 30
+    
+    reader = RedisSpreadStorage(make_service(), ttl_seconds=600)
+    record = reader.get_spread(spread_id)
+    assert record['id'] == spread_id and record['data'] == SPREAD
+    assert isinstance(record['stored_at'], datetime)
+    
+    # Cached locally only for what is left of the Redis TTL
+    local = reader.local.storage[spread_id]
+    assert local.expires_at - time.monotonic() == pytest.approx(30, abs=2)
+    gets = redis_store.round_trips('GET')
+    assert reader.get_spread(spread_id)['id'] == spread_id
+    assert redis_store.round_trips('GET') == gets
+    assert reader.stats()['redis']['hits'] == 1
+
+def test_get_spread_miss_and_expired_key(transport, redis_store):
+    make_service, _ = transport
+    reader = RedisSpreadStorage(make_service())
+    assert reader.get_spread('AAA_balanced_missing_0') is None
+    
+    redis_store.set_raw('spread:gone', json.dumps({'id': 'gone'}), ttl=-1)
+    assert reader.get_spread('gone') is None
+    assert reader.stats()['redis']['misses'] == 2
+
+def test_backend_missing_a_method_cannot_be_instantiated():
+    class WriteOnly(SpreadStorageBackend):
+        def store_spread(self, symbol, strategy, spread_data):
+            return 'id'
+    
+    with pytest.raises(TypeError, match='get_spread'):
+        WriteOnly()
@@ -0,0 +1,62 @@
+"""Per-strategy NDJSON streaming on the single-ticker route"""
+
+import json
+import threading
+
+import pytest
+from flask import Flask
+
+import flask_integration
+from spread_benchmark import FixtureStore, ReplayHTTPClient, build_analyzer, synthetic_fixture
+
+@pytest.fixture
+def analyzer():
+    store = FixtureStore()
+    store.add(synthetic_fixture('AAA', 'medium'))
+    return build_analyzer(ReplayHTTPClient(store))
+
+@pytest.fixture
+def client(analyzer, monkeypatch):
+    monkeypatch.setattr(flask_integration, 'stream_debit_spread', analyzer.stream_ticker)
+    app = Flask(__name__)
+    flask_integration.create_debit_spread_routes(app)
+    return app.test_client()
+
+def test_stream_route_sends_one_record_per_strategy_then_a_summary(client, analyzer):
+    response = client.post('/api/analyze_debit_spread', json={'ticker': ' aaa ', 'stream': True})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [record['type'] for record in records] == ['strategy'] * 3 + ['summary']
+    assert {record['strategy'] for record in records[:3]} == {'aggressive', 'balanced', 'conservative'}
+    assert records[-1]['success'] and records[-1]['strategies_found'] == 3
+    
+    expected = analyzer.analyze_ticker('AAA')['strategies']
+    for record in records[:3]:
+        assert record['ticker'] == 'AAA'
+        assert record['analysis']['spread_details'] == expected[record['strategy']]['spread_details']
+
+def test_unknown_ticker_streams_a_failed_summary(client):
+    response = client.post('/api/analyze_debit_spread', json={'ticker': 'ZZZ', 'stream': True})
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert records == [{'type': 'summary', 'success': False, 'ticker': 'ZZZ',
+                        'error': 'Unable to fetch current price for ZZZ'}]
+
+def test_finished_strategies_are_yielded_before_slow_ones(analyzer, monkeypatch):
+    release = threading.Event()
+    select = analyzer.select_strategy_spread
+    
+    def slow_aggressive(symbol, strategy, *args):
+        if strategy == 'aggressive':
+            assert release.wait(5)
+        return select(symbol, strategy, *args)
+    
+    monkeypatch.setattr(analyzer, 'select_strategy_spread', slow_aggressive)
+    stream = analyzer.stream_ticker('AAA')
+    first, second = next(stream), next(stream)
+    assert {first['strategy'], second['strategy']} == {'balanced', 'conservative'}
+    
+    release.set()
+    assert next(stream)['strategy'] == 'aggressive'
+    assert next(stream)['type'] == 'summary'
@@ -0,0 +1,132 @@
+"""UpstreamLimiter token bucket and AIMD concurrency tests"""
+
+import time
+
+import pytest
+
+from debit_spread_analyzer import UpstreamBusyError, UpstreamLimiter
+
+def make_limiter(**overrides):
+    options = dict(rate_per_second=10, burst=3, initial_limit=10, min_limit=2, max_limit=50)
+    options.update(overrides)
+    return UpstreamLimiter(**options)
+
+def test_token_bucket_admits_burst_then_paces(clock):
+    limiter = make_limiter()
+    assert [limiter.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    
+    delay = limiter.try_acquire()
+    assert delay == pytest.approx(0.1)
+    
+    clock.advance(0.1)
+    assert limiter.try_acquire() == 0.0
+    assert limiter.admitted == 4
+
+def test_token_bucket_refill_is_capped_at_burst(clock):
+    limiter = make_limiter()
+    clock.advance(60)
+    assert [limiter.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.try_acquire() > 0
+
+def test_concurrency_limit_gates_admission(clock):
+    limiter = make_limiter(burst=100, initial_limit=2)
+    assert limiter.try_acquire() == 0.0
+    assert limiter.try_acquire() == 0.0
+    assert limiter.try_acquire() > 0
+    
+    limiter.release(0.05, True, endpoint='snapshot-locale')
+    assert limiter.try_acquire() == 0.0
+
+def test_additive_increase_on_healthy_responses(clock):
+    limiter = make_limiter()
+    expected = 10.0
+    for _ in range(20):
+        limiter.release(0.08, True, endpoint='snapshot-locale')
+        expected += 1.0 / expected
+    assert limiter.limit == pytest.approx(expected)
+
+def test_additive_increase_stops_at_max_limit(clock):
+    limiter = make_limiter(initial_limit=49, max_limit=50)
+    for _ in range(500):
+        limiter.release(0.08, True, endpoint='snapshot-locale')
+    assert limiter.limit == 50
+
+def test_multiplicative_decrease_on_failure(clock):
+    limiter = make_limiter()
+    limiter.release(0.08, False, endpoint='snapshot-options')
+    assert limiter.limit == pytest.approx(7.0)
+    assert limiter.failures == 1
+
+def test_decrease_respects_cooldown(clock):
+    limiter = make_limiter()
+    limiter.release(0.08, False)
+    limiter.release(0.08, False)
+    assert limiter.limit == pytest.approx(7.0)
+    
+    clock.advance(limiter.cooldown_seconds)
+    limiter.release(0.08, False)
+    assert limiter.limit == pytest.approx(4.9)
+
+def test_decrease_stops_at_min_limit(clock):
+    limiter = make_limiter()
+    for _ in range(20):
+        limiter.release(0.08, False)
+        clock.advance(limiter.cooldown_seconds)
+    assert limiter.limit == 2
+
+def test_retry_after_blocks_admission(clock):
+    limiter = make_limiter()
+    limiter.release(0.08, False, retry_after=2.0)
+    assert limiter.try_acquire() == pytest.approx(2.0)
+    assert limiter.throttled == 1
+    
+    clock.advance(2.0)
+    assert limiter.try_acquire() == 0.0
+
+def test_mixed_endpoint_latencies_are_not_overload(clock):
+    # Healthy upstream: fast price snapshots, quote batches and slow contract listings
+    limiter = make_limiter()
+    normal = {'snapshot-locale': 0.08, 'snapshot-options': 0.15, 'options-contracts': 1.2}
+    for i in range(500):
+        for endpoint, latency in normal.items():
+            limiter.release(latency * (1 + 0.1 * (i % 3)), True, endpoint=endpoint)
+        clock.advance(0.1)
+    assert limiter.last_decrease == 0.0
+    assert limiter.limit == 50
+    assert set(limiter.stats()['latency_ms']) == set(normal)
+
+def test_slowdown_on_one_endpoint_backs_off(clock):
+    limiter = make_limiter()
+    for _ in range(20):
+        limiter.release(1.2, True, endpoint='options-contracts')
+        limiter.release(0.08, True, endpoint='snapshot-locale')
+    before = limiter.limit
+    
+    for _ in range(10):
+        limiter.release(0.6, True, endpoint='snapshot-locale')
+    assert limiter.limit < before
+
+def test_retry_after_is_capped(clock, monkeypatch):
+    monkeypatch.setenv('TRADELIST_MAX_RETRY_AFTER', '30')
+    limiter = make_limiter()
+    limiter.try_acquire()
+    limiter.release(0.08, False, retry_after=3600)
+    
+    assert limiter.try_acquire() == pytest.approx(30)
+    clock.advance(30)
+    assert limiter.try_acquire() == 0.0
+
+def test_acquire_times_out_instead_of_hanging():
+    limiter = make_limiter(initial_limit=2)
+    limiter.acquire()
+    limiter.acquire()
+    
+    started = time.monotonic()
+    with pytest.raises(UpstreamBusyError):
+        limiter.acquire(timeout=0.2)
+    assert 0.15 <= time.monotonic() - started < 1
+    assert limiter.stats()['timeouts'] == 1
+    
+    limiter.release(0.08, True)
+    limiter.acquire(timeout=0.2)
+    assert limiter.in_flight == 2
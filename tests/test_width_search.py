@@ -0,0 +1,79 @@
+"""Progressive width search with lazily quoted, bound-pruned legs"""
+
+import pytest
+
+from debit_spread_analyzer import OptionContract, SpreadEvaluator
+from spread_benchmark import FixtureStore, ReplayHTTPClient, build_analyzer, synthetic_fixture
+
+SELECTED = ('found', 'expiration', 'strike_price', 'short_strike_price', 'spread_cost', 'spread_width')
+
+def setup(size):
+    store = FixtureStore()
+    fixture = synthetic_fixture('AAA', size)
+    store.add(fixture)
+    http = ReplayHTTPClient(store)
+    analyzer = build_analyzer(http)
+    chain = analyzer.get_option_chain('AAA')
+    evaluators, _, _ = analyzer.prepare_strategy_evaluators(chain, fixture['price']['fmv'])
+    return analyzer, chain, fixture, evaluators
+
+def search(analyzer, strategy, evaluator, price, fetch_quotes=None):
+    result = analyzer.select_strategy_spread('AAA', strategy, evaluator, price, None, fetch_quotes)
+    return {key: result.get(key) for key in SELECTED}
+
+@pytest.mark.parametrize('size', ['small', 'medium'])
+def test_lazy_quoting_selects_the_eagerly_quoted_spread(size):
+    analyzer, chain, fixture, evaluators = setup(size)
+    price = fixture['price']['fmv']
+    
+    for strategy, evaluator in evaluators.items():
+        requested = []
+        
+        def fetch_quotes(symbols):
+            requested.extend(symbols)
+            return analyzer.get_options_quotes(symbols)
+        
+        lazy = search(analyzer, strategy, evaluator, price, fetch_quotes)
+        
+        eager = SpreadEvaluator(analyzer.filter_chain_by_strategy(chain, strategy, price))
+        symbols = eager.pair_symbols(analyzer.width_targets)
+        eager.load_quotes(analyzer.get_options_quotes(symbols))
+        
+        assert lazy == search(analyzer, strategy, eager, price)
+        assert len(requested) == len(set(requested)) <= len(symbols)
+
+def test_search_stops_at_the_narrowest_width_with_an_in_window_spread():
+    analyzer, _, fixture, evaluators = setup('medium')
+    price = fixture['price']['fmv']
+    for strategy, evaluator in evaluators.items():
+        config = analyzer.strategy_configs[strategy]
+        evaluator.load_quotes(analyzer.get_options_quotes(evaluator.pair_symbols(analyzer.width_targets)))
+        widths = [width for width in analyzer.width_targets
+                  if evaluator.best_spread(width, config['roi_min'], config['roi_max'])[0]]
+        
+        result = search(analyzer, strategy, evaluator, price)
+        assert result['found'] == bool(widths)
+        if widths:
+            assert result['spread_width'] == pytest.approx(widths[0], abs=SpreadEvaluator.WIDTH_TOLERANCE)
+
+def test_no_in_window_spread_reports_the_roi_range():
+    analyzer, _, fixture, evaluators = setup('small')
+    analyzer.strategy_configs['balanced'] = dict(analyzer.strategy_configs['balanced'], roi_min=5000, roi_max=6000)
+    result = analyzer.select_strategy_spread('AAA', 'balanced', evaluators['balanced'], fixture['price']['fmv'],
+                                             None, analyzer.get_options_quotes)
+    assert result == {'found': False, 'reason': 'No spreads found within 5000-6000% ROI range'}
+
+def test_wider_legs_are_not_quoted_once_a_narrow_width_succeeds():
+    analyzer, _, _, _ = setup('small')
+    legs = {'C100': (100, 2.00, 2.10), 'C101': (101, 1.20, 1.30), 'C110': (110, 0.40, 0.50), 'C115': (115, 0.10, 0.20)}
+    evaluator = SpreadEvaluator([OptionContract(ticker, strike, '2026-11-20', 20, 'call')
+                                 for ticker, (strike, _, _) in legs.items()])
+    requested = []
+    
+    def fetch_quotes(symbols):
+        requested.append(symbols)
+        return {symbol: {'bid': legs[symbol][1], 'ask': legs[symbol][2]} for symbol in symbols}
+    
+    result = analyzer.select_strategy_spread('AAA', 'balanced', evaluator, 100.0, None, fetch_quotes)
+    assert (result['found'], result['strike_price'], result['short_strike_price']) == (True, 100, 101)
+    assert requested == [['C100', 'C101']]